@@ -13,9 +13,14 @@ from siada.foundation.tools.get_git_diff import GitDiffUtil
 from siada.services.fix_result_check import FixResultChecker
 from siada.services.execution_trace_collector import ExecutionTrace, ModelCall, ToolCall
 from siada.tools.ast.ast_tool import list_code_definition_names
+from siada.tools.ast.batch_outline import list_code_definition_names_batch
+from siada.tools.ast.import_graph import import_graph
+from siada.tools.ast.lexical_search import lexical_search
+from siada.tools.ast.symbol_index import find_definition, find_references
 from siada.tools.coder.file_operator import edit
-from siada.tools.coder.file_search import regex_search_files
+from siada.tools.coder.file_search import next_page, regex_search_files, regex_search_files_batch
 from siada.tools.coder.run_cmd import run_cmd
+from siada.tools.coder.run_affected_tests import run_affected_tests
 from siada.tools.coder.fix_attempt_completion import fix_attempt_completion
 from siada.services.enhanced_fix_result_check import EnhancedFixResultChecker
 from typing import Optional, List, Dict, Any
@@ -35,7 +40,7 @@ class BugFixAgent(CodeGenAgent):
 
         super().__init__(
             name="BugFixAgent",
-            tools=[edit, regex_search_files, run_cmd, fix_attempt_completion, list_code_definition_names],
+            tools=[edit, regex_search_files, regex_search_files_batch, next_page, run_cmd, run_affected_tests, fix_attempt_completion, list_code_definition_names, list_code_definition_names_batch, find_definition, find_references, import_graph, lexical_search],
             tool_use_behavior={
                 "stop_at_tool_names": ["fix_attempt_completion"],
             },
@@ -5,14 +5,19 @@ Provides specialized Agent implementation for code generation tasks.
 """
 import os
 
-from agents import RunContextWrapper, RunResult, RunResultStreaming
+from agents import RunContextWrapper, RunResult, RunResultStreaming, TResponseInputItem
 from siada.foundation.code_agent_context import CodeAgentContext
 from siada.agent_hub.siada_agent import SiadaAgent
 from siada.tools.ast.ast_tool import list_code_definition_names
+from siada.tools.ast.batch_outline import list_code_definition_names_batch
+from siada.tools.ast.import_graph import import_graph
+from siada.tools.ast.lexical_search import lexical_search
+from siada.tools.ast.symbol_index import find_definition, find_references
 from siada.tools.coder.file_operator import edit
-from siada.tools.coder.file_search import regex_search_files
+from siada.tools.coder.file_search import next_page, regex_search_files, regex_search_files_batch
 from siada.tools.coder.run_cmd import run_cmd
 from siada.foundation.config import settings
+from siada.foundation.tools.binary_part import BinaryPart, serialize_binary_parts
 from siada.agent_hub.coder.prompt import code_gen_prompt
 from siada.services.handle_at_command import handle_at_command
 import logging
@@ -33,7 +38,7 @@ class CodeGenAgent(SiadaAgent[CodeAgentContext]):
             kwargs['name'] = "CodeGenAgent"
 
         if 'tools' not in kwargs:
-            kwargs['tools'] = [edit, regex_search_files, run_cmd, list_code_definition_names]
+            kwargs['tools'] = [edit, regex_search_files, regex_search_files_batch, next_page, run_cmd, list_code_definition_names, list_code_definition_names_batch, find_definition, find_references, import_graph, lexical_search]
 
         super().__init__(
             *args,
@@ -67,17 +72,40 @@ class CodeGenAgent(SiadaAgent[CodeAgentContext]):
         Returns:
             Processed user input with @ command content injected
         """
+        processed_text, _ = await self.process_at_commands_with_parts(user_input, context)
+        return processed_text
+
+    async def process_at_commands_with_parts(
+        self, user_input: str, context: CodeAgentContext
+    ) -> tuple[str, list[BinaryPart]]:
+        """
+        Process @ commands in user input, keeping referenced binary files apart
+        
+        Images and PDFs stay lazy BinaryPart handles; the text only carries a
+        short placeholder where each of them was referenced.
+        
+        Args:
+            user_input: Original user input that may contain @ commands
+            context: Code agent context
+            
+        Returns:
+            Tuple of processed user input and the referenced binary parts
+        """
         try:
             # Check if input contains @ commands
             if '@' not in user_input:
-                return user_input
+                return user_input, []
             
             # Create configuration object for at command processing
             class AtCommandConfig:
-                def __init__(self, root_dir: str):
+                def __init__(self, root_dir: str, llm_config=None):
                     self.root_dir = root_dir
+                    self.llm_config = llm_config
             
-            config = AtCommandConfig(context.root_dir)
+            llm_config = None
+            if context.session and context.session.siada_config:
+                llm_config = context.session.siada_config.llm_config
+            config = AtCommandConfig(context.root_dir, llm_config)
             
             # Create callback functions
             def add_item(item, message_id):
@@ -100,19 +128,25 @@ class CodeGenAgent(SiadaAgent[CodeAgentContext]):
             if result.should_proceed and result.processed_query:
                 # Combine all text parts from processed query
                 processed_text = ""
+                binary_parts = []
                 for part in result.processed_query:
                     if isinstance(part, dict) and 'text' in part:
                         processed_text += part['text']
+                    elif isinstance(part, BinaryPart):
+                        processed_text += f"\n{part.placeholder()}\n"
+                        binary_parts.append(part)
                 
-                return processed_text.strip() if processed_text else user_input
+                if not processed_text:
+                    return user_input, []
+                return processed_text.strip(), binary_parts
             else:
                 # If processing failed, return original input
-                return user_input
+                return user_input, []
                 
         except Exception as e:
             # If any error occurs, log it and return original input
             logging.warning(f"Failed to process @ commands: {e}")
-            return user_input
+            return user_input, []
 
     async def run(self, user_input: str, context: CodeAgentContext) -> RunResult:
         """
@@ -126,9 +160,11 @@ class CodeGenAgent(SiadaAgent[CodeAgentContext]):
         """
 
         # Process @ commands first
-        processed_input = await self.process_at_commands(user_input, context)
+        processed_input, binary_parts = await self.process_at_commands_with_parts(user_input, context)
         
-        input_with_env = self.assemble_user_input(processed_input, context)
+        input_with_env = self.build_model_input(
+            self.assemble_user_input(processed_input, context), binary_parts, context
+        )
         result = await self.run_impl(
             starting_agent=self,
             input=input_with_env,
@@ -152,9 +188,11 @@ class CodeGenAgent(SiadaAgent[CodeAgentContext]):
         """
 
         # Process @ commands first
-        processed_input = await self.process_at_commands(user_input, context)
+        processed_input, binary_parts = await self.process_at_commands_with_parts(user_input, context)
         
-        input_with_env = self.assemble_user_input(processed_input, context)
+        input_with_env = self.build_model_input(
+            self.assemble_user_input(processed_input, context), binary_parts, context
+        )
         result = await self.run_streamed_impl(
             starting_agent=self,
             input=input_with_env,
@@ -164,6 +202,33 @@ class CodeGenAgent(SiadaAgent[CodeAgentContext]):
 
         return result
 
+    def build_model_input(
+        self, task: str, binary_parts: list[BinaryPart], context: CodeAgentContext
+    ) -> str | list[TResponseInputItem]:
+        """
+        Attach referenced binary files to the task message.
+        
+        Binary parts are encoded here, once per distinct content, and only as
+        image/file items when the session model supports them.
+        
+        Args:
+            task: Assembled user input
+            binary_parts: Binary parts referenced by @ commands
+            context: Code agent context
+            
+        Returns:
+            The task string, or a user message with content items when there are parts
+        """
+        if not binary_parts:
+            return task
+
+        llm_config = None
+        if context.session and context.session.siada_config:
+            llm_config = context.session.siada_config.llm_config
+        content = [{'type': 'input_text', 'text': task}]
+        content.extend(serialize_binary_parts(binary_parts, llm_config))
+        return [{'role': 'user', 'content': content}]
+
     def assemble_user_input(self, user_input: str, context: CodeAgentContext) -> str:
         task = f'<task>\n{user_input}\n</task>'
         return task
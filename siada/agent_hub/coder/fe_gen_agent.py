@@ -4,7 +4,7 @@ from siada.foundation.code_agent_context import CodeAgentContext
 from siada.agent_hub.coder.code_gen_agent import CodeGenAgent
 from siada.agent_hub.coder.prompt import fe_gen_prompt
 from siada.tools.coder.file_operator import edit
-from siada.tools.coder.file_search import regex_search_files
+from siada.tools.coder.file_search import next_page, regex_search_files, regex_search_files_batch
 from siada.tools.coder.run_cmd import run_cmd
 
 
@@ -14,7 +14,7 @@ class FeGenAgent(CodeGenAgent):
 
         super().__init__(
             name="FeGenAgent",
-            tools=[edit, regex_search_files, run_cmd],
+            tools=[edit, regex_search_files, regex_search_files_batch, next_page, run_cmd],
             *args,
             **kwargs
         )
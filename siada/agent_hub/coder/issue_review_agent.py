@@ -9,8 +9,12 @@ from siada.foundation.code_agent_context import CodeAgentContext
 from siada.foundation.config import settings
 from siada.foundation.tools.get_git_diff import GitDiffUtil
 from siada.tools.ast.ast_tool import list_code_definition_names
+from siada.tools.ast.batch_outline import list_code_definition_names_batch
+from siada.tools.ast.import_graph import import_graph
+from siada.tools.ast.lexical_search import lexical_search
+from siada.tools.ast.symbol_index import find_definition, find_references
 from siada.tools.coder.file_operator import edit
-from siada.tools.coder.file_search import regex_search_files
+from siada.tools.coder.file_search import next_page, regex_search_files, regex_search_files_batch
 from siada.tools.coder.issue_review_completion import issue_review_completion
 from siada.tools.coder.run_cmd import run_cmd
 
@@ -22,7 +26,7 @@ class IssueReviewAgent(CodeGenAgent):
     def __init__(self, *args, **kwargs):
         super().__init__(
             name="IssueReviewAgent",
-            tools=[edit, regex_search_files, run_cmd, list_code_definition_names, issue_review_completion],
+            tools=[edit, regex_search_files, regex_search_files_batch, next_page, run_cmd, list_code_definition_names, list_code_definition_names_batch, find_definition, find_references, import_graph, lexical_search, issue_review_completion],
             tool_use_behavior={
                 "stop_at_tool_names": ["issue_review_completion"],
             },
@@ -12,7 +12,11 @@ def get_capabilities_section(cwd: str) -> str:
 
 - You have access to tools that let you execute CLI commands on the user's computer, list files, view source code definitions, regex search, read and edit files. These tools help you effectively accomplish a wide range of tasks, such as writing code, making edits or improvements to existing files, understanding the current state of a project, performing system operations, and much more.
 - You can use search_files to perform regex searches across files in a specified directory, outputting context-rich results that include surrounding lines. This is particularly useful for understanding code patterns, finding specific implementations, or identifying areas that need refactoring.
+- You can use find_definition and find_references to locate an identifier by its exact name. They answer from a symbol index built with tree-sitter, so unlike a regex search they never report hits in comments or strings.
+- You can use lexical_search to find code by what it does when you do not know its name, e.g. "retry http request". It ranks functions, classes and other chunks of files by keyword relevance (BM25), splitting identifiers into words, so the query does not need exact names.
+- You can use import_graph to see which Python modules of the workspace a module imports and which import it, directly or transitively. This helps estimate the blast radius of a change before editing.
 - You can use the list_code_definition_names tool to get an overview of source code definitions for all files at the top level of a specified directory. This can be particularly useful when you need to understand the broader context and relationships between certain parts of the code. You may need to call this tool multiple times to understand various parts of the codebase related to the task.
+      - To outline a whole package at once, use list_code_definition_names_batch with a directory or a glob such as "src/pkg/**/*.py"; it parses every matched file in one call and returns the outlines within a token budget.
       - For example, when asked to make edits or improvements you might use list_code_definition_names to get further insight using source code definitions for files located in relevant directories, then read_file to examine the contents of relevant files, analyze the code and suggest improvements or make necessary edits, then use the replace_in_file tool to implement changes. If you refactored code that could affect other parts of the codebase, you could use search_files to ensure you update other files as needed.
       - You can use the run_cmd tool to run commands on the user's computer whenever you feel it can help accomplish the user's task. When you need to execute a CLI command, you must provide a clear explanation of what the command does. Prefer to execute complex CLI commands over creating executable scripts, since they are more flexible and easier to run. 
 ===="""
@@ -7,6 +7,7 @@ from agents import Agent, RunConfig, RunHooks, RunResult, RunResultStreaming, Ru
 from siada.agent_hub.coder.tracing.logger_tracing_processor import create_detailed_logger
 from siada.foundation.code_agent_context import CodeAgentContext
 from siada.models.converter import ModelSettingsConverter
+from siada.provider.binary_part_model import BinaryPartModelProvider
 from siada.provider.provider_factory import get_provider
 from siada.session import RunningSessionManager
 from siada.tools.coder.ask_followup_question import ask_followup_question
@@ -147,6 +148,9 @@ class SiadaAgent(Agent[Generic[TContext]], ABC):
         model_settings = ModelSettingsConverter.convert_model_settings(llm_config)
         model_provider_name = llm_config.provider
         model_provider = get_provider(model_provider_name)
+        if isinstance(context, CodeAgentContext):
+            # Images and PDFs read by tools are attached to the model requests
+            model_provider = BinaryPartModelProvider(model_provider, context)
         
         # Store provider name (string) in context for client factory
         context.provider = model_provider_name
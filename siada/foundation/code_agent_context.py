@@ -2,10 +2,12 @@ from typing import Optional
 from pydantic import BaseModel, ConfigDict
 
 from siada.session.session_models import RunningSession
-from typing import List
+from typing import Dict, List
 from agents import TResponseInputItem
 from pydantic import BaseModel, Field
 
+from siada.foundation.tools.binary_part import BinaryPart
+
 
 class CodeAgentContext(BaseModel):
 
@@ -23,12 +25,18 @@ class CodeAgentContext(BaseModel):
     # 完整的消息历史列表
     message_history: List[TResponseInputItem] = Field(default_factory=list)
 
+    # 工具读取的二进制文件（图片、PDF、视频），按 tool call id 记录，构建模型请求时再编码
+    tool_binary_parts: Dict[str, List[BinaryPart]] = Field(default_factory=dict)
+
     def add_message(self, message: TResponseInputItem) -> None:
         self.message_history.append(message)
 
     def add_messages(self, messages: List[TResponseInputItem]) -> None:
         self.message_history.extend(messages)
 
+    def add_tool_binary_part(self, call_id: str, part: BinaryPart) -> None:
+        self.tool_binary_parts.setdefault(call_id, []).append(part)
+
     def remove_old_messages(self, remove_count: int) -> List[TResponseInputItem]:
         """删除旧消息，返回剩余的消息列表，永远保留第一条消息"""
         if remove_count <= 0:
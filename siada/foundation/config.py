@@ -41,6 +41,24 @@ class Settings(BaseSettings):
     MAX_TURNS: int = 200
     DEFAULT_MODEL: str = Claude_4_0_SONNET
 
+    # 搜索配置
+    # 是否使用三元组索引缩小ripgrep的搜索文件范围（适用于超大仓库）
+    SEARCH_TRIGRAM_INDEX: bool = False
+    # 搜索结果输出格式："compact"（合并上下文、带行号）或 "classic"
+    SEARCH_OUTPUT_FORMAT: str = "compact"
+    # 单次搜索输出的token预算，超出时按文件排名裁剪
+    SEARCH_TOKEN_BUDGET: int = 8000
+
+    # 批量读取文件配置
+    # ReadManyFiles专用I/O线程池的线程数
+    READ_MANY_FILES_IO_THREADS: int = 8
+    # 单次ReadManyFiles调用读取内容的内存上限（字节）
+    READ_MANY_FILES_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # 代码大纲配置
+    # 单次批量大纲（list_code_definition_names_batch）输出的token预算
+    OUTLINE_TOKEN_BUDGET: int = 8000
+
 
     # 将RunConfig设置为ClassVar，这样它不会被包含在模型验证中
     _DEFAULT_RUN_CONFIG: ClassVar[agents.RunConfig] = None
@@ -0,0 +1,153 @@
+"""
+Lazy handles for binary file content (images, PDFs, videos).
+
+Tools hand these around instead of base64 strings, so a matched image costs a
+stat until a request is actually built for a model that can take it.
+"""
+
+import base64
+import hashlib
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+# Read size when hashing, so large files are never held in memory at once
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+class BinaryPartTooLarge(Exception):
+    """The file exceeds the size cap of a binary part"""
+
+
+class BinaryPart:
+    """
+    A reference to binary file content, encoded only on demand
+
+    Holds the path, kind ('image', 'pdf', 'video'), MIME type and size of the
+    file. The content hash is computed on first use and identifies repeated
+    occurrences of the same content.
+    """
+
+    def __init__(self, path: str, kind: str, mime_type: str, size: int):
+        self.path = path
+        self.kind = kind
+        self.mime_type = mime_type
+        self.size = size
+        self._sha256: Optional[str] = None
+
+    @classmethod
+    def from_file(cls, path: str, kind: str, mime_type: str,
+                  max_bytes: Optional[int] = None) -> 'BinaryPart':
+        """
+        Create a handle for a file without reading it
+
+        Args:
+            path: Path to the file
+            kind: Content kind - 'image', 'pdf' or 'video'
+            mime_type: MIME type of the content
+            max_bytes: Size cap, checked before anything is read (optional)
+
+        Returns:
+            BinaryPart for the file
+
+        Raises:
+            OSError: If the file cannot be stat'ed
+            BinaryPartTooLarge: If the file is larger than max_bytes
+        """
+        size = os.path.getsize(path)
+        if max_bytes is not None and size > max_bytes:
+            raise BinaryPartTooLarge(
+                f'File too large ({size / 1024 / 1024:.1f}MB > {max_bytes / 1024 / 1024}MB)'
+            )
+        return cls(path, kind, mime_type, size)
+
+    @property
+    def sha256(self) -> str:
+        """Hex digest of the content, streamed from disk on first access"""
+        if self._sha256 is None:
+            digest = hashlib.sha256()
+            with open(self.path, 'rb') as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+                    digest.update(chunk)
+            self._sha256 = digest.hexdigest()
+        return self._sha256
+
+    def read_bytes(self) -> bytes:
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def to_base64(self) -> str:
+        return base64.b64encode(self.read_bytes()).decode('utf-8')
+
+    def to_data_uri(self) -> str:
+        return f'data:{self.mime_type};base64,{self.to_base64()}'
+
+    def placeholder(self) -> str:
+        """Short text standing in for the content in text-only contexts"""
+        return f'[{self.kind} {self.path} ({self.mime_type}, {_format_size(self.size)})]'
+
+    def __str__(self) -> str:
+        return self.placeholder()
+
+    def __repr__(self) -> str:
+        return f'BinaryPart(path={self.path!r}, kind={self.kind!r}, size={self.size})'
+
+
+def _format_size(size: int) -> str:
+    if size < 1024:
+        return f'{size}B'
+    if size < 1024 * 1024:
+        return f'{size / 1024:.1f}KB'
+    return f'{size / 1024 / 1024:.1f}MB'
+
+
+def serialize_binary_parts(parts: Iterable[BinaryPart], model_config: Any = None) -> List[Dict[str, Any]]:
+    """
+    Encode binary parts as Responses API content items
+
+    This is the only place the content is read and base64-encoded. Images are
+    sent as input_image and PDFs as input_file when the model supports images;
+    everything else, and every part for text-only models, becomes a short
+    input_text placeholder. Parts whose content was already sent are
+    replaced by a reference to the first occurrence.
+
+    Args:
+        parts: Binary parts in message order
+        model_config: Configuration of the target model (optional)
+
+    Returns:
+        List of content items for a user message
+    """
+    supports_images = bool(getattr(model_config, 'supports_images', False))
+    items: List[Dict[str, Any]] = []
+    first_path_by_hash: Dict[str, str] = {}
+
+    for part in parts:
+        if not supports_images or part.kind not in ('image', 'pdf'):
+            items.append({'type': 'input_text', 'text': part.placeholder()})
+            continue
+
+        try:
+            digest = part.sha256
+            if digest in first_path_by_hash:
+                items.append({
+                    'type': 'input_text',
+                    'text': f'[Same content as {first_path_by_hash[digest]}: {part.path}]'
+                })
+                continue
+
+            data_uri = part.to_data_uri()
+        except OSError as error:
+            items.append({'type': 'input_text', 'text': f'[Could not read {part.path}: {error}]'})
+            continue
+
+        first_path_by_hash[digest] = part.path
+        if part.kind == 'image':
+            items.append({'type': 'input_image', 'image_url': data_uri, 'detail': 'auto'})
+        else:
+            items.append({
+                'type': 'input_file',
+                'file_data': data_uri,
+                'filename': os.path.basename(part.path)
+            })
+
+    return items
@@ -0,0 +1,203 @@
+"""
+Session-scoped file content cache
+
+Files are often read again and again within one session (repeated @path
+mentions, read_file on the same module). File tools keep what they derived
+from a file here - decoded text, formatted parts - and reuse it while the
+file's (mtime, size) signature is unchanged. Every session gets its own cache,
+bounded by an approximate byte budget and evicted least recently used first.
+
+Paths reported through workspace generation bumps are dropped eagerly, so an
+edit that keeps size and mtime (coarse timestamps) is still seen.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from siada.foundation.context import get_session_id
+from siada.foundation.workspace_generation import add_generation_listener
+
+# (st_mtime_ns, st_size) of a file
+FileSignature = Tuple[int, int]
+
+
+def file_signature(path: str) -> Optional[FileSignature]:
+    """
+    Get the signature cache entries are validated against
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        (mtime in ns, size), or None if the file cannot be stat'ed
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory a cached value holds, in bytes"""
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(estimate_size(item) for item in value.values()) + 64
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value) + 8 * len(value)
+    if hasattr(value, '__dict__'):
+        return estimate_size(vars(value))
+    return 16
+
+
+class FileContentCache:
+    """LRU cache of values derived from file contents, bounded by bytes"""
+
+    MAX_BYTES = 32 * 1024 * 1024
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = self.MAX_BYTES if max_bytes is None else max_bytes
+        # (abspath, kind) -> (signature, value, size)
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[FileSignature, Any, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, key: Tuple[str, Hashable]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[2]
+
+    def get(self, path: str, kind: Hashable) -> Optional[Any]:
+        """
+        Get a cached value if the file has not changed since it was stored
+
+        Args:
+            path: Path to the file
+            kind: What the value is (e.g. 'lines'); lets tools cache different views of a file
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        key = (os.path.abspath(path), kind)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+        if entry[0] != file_signature(key[0]):
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    self._drop(key)
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, path: str, kind: Hashable, value: Any,
+            signature: Optional[FileSignature] = None) -> None:
+        """
+        Store a value derived from a file
+
+        Args:
+            path: Path to the file
+            kind: What the value is
+            value: The derived value
+            signature: Signature taken before the file was read; taken now when None
+        """
+        if signature is None:
+            signature = file_signature(path)
+        if signature is None:
+            return
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        key = (os.path.abspath(path), kind)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (signature, value, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+
+    def get_or_load(self, path: str, kind: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Get a cached value, computing and storing it on a miss
+
+        Exceptions raised by loader propagate and nothing is cached.
+        """
+        value = self.get(path, kind)
+        if value is not None:
+            return value
+        signature = file_signature(path)
+        value = loader()
+        if value is not None:
+            self.put(path, kind, value, signature)
+        return value
+
+    def invalidate(self, path: str) -> None:
+        """Drop every value cached for a file"""
+        abspath = os.path.abspath(path)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == abspath]:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+
+class _SessionCaches:
+    """One FileContentCache per session, keeping the most recent sessions"""
+
+    MAX_SESSIONS = 4
+
+    def __init__(self):
+        self._caches: "OrderedDict[Optional[str], FileContentCache]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: Optional[str]) -> FileContentCache:
+        with self._lock:
+            cache = self._caches.get(session_id)
+            if cache is None:
+                cache = self._caches[session_id] = FileContentCache()
+                while len(self._caches) > self.MAX_SESSIONS:
+                    self._caches.popitem(last=False)
+            self._caches.move_to_end(session_id)
+            return cache
+
+    def all(self) -> Dict[Optional[str], FileContentCache]:
+        with self._lock:
+            return dict(self._caches)
+
+    def on_generation(self, generation: int, paths) -> None:
+        if not paths:
+            # Unknown changes are caught by the signature check
+            return
+        for cache in self.all().values():
+            for path in paths:
+                cache.invalidate(path)
+
+
+_session_caches = _SessionCaches()
+add_generation_listener(_session_caches.on_generation)
+
+
+def get_file_content_cache() -> FileContentCache:
+    """
+    Get the content cache of the current session
+
+    Returns:
+        The FileContentCache of get_session_id() (a shared one outside sessions)
+    """
+    return _session_caches.get(get_session_id())
@@ -76,6 +76,65 @@ class GitDiffUtil:
             raise Exception(f"Git diff failed: {e.stderr}")
 
 
+    @staticmethod
+    def get_changed_files(repo_path: str = ".") -> List[str]:
+        """
+        获取当前工作区相对 HEAD 的改动文件，包括已暂存、未暂存和未跟踪的文件。
+
+        Args:
+            repo_path: Git 仓库（或其子目录）的路径，默认为当前目录。
+
+        Returns:
+            List[str]: 改动文件的绝对路径（已删除的文件也会列出），按路径排序。
+        """
+        git_root = GitDiffUtil._require_git_root(repo_path)
+        changed = GitDiffUtil._run_git(git_root, ['diff', '--name-only', '-z', 'HEAD'])
+        if changed is None:
+            # 还没有任何提交时没有 HEAD，退回到与暂存区比较
+            changed = GitDiffUtil._run_git(git_root, ['diff', '--name-only', '-z'])
+        if changed is None:
+            raise Exception(f"Git diff failed: cannot list changed files in {git_root}")
+        untracked = GitDiffUtil.get_untracked_files(repo_path)
+        return sorted({str(git_root / path) for path in changed} | set(untracked))
+
+    @staticmethod
+    def get_untracked_files(repo_path: str = ".") -> List[str]:
+        """
+        获取工作区中未跟踪（且未被忽略）的文件。
+
+        Args:
+            repo_path: Git 仓库（或其子目录）的路径，默认为当前目录。
+
+        Returns:
+            List[str]: 未跟踪文件的绝对路径，按路径排序。
+        """
+        git_root = GitDiffUtil._require_git_root(repo_path)
+        untracked = GitDiffUtil._run_git(git_root, ['ls-files', '--others', '--exclude-standard', '-z'])
+        if untracked is None:
+            raise Exception(f"Git diff failed: cannot list untracked files in {git_root}")
+        return sorted(str(git_root / path) for path in untracked)
+
+    @staticmethod
+    def _require_git_root(repo_path: str) -> Path:
+        repo_path = Path.cwd() if repo_path == "." else Path(repo_path).resolve()
+        git_root = GitDiffUtil._find_git_root(repo_path)
+        if git_root is None:
+            raise ValueError(f"Git diff failed: Path {repo_path} is not a valid Git repository.")
+        return git_root
+
+    @staticmethod
+    def _run_git(git_root: Path, args: List[str]) -> Optional[List[str]]:
+        result = subprocess.run(
+            ['git', *args],
+            cwd=git_root,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            return None
+        # -z 输出以 NUL 分隔，避免特殊字符路径被转义
+        return [path for path in result.stdout.split('\0') if path]
+
     @staticmethod
     def _find_git_root(path: Path) -> Optional[Path]:
         """
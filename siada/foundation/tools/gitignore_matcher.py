@@ -0,0 +1,314 @@
+"""
+Compiled .gitignore matcher
+
+Implements git's ignore rules once for every file tool: each .gitignore is
+compiled to regexes the first time a path below its directory is checked,
+rules are scoped to the directory that declares them (with nested files
+taking precedence and "!" re-including), and verdicts for directories are
+cached so checking many files under the same tree stays cheap.
+
+Rule files are re-read after the workspace generation moves on.
+"""
+import os
+import re
+import threading
+from typing import ClassVar, Dict, Iterable, List, Optional, Tuple
+
+from siada.foundation.workspace_generation import current_generation
+
+
+class GitIgnoreRule:
+    """One compiled line of a .gitignore file"""
+
+    __slots__ = ("pattern", "base_dir", "negated", "dir_only", "match_basename", "regex")
+
+    def __init__(self, pattern: str, base_dir: str, negated: bool, dir_only: bool,
+                 match_basename: bool, regex: "re.Pattern"):
+        self.pattern = pattern
+        # Directory of the declaring file, relative to the matcher root ('' for the root)
+        self.base_dir = base_dir
+        self.negated = negated
+        self.dir_only = dir_only
+        # Patterns without a slash match the name at any depth
+        self.match_basename = match_basename
+        self.regex = regex
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        """
+        Check the rule against a path relative to the matcher root
+
+        Args:
+            rel_path: Path inside base_dir, relative to the matcher root
+            is_dir: Whether the path is a directory
+        """
+        if self.dir_only and not is_dir:
+            return False
+        if self.match_basename:
+            subject = rel_path.rsplit('/', 1)[-1]
+        elif self.base_dir:
+            subject = rel_path[len(self.base_dir) + 1:]
+        else:
+            subject = rel_path
+        return self.regex.match(subject) is not None
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a gitignore glob (without anchoring slashes) to a regex"""
+    result = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern[i:i + 2] == '**':
+                at_start = i == 0 or pattern[i - 1] == '/'
+                at_end = i + 2 == n or pattern[i + 2] == '/'
+                if at_start and at_end:
+                    if i + 2 == n:
+                        # Trailing '/**': everything inside
+                        result.append('.*')
+                        i += 2
+                    else:
+                        # '**/': zero or more directories
+                        result.append('(?:.*/)?')
+                        i += 3
+                    continue
+            result.append('[^/]*')
+            while i < n and pattern[i] == '*':
+                i += 1
+            continue
+        if c == '?':
+            result.append('[^/]')
+        elif c == '[':
+            end = i + 1
+            if end < n and pattern[end] in '!^':
+                end += 1
+            if end < n and pattern[end] == ']':
+                end += 1
+            while end < n and pattern[end] != ']':
+                end += 1
+            if end >= n:
+                result.append('\\[')
+            else:
+                body = pattern[i + 1:end]
+                if body[:1] in ('!', '^'):
+                    body = '^' + body[1:]
+                result.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            result.append(re.escape(pattern[i]))
+        else:
+            result.append(re.escape(c))
+        i += 1
+    return ''.join(result)
+
+
+def compile_gitignore_line(line: str, base_dir: str = '') -> Optional[GitIgnoreRule]:
+    """
+    Compile one .gitignore line
+
+    Args:
+        line: Raw line from the file
+        base_dir: Directory of the file, relative to the matcher root
+
+    Returns:
+        The rule, or None for blank lines and comments
+    """
+    line = line.rstrip('\n').rstrip('\r')
+    # Trailing spaces are ignored unless escaped
+    stripped = line.rstrip(' ')
+    if stripped.endswith('\\') and len(stripped) < len(line):
+        stripped += ' '
+    line = stripped
+    if not line or line.startswith('#'):
+        return None
+
+    negated = line.startswith('!')
+    if negated:
+        line = line[1:]
+    elif line.startswith('\\!') or line.startswith('\\#'):
+        line = line[1:]
+
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+
+    # A slash anywhere but at the end anchors the pattern to base_dir
+    match_basename = '/' not in line
+    line = line.lstrip('/')
+    if not line:
+        return None
+
+    try:
+        regex = re.compile(_translate_glob(line) + r'\Z', re.DOTALL)
+    except re.error:
+        return None
+    return GitIgnoreRule(line, base_dir, negated, dir_only, match_basename, regex)
+
+
+def find_git_root(path: str) -> Optional[str]:
+    """
+    Find the work tree root of the git repository containing path
+
+    Args:
+        path: Any path inside the repository
+
+    Returns:
+        The directory containing .git, or None outside repositories
+    """
+    current = os.path.abspath(path)
+    while True:
+        if os.path.exists(os.path.join(current, '.git')):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+class GitIgnoreMatcher:
+    """
+    Decides whether paths under a root directory are ignored by git
+
+    Honours .gitignore files in the root and every directory below it, the
+    .gitignore files of enclosing directories up to the repository root, and
+    .git/info/exclude. As in git, a path inside an ignored directory is ignored
+    no matter what negations say, and '.git' itself is always ignored.
+    """
+
+    _instances: ClassVar[Dict[str, "GitIgnoreMatcher"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        git_root = find_git_root(self.root)
+        # Rules of enclosing directories apply too, so paths are matched
+        # relative to the repository root
+        self.base = git_root or self.root
+        self._prefix = os.path.relpath(self.root, self.base).replace('\\', '/')
+        if self._prefix == '.':
+            self._prefix = ''
+        self._generation = current_generation()
+        self._rules: Dict[str, Tuple[GitIgnoreRule, ...]] = {}
+        self._dir_ignored: Dict[str, bool] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def for_root(cls, root: str) -> "GitIgnoreMatcher":
+        """Return the shared matcher of a root directory"""
+        root = os.path.abspath(root)
+        with cls._instances_lock:
+            if root not in cls._instances:
+                cls._instances[root] = cls(root)
+            return cls._instances[root]
+
+    def _check_generation(self) -> None:
+        generation = current_generation()
+        if generation != self._generation:
+            self._rules.clear()
+            self._dir_ignored.clear()
+            self._generation = generation
+
+    def _read_rules(self, file_path: str, base_dir: str) -> List[GitIgnoreRule]:
+        rules = []
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    rule = compile_gitignore_line(line, base_dir)
+                    if rule is not None:
+                        rules.append(rule)
+        except OSError:
+            pass
+        return rules
+
+    def _rules_for_dir(self, rel_dir: str) -> Tuple[GitIgnoreRule, ...]:
+        """Return the rules that apply inside rel_dir, lowest precedence first"""
+        rules = self._rules.get(rel_dir)
+        if rules is not None:
+            return rules
+
+        if rel_dir:
+            parent = rel_dir.rsplit('/', 1)[0] if '/' in rel_dir else ''
+            inherited = self._rules_for_dir(parent)
+        else:
+            inherited = tuple(self._read_rules(
+                os.path.join(self.base, '.git', 'info', 'exclude'), ''
+            ))
+        own = self._read_rules(os.path.join(self.base, rel_dir, '.gitignore'), rel_dir)
+        rules = inherited + tuple(own) if own else inherited
+        self._rules[rel_dir] = rules
+        return rules
+
+    def _matches(self, rel_path: str, is_dir: bool) -> bool:
+        """Apply the rules of the parent directory; the last matching rule wins"""
+        parent = rel_path.rsplit('/', 1)[0] if '/' in rel_path else ''
+        for rule in reversed(self._rules_for_dir(parent)):
+            if rule.matches(rel_path, is_dir):
+                return not rule.negated
+        return False
+
+    def _is_dir_ignored(self, rel_dir: str) -> bool:
+        ignored = self._dir_ignored.get(rel_dir)
+        if ignored is None:
+            name = rel_dir.rsplit('/', 1)[-1]
+            parent = rel_dir.rsplit('/', 1)[0] if '/' in rel_dir else ''
+            ignored = (
+                name == '.git'
+                or (bool(parent) and self._is_dir_ignored(parent))
+                or self._matches(rel_dir, True)
+            )
+            self._dir_ignored[rel_dir] = ignored
+        return ignored
+
+    def _to_base_relative(self, path: str) -> Optional[str]:
+        normalized = path.replace('\\', '/')
+        if os.path.isabs(normalized):
+            try:
+                normalized = os.path.relpath(normalized, self.base).replace('\\', '/')
+            except ValueError:
+                return None
+        elif self._prefix:
+            normalized = f"{self._prefix}/{normalized}"
+        normalized = os.path.normpath(normalized).replace('\\', '/')
+        if normalized == '.' or normalized.startswith('../') or normalized == '..':
+            return None
+        return normalized
+
+    def is_ignored(self, path: str, is_dir: Optional[bool] = None) -> bool:
+        """
+        Check whether git would ignore a path
+
+        Args:
+            path: Absolute path, or path relative to the root
+            is_dir: Whether the path is a directory; looked up on disk when None
+
+        Returns:
+            True if the path is ignored, False otherwise (including paths outside the root)
+        """
+        rel_path = self._to_base_relative(path)
+        if rel_path is None:
+            return False
+        if is_dir is None:
+            is_dir = os.path.isdir(os.path.join(self.base, rel_path))
+
+        with self._lock:
+            self._check_generation()
+            if is_dir:
+                return self._is_dir_ignored(rel_path)
+            parent = rel_path.rsplit('/', 1)[0] if '/' in rel_path else ''
+            if parent and self._is_dir_ignored(parent):
+                return True
+            return self._matches(rel_path, False)
+
+    def filter(self, paths: Iterable[str]) -> List[str]:
+        """
+        Drop ignored files from paths
+
+        Args:
+            paths: File paths, absolute or relative to the root
+
+        Returns:
+            The paths that are not ignored, in their original order
+        """
+        return [path for path in paths if not self.is_ignored(path, is_dir=False)]
@@ -0,0 +1,79 @@
+"""
+Workspace generation counter
+
+A process-wide counter that moves forward whenever the workspace may have
+changed (a file edited through edit_file, a shell command run through run_cmd,
+a new user turn). Caches derived from file contents record the generation they
+were built at and treat any newer generation as invalidation.
+
+Listeners can subscribe to bumps to update incrementally; they receive the new
+generation and the changed absolute paths, or None when the change is unknown.
+"""
+import threading
+from typing import Callable, Iterable, List, Optional
+
+GenerationListener = Callable[[int, Optional[List[str]]], None]
+
+_lock = threading.Lock()
+_generation = 0
+_listeners: List[GenerationListener] = []
+
+
+def current_generation() -> int:
+    """
+    Get the current workspace generation
+
+    Returns:
+        The current generation number
+    """
+    return _generation
+
+
+def bump_generation(paths: Optional[Iterable[str]] = None) -> int:
+    """
+    Mark the workspace as changed
+
+    Args:
+        paths: Absolute paths of the changed files, or None if unknown
+
+    Returns:
+        The new generation number
+    """
+    global _generation
+    changed = list(paths) if paths is not None else None
+    with _lock:
+        _generation += 1
+        generation = _generation
+        listeners = list(_listeners)
+
+    for listener in listeners:
+        try:
+            listener(generation, changed)
+        except Exception:
+            # A failing listener must never break the tool that changed the workspace
+            pass
+    return generation
+
+
+def add_generation_listener(listener: GenerationListener) -> None:
+    """
+    Subscribe to workspace generation bumps
+
+    Args:
+        listener: Callable receiving (generation, changed_paths)
+    """
+    with _lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def remove_generation_listener(listener: GenerationListener) -> None:
+    """
+    Unsubscribe from workspace generation bumps
+
+    Args:
+        listener: A previously added listener
+    """
+    with _lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
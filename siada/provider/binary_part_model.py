@@ -0,0 +1,88 @@
+"""
+Attach binary files read by tools to model requests.
+
+Function tool outputs are text, so a tool that reads an image, PDF or video
+returns a placeholder and records the lazy BinaryPart on the context under
+its tool call id. The wrapped model encodes those parts into a user message
+right after the tool outputs, each time a request is built, and only for
+models that support images.
+"""
+
+from typing import Any, AsyncIterator, Dict, List
+
+from agents import Model, ModelProvider, TResponseInputItem
+
+from siada.foundation.tools.binary_part import BinaryPart, serialize_binary_parts
+
+
+def attach_tool_binary_parts(
+    input: str | list[TResponseInputItem],
+    tool_binary_parts: Dict[str, List[BinaryPart]],
+    model_config: Any = None,
+) -> str | list[TResponseInputItem]:
+    """
+    Add the binary parts of tool calls to a model input
+
+    Parts are sent as a user message after each run of consecutive tool
+    outputs; a message in between would separate tool outputs from their
+    calls. Text-only models already get the placeholder in the tool output,
+    so their input is left unchanged.
+
+    Args:
+        input: Model input
+        tool_binary_parts: Binary parts by tool call id
+        model_config: Configuration of the target model (optional)
+
+    Returns:
+        The input, with a user message after tool outputs that read binary files
+    """
+    if isinstance(input, str) or not tool_binary_parts:
+        return input
+    if not getattr(model_config, 'supports_images', False):
+        return input
+
+    items: list[TResponseInputItem] = []
+    pending: List[BinaryPart] = []
+    for item in input:
+        is_output = isinstance(item, dict) and item.get('type') == 'function_call_output'
+        if pending and not is_output:
+            items.append({'role': 'user', 'content': serialize_binary_parts(pending, model_config)})
+            pending = []
+        items.append(item)
+        if is_output:
+            pending.extend(tool_binary_parts.get(item.get('call_id'), []))
+    if pending:
+        items.append({'role': 'user', 'content': serialize_binary_parts(pending, model_config)})
+    return items
+
+
+class BinaryPartModel(Model):
+    """Model that attaches the binary parts of a context's tool calls to each request"""
+
+    def __init__(self, model: Model, context: Any):
+        self.model = model
+        self.context = context
+
+    def _attach(self, input: str | list[TResponseInputItem]) -> str | list[TResponseInputItem]:
+        model_config = None
+        session = getattr(self.context, 'session', None)
+        if session and session.siada_config:
+            model_config = session.siada_config.llm_config
+        return attach_tool_binary_parts(input, self.context.tool_binary_parts, model_config)
+
+    async def get_response(self, system_instructions, input, *args, **kwargs):
+        return await self.model.get_response(system_instructions, self._attach(input), *args, **kwargs)
+
+    def stream_response(self, system_instructions, input, *args, **kwargs) -> AsyncIterator:
+        return self.model.stream_response(system_instructions, self._attach(input), *args, **kwargs)
+
+
+class BinaryPartModelProvider(ModelProvider):
+    """Wraps the models of a provider in BinaryPartModel for one run context"""
+
+    def __init__(self, provider: ModelProvider, context: Any):
+        self.provider = provider
+        self.context = context
+
+    def get_model(self, model_name: str | None) -> Model:
+        return BinaryPartModel(self.provider.get_model(model_name), self.context)
@@ -0,0 +1,144 @@
+"""
+Test impact analysis: which test files a working-tree change can affect.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional, Set
+
+from siada.foundation.tools.get_git_diff import GitDiffUtil
+from siada.tools.ast.import_graph import ImportGraph
+from siada.tools.coder.file_search.trigram_index import TrigramIndex
+from siada.tools.coder.repo_map.repo_map import RepoMap
+
+
+@dataclass
+class TestSelection:
+    """Tests to run for a change, or a full run when the mapping is uncertain."""
+    __test__ = False  # not a pytest test class
+
+    # Changed files considered, relative to the root
+    changed_files: List[str] = field(default_factory=list)
+    # Selected test files relative to the root; empty on a full run
+    tests: List[str] = field(default_factory=list)
+    full_run: bool = False
+    reason: str = ""
+
+
+class TestImpactAnalyzer:
+    """
+    Maps changed files to the test files they can affect.
+
+    A changed test file selects itself. A changed module selects the tests
+    that import it, directly or through other modules (from the shared
+    ImportGraph), and the tests named after it (test_<module>.py or
+    <module>_test.py). An untracked script outside any package that nothing
+    imports, such as a reproduction script, selects nothing. Whenever the
+    mapping cannot be trusted - test configuration changed, a non-Python file
+    changed, a module was deleted, or any other module reaches no test (it
+    may still be loaded dynamically or run as a subprocess) - the selection
+    falls back to a full run.
+    """
+
+    __test__ = False  # not a pytest test class
+
+    # Changes to these files can affect any test
+    CONFIG_FILES = {
+        "conftest.py", "pytest.ini", "pyproject.toml", "setup.cfg", "setup.py",
+        "tox.ini", "noxfile.py", "requirements.txt",
+    }
+    # Changes to these files never affect a test
+    DOC_EXTENSIONS = {".md", ".rst"}
+    # Build and tool artifacts that show up as untracked files when not ignored
+    ARTIFACT_EXTENSIONS = {".pyc", ".pyo"}
+    ARTIFACT_DIRS = {"__pycache__", RepoMap.TAGS_CACHE_DIR, TrigramIndex.INDEX_DIR}
+    # Above this share of all tests a full run is simpler and about as fast
+    MAX_SELECTED_FRACTION = 0.5
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.graph = ImportGraph.for_root(self.root)
+
+    @staticmethod
+    def is_test_file(rel_fname: str) -> bool:
+        """Whether a path names a test module by pytest's default conventions."""
+        name = rel_fname.rsplit("/", 1)[-1]
+        return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+    def _rel_path(self, path: str) -> Optional[str]:
+        rel_fname = os.path.relpath(os.path.join(self.root, path), self.root)
+        if rel_fname.startswith(".."):
+            return None
+        return rel_fname.replace(os.sep, "/")
+
+    def _tests_named_after(self, rel_fname: str, tests: List[str]) -> List[str]:
+        module = rel_fname.rsplit("/", 1)[-1][:-3]
+        if module == "__init__":
+            module = rel_fname.rsplit("/", 2)[-2] if "/" in rel_fname else ""
+        names = {f"test_{module}.py", f"{module}_test.py"}
+        return [test for test in tests if test.rsplit("/", 1)[-1] in names]
+
+    def _is_standalone_script(self, rel_fname: str, untracked: Set[str]) -> bool:
+        """Whether a file is an untracked script outside any package"""
+        directory = os.path.dirname(os.path.join(self.root, rel_fname))
+        return rel_fname in untracked and not os.path.exists(os.path.join(directory, "__init__.py"))
+
+    def select(self, changed_files: Optional[List[str]] = None,
+               untracked_files: Optional[List[str]] = None) -> TestSelection:
+        """
+        Select the test files affected by a change.
+
+        Args:
+            changed_files: Changed paths, absolute or relative to the root;
+                defaults to the working-tree changes reported by GitDiffUtil
+            untracked_files: Which of the changed paths git does not track;
+                defaults to GitDiffUtil's answer when changed_files is not
+                given, and to none otherwise
+
+        Returns:
+            TestSelection with the tests to run, or full_run set and the reason
+        """
+        if changed_files is None:
+            changed_files = GitDiffUtil.get_changed_files(self.root)
+            if untracked_files is None:
+                untracked_files = GitDiffUtil.get_untracked_files(self.root)
+        changed = sorted({rel for rel in map(self._rel_path, changed_files) if rel is not None})
+        untracked = {rel for rel in map(self._rel_path, untracked_files or []) if rel is not None}
+        if not changed:
+            return TestSelection(changed, full_run=True, reason="no changed files to map to tests")
+
+        all_tests = [path for path in self.graph.files() if self.is_test_file(path)]
+        selected = set()
+        for rel_fname in changed:
+            name = rel_fname.rsplit("/", 1)[-1]
+            extension = os.path.splitext(name)[1]
+            if name in self.CONFIG_FILES:
+                return TestSelection(changed, full_run=True, reason=f"test configuration changed: {rel_fname}")
+            if extension in self.DOC_EXTENSIONS or extension in self.ARTIFACT_EXTENSIONS:
+                continue
+            if self.ARTIFACT_DIRS.intersection(rel_fname.split("/")[:-1]):
+                continue
+            if extension != ".py":
+                return TestSelection(changed, full_run=True, reason=f"non-Python file changed: {rel_fname}")
+            if not os.path.exists(os.path.join(self.root, rel_fname)):
+                return TestSelection(changed, full_run=True, reason=f"module deleted: {rel_fname}")
+
+            if self.is_test_file(rel_fname):
+                selected.add(rel_fname)
+                continue
+            dependents = self.graph.dependents(rel_fname, transitive=True)
+            tests = [path for path in dependents if self.is_test_file(path)]
+            tests += self._tests_named_after(rel_fname, all_tests)
+            if not tests:
+                if not dependents and self._is_standalone_script(rel_fname, untracked):
+                    continue
+                return TestSelection(changed, full_run=True, reason=f"no test imports or is named after {rel_fname}")
+            selected.update(tests)
+
+        if not selected:
+            return TestSelection(changed, reason="only documentation or untracked scripts changed")
+        if all_tests and len(selected) > len(all_tests) * self.MAX_SELECTED_FRACTION:
+            return TestSelection(changed, full_run=True,
+                                 reason=f"{len(selected)} of {len(all_tests)} test files are affected")
+        return TestSelection(changed, tests=sorted(selected),
+                             reason=f"{len(selected)} test file(s) import or are named after the changed files")
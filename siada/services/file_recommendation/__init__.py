@@ -7,6 +7,7 @@ When users type @ followed by text, the system provides real-time file and direc
 Main Components:
 - FileRecommendationEngine: Main engine that coordinates all components
 - CompletionEngine: Core completion logic
+- CompletionWorker: Debounced background thread running completion queries
 - FileDiscoveryService: File discovery and filtering
 - Suggestion data structures and utilities
 
@@ -23,6 +24,7 @@ Usage:
 """
 
 from .core.completion_engine import CompletionEngine
+from .core.completion_worker import CompletionWorker
 from .core.file_discovery import FileDiscoveryService
 from .core.suggestion import Suggestion
 from .core.config import CompletionConfig, FilterOptions, DEFAULT_COMPLETION_CONFIG
@@ -38,6 +40,7 @@ from .utils.text_utils import (
 __all__ = [
     # Main classes
     'CompletionEngine',
+    'CompletionWorker',
     'FileDiscoveryService',
     'FileRecommendationEngine',
     
@@ -89,6 +92,10 @@ class FileRecommendationEngine:
             search_directories=[self.current_directory],
             config=self.config
         )
+        self.completion_worker = CompletionWorker(
+            self.completion_engine,
+            debounce_delay_ms=self.config.debounce_delay_ms
+        )
     
     def should_show_suggestions(self, text: str, cursor_row: int = 0, cursor_col: int = None) -> bool:
         """
@@ -121,16 +128,36 @@ class FileRecommendationEngine:
         """
         Synchronous version of get_suggestions
         
+        Runs on the completion worker's event loop instead of creating one per call.
+        
+        Args:
+            text: Input text containing @ command
+            
+        Returns:
+            List of file suggestions
+        """
+        return self.completion_worker.get_suggestions(
+            text,
+            debounce=False,
+            timeout=self.config.search_timeout_ms / 1000
+        )
+    
+    def request_suggestions(self, text: str) -> list[Suggestion]:
+        """
+        Get suggestions for a keystroke, debounced and cancellable
+        
+        Meant for completers called on every keypress: the query runs on the
+        completion worker after the debounce delay, and a newer keystroke
+        supersedes it, in which case this returns without results.
+        
         Args:
             text: Input text containing @ command
             
         Returns:
             List of file suggestions
         """
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-            return loop.run_until_complete(self.get_suggestions(text))
-        except RuntimeError:
-            # No event loop running, create a new one
-            return asyncio.run(self.get_suggestions(text))
+        return self.completion_worker.get_suggestions(
+            text,
+            debounce=True,
+            timeout=self.config.search_timeout_ms / 1000
+        )
@@ -3,12 +3,14 @@ Core components for file recommendation functionality.
 """
 
 from .completion_engine import CompletionEngine
+from .completion_worker import CompletionWorker
 from .file_discovery import FileDiscoveryService
 from .suggestion import Suggestion
 from .config import CompletionConfig, FilterOptions, DEFAULT_COMPLETION_CONFIG
 
 __all__ = [
     'CompletionEngine',
+    'CompletionWorker',
     'FileDiscoveryService', 
     'Suggestion',
     'CompletionConfig',
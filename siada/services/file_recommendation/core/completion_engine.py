@@ -3,12 +3,13 @@ Completion engine for file recommendation system.
 """
 
 import asyncio
+import heapq
 import time
 from typing import List, Optional
 
 from .config import CompletionConfig, FilterOptions
 from .file_discovery import FileDiscoveryService
-from .suggestion import Suggestion, sort_suggestions, limit_suggestions
+from .suggestion import Suggestion, create_suggestion, sort_suggestions, limit_suggestions
 from ..utils.text_utils import parse_at_command_path, extract_at_path_from_text
 from ..utils.path_utils import escape_path
 
@@ -32,7 +33,14 @@ class CompletionEngine:
         
         # Initialize file discovery services for each directory
         for directory in search_directories:
-            self.file_discovery_services[directory] = FileDiscoveryService(directory)
+            self._add_discovery_service(directory)
+    
+    def _add_discovery_service(self, directory: str):
+        service = FileDiscoveryService(directory)
+        self.file_discovery_services[directory] = service
+        if self.config.enable_recursive_search:
+            # Start building the path index in the background
+            service.get_path_index(self.config.get_filter_options(), self.config.max_search_depth)
     
     async def get_suggestions(self, text: str) -> List[Suggestion]:
         """
@@ -59,6 +67,11 @@ class CompletionEngine:
             if not prefix and base_dir == ".":
                 return await self._get_directory_listing()
             
+            # Rank matches through the path indexes when they are built
+            ranked_suggestions = self._search_files_ranked(base_dir, prefix)
+            if ranked_suggestions is not None:
+                return ranked_suggestions
+            
             # Search for matching files
             suggestions = await self._search_files(base_dir, prefix)
             
@@ -102,6 +115,62 @@ class CompletionEngine:
         
         return all_suggestions
     
+    def _search_files_ranked(self, base_dir: str, prefix: str) -> Optional[List[Suggestion]]:
+        """
+        Search the path indexes and rank matches with the fuzzy scorer
+        
+        Matches of all search directories are merged by score, and only the
+        top max_results become Suggestion objects.
+        
+        Args:
+            base_dir: Base directory to search in
+            prefix: Search prefix
+            
+        Returns:
+            Ranked suggestions, or None when recursive search is off or an index is still building
+        """
+        if not self.config.enable_recursive_search:
+            return None
+        
+        filter_options = self.config.get_filter_options()
+        scored_matches = []
+        
+        for directory in self.search_directories:
+            service = self.file_discovery_services.get(directory)
+            if service is None:
+                continue
+            
+            if base_dir == ".":
+                search_dir = directory
+            else:
+                search_dir = self._resolve_search_directory(directory, base_dir)
+                if not search_dir:
+                    continue
+            
+            matches = service.find_files_ranked(
+                search_dir,
+                prefix,
+                filter_options,
+                self.config.max_results,
+                self.config.max_search_depth
+            )
+            if matches is None:
+                return None
+            scored_matches.extend(matches)
+        
+        if not prefix:
+            # Nothing to rank by: keep the usual depth and name order
+            suggestions = [create_suggestion(label=label, value=escape_path(label))
+                           for label, _ in scored_matches]
+            return limit_suggestions(sort_suggestions(suggestions), self.config.max_results)
+        
+        top_matches = heapq.nsmallest(
+            self.config.max_results,
+            scored_matches,
+            key=lambda match: (-match[1], len(match[0]), match[0])
+        )
+        return [create_suggestion(label=label, value=escape_path(label)) for label, _ in top_matches]
+    
     async def _search_files(self, base_dir: str, prefix: str) -> List[Suggestion]:
         """
         Search for files matching the prefix
@@ -312,7 +381,7 @@ class CompletionEngine:
         """
         if directory not in self.search_directories:
             self.search_directories.append(directory)
-            self.file_discovery_services[directory] = FileDiscoveryService(directory)
+            self._add_discovery_service(directory)
     
     def remove_search_directory(self, directory: str):
         """
@@ -328,10 +397,11 @@ class CompletionEngine:
     
     def clear_cache(self):
         """
-        Clear any cached data (for future cache implementation)
+        Clear cached data by rebuilding the path indexes in the background
         """
-        # Placeholder for cache clearing functionality
-        pass
+        filter_options = self.config.get_filter_options()
+        for service in self.file_discovery_services.values():
+            service.get_path_index(filter_options, self.config.max_search_depth).refresh()
     
     def get_stats(self) -> dict:
         """
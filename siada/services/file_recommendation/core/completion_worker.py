@@ -0,0 +1,154 @@
+"""
+Background completion worker for file recommendation system.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import CancelledError, Future, TimeoutError as FutureTimeoutError
+from typing import List, Optional, Tuple
+
+from .completion_engine import CompletionEngine
+from .suggestion import Suggestion
+
+
+class CompletionWorker:
+    """
+    Long-lived thread that runs completion queries off the input path
+
+    The thread owns one event loop for its whole life. Queries submitted
+    while typing are coalesced: each one waits out the debounce delay, and a
+    newer query cancels the one before it, whether it is still waiting or
+    already searching. Callers get a Future, or block on get_suggestions()
+    from a completer thread.
+    """
+
+    def __init__(self, completion_engine: CompletionEngine, debounce_delay_ms: int = 100):
+        """
+        Initialize completion worker
+
+        Args:
+            completion_engine: Engine the queries run on
+            debounce_delay_ms: Quiet time after a keystroke before its query runs
+        """
+        self.completion_engine = completion_engine
+        self.debounce_delay_ms = debounce_delay_ms
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._current: Optional[Tuple[asyncio.Task, Future]] = None
+        self._latest: Tuple[Optional[str], List[Suggestion]] = (None, [])
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name='completion-worker', daemon=True)
+                self._thread.start()
+                started.wait()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, text: str, debounce: bool = True) -> Future:
+        """
+        Queue a completion query, superseding any earlier one
+
+        Args:
+            text: Input text containing @ command
+            debounce: Whether to wait out the debounce delay first
+
+        Returns:
+            Future resolving to the suggestions; cancelled if a newer query supersedes it
+        """
+        loop = self._ensure_started()
+        future: Future = Future()
+        delay = self.debounce_delay_ms / 1000 if debounce else 0
+        loop.call_soon_threadsafe(self._start_query, text, delay, future)
+        return future
+
+    def _start_query(self, text: str, delay: float, future: Future):
+        # Runs on the worker loop, so queries start in submission order
+        if self._current is not None:
+            previous_task, previous_future = self._current
+            previous_task.cancel()
+            previous_future.cancel()
+        if future.cancelled():
+            self._current = None
+            return
+        task = self._loop.create_task(self._run_query(text, delay, future))
+        self._current = (task, future)
+
+    async def _run_query(self, text: str, delay: float, future: Future):
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            suggestions = await self.completion_engine.get_suggestions(text)
+        except asyncio.CancelledError:
+            future.cancel()
+            return
+        except Exception as error:
+            if not future.done():
+                future.set_exception(error)
+            return
+        finally:
+            if self._current is not None and self._current[1] is future:
+                self._current = None
+
+        self._latest = (text, suggestions)
+        if not future.done():
+            future.set_result(suggestions)
+
+    def get_suggestions(self, text: str, debounce: bool = True,
+                        timeout: Optional[float] = None) -> List[Suggestion]:
+        """
+        Run a query on the worker and wait for it
+
+        Meant for completer threads: a query superseded by a newer keystroke
+        returns right away with the latest finished results for the same text,
+        or an empty list.
+
+        Args:
+            text: Input text containing @ command
+            debounce: Whether to wait out the debounce delay first
+            timeout: Seconds to wait before giving up (optional)
+
+        Returns:
+            List of file suggestions
+        """
+        future = self.submit(text, debounce)
+        try:
+            return future.result(timeout)
+        except (CancelledError, FutureTimeoutError):
+            return self.latest_suggestions(text)
+
+    def latest_suggestions(self, text: Optional[str] = None) -> List[Suggestion]:
+        """
+        Get the results of the most recent finished query
+
+        Args:
+            text: Only return them if they were computed for this text (optional)
+
+        Returns:
+            List of file suggestions
+        """
+        latest_text, suggestions = self._latest
+        if text is not None and latest_text != text:
+            return []
+        return suggestions
+
+    def stop(self):
+        """Stop the worker thread; a later query starts a new one"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
@@ -2,63 +2,19 @@
 File discovery and filtering service.
 """
 
+import asyncio
 import os
 import glob
-import fnmatch
-from pathlib import Path
 from typing import List, Optional, Tuple
 
+from siada.foundation.tools.gitignore_matcher import GitIgnoreMatcher
+
 from .config import FilterOptions
+from .path_index import PathIndex
 from .suggestion import Suggestion, create_suggestion
 from ..utils.path_utils import escape_path, is_hidden_file, normalize_path_separators
 
 
-class GitIgnoreParser:
-    """Simple .gitignore parser"""
-    
-    def __init__(self, project_root: str):
-        self.project_root = Path(project_root).resolve()
-        self.patterns = []
-        
-    def load_git_repo_patterns(self):
-        """Load patterns from .gitignore file"""
-        gitignore_path = self.project_root / '.gitignore'
-        if gitignore_path.exists():
-            self.load_patterns_from_file(gitignore_path)
-    
-    def load_patterns_from_file(self, file_path: Path):
-        """Load patterns from a specific file"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        self.patterns.append(line)
-        except (IOError, UnicodeDecodeError):
-            pass  # Ignore errors
-    
-    def is_ignored(self, file_path: str) -> bool:
-        """Check if file path is ignored"""
-        normalized_path = normalize_path_separators(file_path)
-        
-        for pattern in self.patterns:
-            if self._match_pattern(normalized_path, pattern):
-                return True
-        
-        return False
-    
-    def _match_pattern(self, file_path: str, pattern: str) -> bool:
-        """Check if file path matches gitignore pattern"""
-        # Simple pattern matching - this could be enhanced
-        if pattern.endswith('/'):
-            # Directory pattern
-            pattern = pattern.rstrip('/')
-            return fnmatch.fnmatch(file_path, pattern) or fnmatch.fnmatch(os.path.dirname(file_path), pattern)
-        else:
-            # File pattern
-            return fnmatch.fnmatch(file_path, pattern) or fnmatch.fnmatch(os.path.basename(file_path), pattern)
-
-
 class FileDiscoveryService:
     """File discovery and filtering service"""
     
@@ -68,11 +24,7 @@ class FileDiscoveryService:
         
         # Initialize Git ignore filter
         if self._is_git_repository(self.project_root):
-            self.git_ignore_filter = GitIgnoreParser(self.project_root)
-            try:
-                self.git_ignore_filter.load_git_repo_patterns()
-            except Exception:
-                pass  # Ignore errors
+            self.git_ignore_filter = GitIgnoreMatcher.for_root(self.project_root)
     
     def _is_git_repository(self, path: str) -> bool:
         """Check if directory is a git repository"""
@@ -101,6 +53,55 @@ class FileDiscoveryService:
             return self.git_ignore_filter.is_ignored(file_path)
         return False
     
+    def get_path_index(self, filter_options: FilterOptions,
+                       max_depth: int = PathIndex.MAX_DEPTH) -> PathIndex:
+        """
+        Get the in-memory path index of the project, starting its build if needed
+        
+        Args:
+            filter_options: Filter options the index must honour
+            max_depth: Maximum directory depth to index
+        
+        Returns:
+            PathIndex: Shared index for the project root and options
+        """
+        return PathIndex.for_root(self.project_root, filter_options.respect_git_ignore, max_depth)
+    
+    def find_files_ranked(
+        self,
+        start_dir: str,
+        search_prefix: str,
+        filter_options: FilterOptions,
+        max_results: int = 50,
+        max_depth: int = PathIndex.MAX_DEPTH
+    ) -> Optional[List[Tuple[str, int]]]:
+        """
+        Rank files and directories against the prefix through the in-memory path index
+        
+        Uses the fzf-style fuzzy scorer and never touches the filesystem.
+        
+        Args:
+            start_dir: Directory to search below
+            search_prefix: Search prefix
+            filter_options: Filter options
+            max_results: Maximum number of results
+            max_depth: Maximum directory depth to index
+        
+        Returns:
+            List of (label, score), best first, with a '/' suffix on directories;
+            None while the index is still being built
+        """
+        scope = os.path.relpath(os.path.abspath(start_dir), self.project_root)
+        if scope.startswith('..'):
+            return None
+        
+        matches = self.get_path_index(filter_options, max_depth).fuzzy_search(
+            search_prefix, normalize_path_separators(scope), max_results
+        )
+        if matches is None:
+            return None
+        return [(path + ('/' if is_dir else ''), score) for path, is_dir, score in matches]
+    
     async def find_files_recursively(
         self,
         start_dir: str,
@@ -129,6 +130,9 @@ class FileDiscoveryService:
         if depth > max_depth:
             return []
         
+        # Yield once per directory so a superseded query can be cancelled mid-walk
+        await asyncio.sleep(0)
+        
         lower_search_prefix = search_prefix.lower()
         found_suggestions = []
         
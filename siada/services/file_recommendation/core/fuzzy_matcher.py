@@ -0,0 +1,185 @@
+"""
+fzf-style fuzzy scoring of paths for file suggestions.
+"""
+
+import heapq
+import re
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+# Scoring scheme of fzf: every matched character earns SCORE_MATCH, gaps are
+# penalized, and characters at word boundaries earn bonuses
+SCORE_MATCH = 16
+SCORE_GAP_START = -3
+SCORE_GAP_EXTENSION = -1
+
+BONUS_BOUNDARY = SCORE_MATCH // 2
+BONUS_NON_WORD = SCORE_MATCH // 2
+# Start of a path segment, i.e. right after '/'
+BONUS_SEGMENT_START = BONUS_BOUNDARY + 2
+# lower -> Upper or letter -> digit transition
+BONUS_CAMEL_123 = BONUS_BOUNDARY + SCORE_GAP_EXTENSION
+BONUS_CONSECUTIVE = -(SCORE_GAP_START + SCORE_GAP_EXTENSION)
+BONUS_FIRST_CHAR_MULTIPLIER = 2
+# Whole match inside the file name rather than spread over directories
+BONUS_BASENAME = SCORE_MATCH * 2
+
+_CLASS_LOWER, _CLASS_UPPER, _CLASS_NUMBER, _CLASS_SEPARATOR, _CLASS_NON_WORD = range(5)
+
+
+def _char_class(char: str) -> int:
+    if char.islower():
+        return _CLASS_LOWER
+    if char.isupper():
+        return _CLASS_UPPER
+    if char.isdigit():
+        return _CLASS_NUMBER
+    if char == '/':
+        return _CLASS_SEPARATOR
+    if char.isalpha():
+        # Letters without case (CJK etc.) behave like lowercase
+        return _CLASS_LOWER
+    return _CLASS_NON_WORD
+
+
+def _position_bonus(previous_class: int, current_class: int) -> int:
+    if current_class in (_CLASS_SEPARATOR, _CLASS_NON_WORD):
+        return BONUS_NON_WORD
+    if previous_class == _CLASS_SEPARATOR:
+        return BONUS_SEGMENT_START
+    if previous_class == _CLASS_NON_WORD:
+        return BONUS_BOUNDARY
+    if previous_class == _CLASS_LOWER and current_class == _CLASS_UPPER:
+        return BONUS_CAMEL_123
+    if previous_class != _CLASS_NUMBER and current_class == _CLASS_NUMBER:
+        return BONUS_CAMEL_123
+    return 0
+
+
+def _match_window(query: str, text: str, start: int = 0) -> Optional[Tuple[int, int]]:
+    """
+    Find the shortest window of text, from the first occurrence on, holding query as a subsequence
+
+    A forward scan finds where the match ends; a backward scan from there
+    finds the latest start, as fzf's v1 algorithm does.
+    """
+    position = start
+    for char in query:
+        position = text.find(char, position)
+        if position < 0:
+            return None
+        position += 1
+    end = position
+
+    position = end
+    for char in reversed(query):
+        position = text.rfind(char, start, position)
+    return position, end
+
+
+def _score_window(query: str, text: str, lowered: str, start: int, end: int) -> int:
+    score = 0
+    query_index = 0
+    in_gap = False
+    consecutive = 0
+    first_bonus = 0
+    previous_class = _char_class(text[start - 1]) if start > 0 else _CLASS_SEPARATOR
+
+    for index in range(start, end):
+        char = text[index]
+        current_class = _char_class(char)
+        if query_index < len(query) and lowered[index] == query[query_index]:
+            score += SCORE_MATCH
+            bonus = _position_bonus(previous_class, current_class)
+            if consecutive == 0:
+                first_bonus = bonus
+            else:
+                # A run of matches keeps the bonus of the boundary it started at
+                if bonus >= BONUS_BOUNDARY and bonus > first_bonus:
+                    first_bonus = bonus
+                bonus = max(bonus, first_bonus, BONUS_CONSECUTIVE)
+            score += bonus * BONUS_FIRST_CHAR_MULTIPLIER if query_index == 0 else bonus
+            in_gap = False
+            consecutive += 1
+            query_index += 1
+        else:
+            score += SCORE_GAP_EXTENSION if in_gap else SCORE_GAP_START
+            in_gap = True
+            consecutive = 0
+            first_bonus = 0
+        previous_class = current_class
+
+    return score
+
+
+def fuzzy_score(query: str, path: str) -> Optional[int]:
+    """
+    Score how well a path matches a query, fzf style
+
+    The query must appear in the path as a case-insensitive subsequence.
+    Matches at path segment starts, after '_', '-' or '.', at camelCase
+    humps and in runs score higher; gaps cost points. A match that lies
+    entirely inside the file name earns an extra bonus.
+
+    Args:
+        query: Text typed by the user
+        path: Candidate path, '/'-separated
+
+    Returns:
+        Score (higher is better), or None if the path does not match
+    """
+    if not query:
+        return 0
+    query = query.lower()
+    lowered = path.lower()
+
+    window = _match_window(query, lowered)
+    if window is None:
+        return None
+    score = _score_window(query, path, lowered, *window)
+
+    basename_start = path.rfind('/', 0, len(path) - 1) + 1
+    if basename_start > window[0]:
+        basename_window = _match_window(query, lowered, basename_start)
+        if basename_window is not None:
+            score = max(score, _score_window(query, path, lowered, *basename_window) + BONUS_BASENAME)
+    else:
+        score += BONUS_BASENAME
+    return score
+
+
+def compile_subsequence_pattern(query: str) -> Pattern:
+    """
+    Compile a regex matching whole lines that hold query as a subsequence
+
+    Used with findall on a newline-joined, lowercased list of paths, so
+    candidates are found in C before they are scored. Each query character is
+    reached with a possessive skip, which keeps the match free of backtracking.
+    """
+    parts = ['^']
+    for char in query.lower():
+        escaped = re.escape(char)
+        parts.append(f'[^{escaped}\\n]*+{escaped}')
+    parts.append('[^\\n]*')
+    return re.compile(''.join(parts), re.MULTILINE)
+
+
+def rank_paths(query: str, paths: Iterable[str], limit: int) -> List[Tuple[int, str]]:
+    """
+    Score paths and keep the best ones
+
+    Ties are broken by shorter path, then alphabetically.
+
+    Args:
+        query: Text typed by the user
+        paths: Candidate paths
+        limit: Number of results to keep
+
+    Returns:
+        List of (score, path), best first
+    """
+    scored = []
+    for path in paths:
+        score = fuzzy_score(query, path)
+        if score is not None:
+            scored.append((-score, len(path), path))
+    return [(-negated, path) for negated, _, path in heapq.nsmallest(limit, scored)]
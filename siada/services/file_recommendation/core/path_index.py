@@ -0,0 +1,381 @@
+"""
+In-memory path index for @ completion.
+"""
+
+import heapq
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from siada.foundation.tools.gitignore_matcher import GitIgnoreMatcher
+from siada.foundation.workspace_generation import add_generation_listener
+
+from .fuzzy_matcher import compile_subsequence_pattern, rank_paths
+
+
+class _Snapshot:
+    """Immutable, query-ready view of the indexed paths"""
+
+    def __init__(self, entries: Dict[str, bool]):
+        self.entries = entries
+        # Relative paths in sorted order, with lowercased keys alongside
+        self.paths = sorted(entries)
+        keys = [path.lower() for path in self.paths]
+        # Entries sorted by lowercased file name, for name-prefix lookups
+        by_name = sorted((path.rsplit('/', 1)[-1].lower(), path) for path in self.paths)
+        self.name_keys = [name for name, _ in by_name]
+        self.name_paths = [path for _, path in by_name]
+        # All keys joined into one string, so substring queries run in str.find
+        self.blob = '\n'.join(keys)
+        self.offsets = [0] + list(accumulate(len(key) + 1 for key in keys))[:-1] if keys else []
+        # Lowercased key -> original paths, for mapping regex hits in the blob back
+        self.paths_by_key: Dict[str, List[str]] = {}
+        for key, path in zip(keys, self.paths):
+            self.paths_by_key.setdefault(key, []).append(path)
+        self.hidden = {path for path in self.paths if path.rsplit('/', 1)[-1].startswith('.')}
+
+    def scope_range(self, scope: str) -> Tuple[int, int]:
+        """Index range of the paths below a directory ('' for the whole index)"""
+        if not scope:
+            return 0, len(self.paths)
+        return bisect_left(self.paths, scope + '/'), bisect_left(self.paths, scope + '0')
+
+
+class PathIndex:
+    """
+    Sorted index of the relative paths of a project, for @ completion
+
+    Built once by a background thread with a single scandir walk, then kept
+    current from workspace generation bumps: changed paths are applied
+    incrementally, unknown changes trigger a rebuild. Queries read an immutable
+    snapshot and never touch the filesystem, so they stay fast while an update
+    is in progress.
+
+    The walk mirrors FileDiscoveryService.find_files_recursively: hidden
+    directories and node_modules are listed but not entered, git-ignored paths
+    are left out when respecting .gitignore, and the depth is bounded.
+    """
+
+    MAX_DEPTH = 10
+    # Upper bound of candidates the fuzzy scorer runs on per query
+    MAX_SCORED_CANDIDATES = 2000
+    SKIPPED_DIRS = {'node_modules'}
+
+    _instances: Dict[Tuple[str, bool, int], "PathIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, project_root: str, respect_git_ignore: bool = True,
+                 max_depth: int = MAX_DEPTH):
+        self.project_root = os.path.abspath(project_root)
+        self.respect_git_ignore = respect_git_ignore
+        self.max_depth = max_depth
+        self.git_ignore_matcher = None
+        if respect_git_ignore and os.path.exists(os.path.join(self.project_root, '.git')):
+            self.git_ignore_matcher = GitIgnoreMatcher.for_root(self.project_root)
+
+        self._snapshot: Optional[_Snapshot] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._pending_rebuild = True
+        self._pending_paths: Set[str] = set()
+        add_generation_listener(self._on_generation)
+
+    @classmethod
+    def for_root(cls, project_root: str, respect_git_ignore: bool = True,
+                 max_depth: int = MAX_DEPTH) -> "PathIndex":
+        """Return the shared index of a project root, starting its build if needed"""
+        key = (os.path.abspath(project_root), respect_git_ignore, max_depth)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(*key)
+            index = cls._instances[key]
+        index.start()
+        return index
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def start(self) -> None:
+        """Build the index in the background if it has not been built yet"""
+        self._schedule()
+
+    def refresh(self) -> None:
+        """Rebuild the index in the background; queries keep using the old one meanwhile"""
+        with self._lock:
+            self._pending_rebuild = True
+        self._schedule()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first build has finished"""
+        return self._ready.wait(timeout)
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until pending updates have been applied"""
+        with self._lock:
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+            return not worker.is_alive()
+        return True
+
+    def search(self, prefix: str, scope: str = '',
+               max_results: int = 50) -> Optional[List[Tuple[str, bool]]]:
+        """
+        Find indexed paths matching a completion prefix
+
+        Entries whose name starts with the prefix come first, then entries
+        whose path contains it, both case-insensitively. Hidden entries are
+        only returned when the prefix starts with '.'.
+
+        Args:
+            prefix: Text typed after @ (or after the last '/')
+            scope: Directory relative to the project root to search below ('' for all)
+            max_results: Maximum number of results
+
+        Returns:
+            List of (relative path, is_dir), or None while the index is not built yet
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+
+        scope = scope.replace('\\', '/').strip('/')
+        if scope == '.':
+            scope = ''
+        lower_prefix = prefix.lower()
+        show_hidden = prefix.startswith('.')
+        start, end = snapshot.scope_range(scope)
+        scope_prefix = scope + '/' if scope else ''
+        results: List[Tuple[str, bool]] = []
+        seen: Set[str] = set()
+
+        def accept(path: str) -> bool:
+            if path in seen:
+                return False
+            if not show_hidden and path.rsplit('/', 1)[-1].startswith('.'):
+                return False
+            seen.add(path)
+            results.append((path, snapshot.entries[path]))
+            return len(results) >= max_results
+
+        if not lower_prefix:
+            for path in snapshot.paths[start:end]:
+                if accept(path):
+                    break
+            return results
+
+        # 1. Name prefix matches, by bisecting the sorted names
+        position = bisect_left(snapshot.name_keys, lower_prefix)
+        while position < len(snapshot.name_keys) and snapshot.name_keys[position].startswith(lower_prefix):
+            path = snapshot.name_paths[position]
+            position += 1
+            if path.startswith(scope_prefix) and accept(path):
+                return results
+
+        # 2. Substring matches anywhere in the path, within the scope's slice of the blob
+        if start >= end:
+            return results
+        blob_start = snapshot.offsets[start]
+        blob_end = snapshot.offsets[end] - 1 if end < len(snapshot.offsets) else len(snapshot.blob)
+        position = snapshot.blob.find(lower_prefix, blob_start, blob_end)
+        while position != -1:
+            index = bisect_right(snapshot.offsets, position) - 1
+            if accept(snapshot.paths[index]):
+                break
+            # Continue after this entry; it cannot match twice
+            next_entry = index + 1
+            if next_entry >= end:
+                break
+            position = snapshot.blob.find(lower_prefix, snapshot.offsets[next_entry], blob_end)
+        return results
+
+    def fuzzy_search(self, query: str, scope: str = '',
+                     max_results: int = 50) -> Optional[List[Tuple[str, bool, int]]]:
+        """
+        Rank indexed paths against a query with the fzf-style scorer
+
+        Candidates holding the query as a subsequence are found with one regex
+        pass over the joined keys, after the files whose name starts with the
+        query. At most MAX_SCORED_CANDIDATES of them are scored, and only the
+        best max_results are returned. An empty query lists the scope, shallow
+        entries first. Hidden entries follow the rule of search().
+
+        Args:
+            query: Text typed after @ (or after the last '/')
+            scope: Directory relative to the project root to search below ('' for all)
+            max_results: Maximum number of results
+
+        Returns:
+            List of (relative path, is_dir, score), best first, or None while
+            the index is not built yet
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+
+        scope = scope.replace('\\', '/').strip('/')
+        if scope == '.':
+            scope = ''
+        start, end = snapshot.scope_range(scope)
+        if start >= end:
+            return []
+        show_hidden = query.startswith('.')
+
+        def visible(path: str) -> bool:
+            return show_hidden or not path.rsplit('/', 1)[-1].startswith('.')
+
+        if not query:
+            listing = heapq.nsmallest(
+                max_results,
+                (path for path in snapshot.paths[start:end] if visible(path)),
+                key=lambda path: (path.count('/'), not snapshot.entries[path], path.lower())
+            )
+            return [(path, snapshot.entries[path], 0) for path in listing]
+
+        # Files whose name starts with the query score highest; take them first
+        scope_prefix = scope + '/' if scope else ''
+        lower_query = query.lower()
+        candidates = []
+        position = bisect_left(snapshot.name_keys, lower_query)
+        while position < len(snapshot.name_keys) and snapshot.name_keys[position].startswith(lower_query):
+            path = snapshot.name_paths[position]
+            if path.startswith(scope_prefix):
+                candidates.append(path)
+            position += 1
+
+        # Ties are broken by length, so short paths are the best bet when capping
+        room = self.MAX_SCORED_CANDIDATES - len(candidates)
+        if room < 0:
+            candidates = heapq.nsmallest(self.MAX_SCORED_CANDIDATES, candidates, key=len)
+        elif room > 0:
+            blob_start = snapshot.offsets[start]
+            blob_end = snapshot.offsets[end] - 1 if end < len(snapshot.offsets) else len(snapshot.blob)
+            matched_keys = compile_subsequence_pattern(query).findall(snapshot.blob, blob_start, blob_end)
+            if len(matched_keys) > room + len(candidates):
+                matched_keys = heapq.nsmallest(room + len(candidates), matched_keys, key=len)
+            candidates.extend(path for key in matched_keys for path in snapshot.paths_by_key[key])
+
+        # Over-fetch by the hidden entries, which are dropped after ranking
+        limit = max_results if show_hidden else max_results + len(snapshot.hidden)
+        ranked = [
+            (path, snapshot.entries[path], score)
+            for score, path in rank_paths(query, set(candidates), limit)
+            if visible(path)
+        ]
+        return ranked[:max_results]
+
+    def _on_generation(self, generation: int, paths: Optional[List[str]]) -> None:
+        with self._lock:
+            if paths is None or any(os.path.basename(path) == '.gitignore' for path in paths):
+                self._pending_rebuild = True
+            else:
+                self._pending_paths.update(paths)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        with self._lock:
+            if self._worker is not None:
+                # The running worker picks the pending work up
+                return
+            if not self._pending_rebuild and not self._pending_paths:
+                return
+            self._worker = threading.Thread(target=self._run_worker, name='path-index', daemon=True)
+            self._worker.start()
+
+    def _run_worker(self) -> None:
+        while True:
+            with self._lock:
+                rebuild = self._pending_rebuild or self._snapshot is None
+                paths = self._pending_paths
+                self._pending_rebuild = False
+                self._pending_paths = set()
+                if not rebuild and not paths:
+                    self._worker = None
+                    return
+
+            try:
+                if rebuild:
+                    entries = self._scan()
+                else:
+                    entries = dict(self._snapshot.entries)
+                    self._apply_paths(entries, paths)
+                snapshot = _Snapshot(entries)
+            except Exception:
+                # Keep serving the previous snapshot; the next change retries
+                with self._lock:
+                    self._worker = None
+                return
+
+            self._snapshot = snapshot
+            self._ready.set()
+
+    def _is_excluded(self, rel_path: str, is_dir: bool) -> bool:
+        return self.git_ignore_matcher is not None and self.git_ignore_matcher.is_ignored(rel_path, is_dir)
+
+    def _should_enter(self, name: str) -> bool:
+        return not name.startswith('.') and name not in self.SKIPPED_DIRS
+
+    def _scan(self, rel_dir: str = '', depth: int = 0) -> Dict[str, bool]:
+        """Walk a directory (the whole project by default) into path -> is_dir entries"""
+        entries: Dict[str, bool] = {}
+        pending = [(os.path.join(self.project_root, rel_dir), rel_dir, depth)]
+
+        while pending:
+            dir_path, rel_dir, depth = pending.pop()
+            if depth > self.max_depth:
+                continue
+            try:
+                with os.scandir(dir_path) as scanner:
+                    listing = list(scanner)
+            except OSError:
+                continue
+
+            for entry in listing:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                if self._is_excluded(rel_path, is_dir):
+                    continue
+                entries[rel_path] = is_dir
+                if is_dir and self._should_enter(entry.name):
+                    pending.append((entry.path, rel_path, depth + 1))
+
+        return entries
+
+    def _apply_paths(self, entries: Dict[str, bool], paths: Iterable[str]) -> None:
+        """Update entries for changed absolute paths"""
+        for path in paths:
+            rel_path = os.path.relpath(os.path.abspath(path), self.project_root).replace(os.sep, '/')
+            if rel_path == '.' or rel_path.startswith('../'):
+                continue
+
+            parts = rel_path.split('/')
+            if len(parts) - 1 > self.max_depth:
+                continue
+            if not all(self._should_enter(part) for part in parts[:-1]):
+                continue
+
+            if not os.path.lexists(os.path.join(self.project_root, rel_path)):
+                entries.pop(rel_path, None)
+                descendant_prefix = rel_path + '/'
+                for stale in [key for key in entries if key.startswith(descendant_prefix)]:
+                    del entries[stale]
+                continue
+
+            # Add the path with any directories created along the way
+            for depth in range(len(parts)):
+                current = '/'.join(parts[:depth + 1])
+                if current in entries:
+                    continue
+                is_dir = os.path.isdir(os.path.join(self.project_root, current))
+                if self._is_excluded(current, is_dir):
+                    break
+                entries[current] = is_dir
+                if is_dir and current == rel_path and self._should_enter(parts[-1]):
+                    entries.update(self._scan(current, depth + 1))
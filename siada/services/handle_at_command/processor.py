@@ -2,8 +2,10 @@
 AtCommand Processor - Main processor that coordinates all components.
 """
 
+import os
 import time
 import re
+import asyncio
 from typing import List, Dict, Optional, Any, Tuple
 
 from .models import (
@@ -21,6 +23,7 @@ from .exceptions import AtCommandError
 # Import ReadManyFiles tool
 from siada.tools.read_many_files_tool import ReadManyFilesTool
 from siada.tools.read_many_files.models import ReadManyFilesParams
+from siada.tools.read_many_files.file_processor import FileProcessor
 
 
 class AtCommandProcessor:
@@ -65,31 +68,35 @@ class AtCommandProcessor:
             resolver_context = self._create_resolver_context(params.config)
             resolver = PathResolver(resolver_context)
             
-            # 4. Resolve paths
+            # 4. Resolve paths concurrently, prefetching files as they resolve
             paths_to_read = []
             at_path_to_resolved_map = {}
             content_labels = []
             
-            for at_path_part in at_path_parts:
-                try:
-                    resolution_result = await resolver.resolve_path(
-                        at_path_part.content, 
-                        params.on_debug_message
-                    )
-                    
-                    if resolution_result.resolved_path:
-                        paths_to_read.append(resolution_result.resolved_path)
-                        at_path_to_resolved_map[at_path_part.content] = resolution_result.resolved_path
-                        content_labels.append(at_path_part.content[1:])  # Remove @
-                        self.stats.resolved_paths += 1
-                    else:
-                        params.on_debug_message(f'Failed to resolve {at_path_part.content}: {resolution_result.reason}')
-                        self.stats.failed_paths += 1
-                        
-                except AtCommandError as e:
-                    params.on_debug_message(f'Error resolving {at_path_part.content}: {e}')
+            resolutions, prefetches = await self._resolve_paths(
+                at_path_parts,
+                resolver,
+                resolver_context.target_directory,
+                params.on_debug_message
+            )
+            
+            for at_path_part, resolution_result in zip(at_path_parts, resolutions):
+                if isinstance(resolution_result, AtCommandError):
+                    params.on_debug_message(f'Error resolving {at_path_part.content}: {resolution_result}')
                     self.stats.failed_paths += 1
                     continue
+                
+                if resolution_result.resolved_path:
+                    paths_to_read.append(resolution_result.resolved_path)
+                    at_path_to_resolved_map[at_path_part.content] = resolution_result.resolved_path
+                    content_labels.append(at_path_part.content[1:])  # Remove @
+                    self.stats.resolved_paths += 1
+                else:
+                    params.on_debug_message(f'Failed to resolve {at_path_part.content}: {resolution_result.reason}')
+                    self.stats.failed_paths += 1
+            
+            # Reads started during resolution land in the file content cache
+            await asyncio.gather(*prefetches, return_exceptions=True)
             
             # 5. Handle case with no valid paths
             if not paths_to_read:
@@ -103,7 +110,8 @@ class AtCommandProcessor:
                     paths_to_read, 
                     resolver_context.target_directory,
                     resolver_context.file_filtering_options,
-                    params.signal
+                    params.signal,
+                    getattr(params.config, 'llm_config', None)
                 )
                 
                 self.stats.files_read = len(file_contents) if file_contents else 0
@@ -161,8 +169,51 @@ class AtCommandProcessor:
             }
         )
     
+    async def _resolve_paths(self, at_path_parts: List[AtCommandPart], resolver: PathResolver,
+                             target_dir: str, on_debug_message: callable
+                             ) -> Tuple[List[Any], List[asyncio.Task]]:
+        """
+        Resolve all @ paths concurrently
+        
+        Resolutions share the resolver's workspace listing. Each file is
+        read into the file content cache as soon as its path resolves, while
+        the other paths are still resolving.
+        
+        Args:
+            at_path_parts: @ path parts, in query order
+            resolver: Path resolver
+            target_dir: Target directory
+            on_debug_message: Debug message callback
+            
+        Returns:
+            Tuple of resolution results (or AtCommandError) in query order,
+            and the prefetch tasks
+        """
+        processor = FileProcessor(target_dir)
+        prefetches: List[asyncio.Task] = []
+        prefetched = set()
+        
+        async def resolve(at_path_part: AtCommandPart):
+            try:
+                result = await resolver.resolve_path(at_path_part.content, on_debug_message)
+            except AtCommandError as e:
+                return e
+            
+            resolved_path = result.resolved_path
+            if resolved_path and result.resolution_type != 'directory' and resolved_path not in prefetched:
+                prefetched.add(resolved_path)
+                file_path = os.path.join(processor.target_dir, resolved_path)
+                prefetches.append(asyncio.create_task(
+                    processor.process_single_file(file_path, [resolved_path])
+                ))
+            return result
+        
+        resolutions = await asyncio.gather(*(resolve(part) for part in at_path_parts))
+        return list(resolutions), prefetches
+    
     async def _read_files(self, paths: List[str], target_dir: str, 
-                         filtering_options: Dict[str, bool], signal=None) -> List[Any]:
+                         filtering_options: Dict[str, bool], signal=None,
+                         model_config=None) -> List[Any]:
         """
         Read files using ReadManyFilesTool
         
@@ -171,11 +222,12 @@ class AtCommandProcessor:
             target_dir: Target directory
             filtering_options: File filtering options
             signal: Cancellation signal
+            model_config: Model the contents are sent to, bounding their size (optional)
             
         Returns:
             List of file contents
         """
-        tool = ReadManyFilesTool(target_dir)
+        tool = ReadManyFilesTool(target_dir, model_config)
         
         params = ReadManyFilesParams(
             paths=paths,
@@ -257,7 +309,7 @@ class AtCommandProcessor:
                     else:
                         processed_parts.append({'text': file_content_part})
                 else:
-                    # Non-string content (e.g., image Part objects)
+                    # Non-string content (lazy BinaryPart handles for images and PDFs)
                     processed_parts.append(file_content_part)
             
             processed_parts.append({'text': '\n--- End of content ---'})
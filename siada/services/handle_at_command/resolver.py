@@ -4,8 +4,10 @@ Path Resolver - Resolves @ command paths to actual file paths.
 
 import os
 import glob
+import asyncio
+import fnmatch
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from .models import ResolverContext, PathResolutionResult
 from .exceptions import (
@@ -22,6 +24,8 @@ class PathResolver:
     def __init__(self, context: ResolverContext):
         self.context = context
         self.target_dir = Path(context.target_directory).resolve()
+        # One listing per workspace, shared by every @ path this resolver handles
+        self._workspace_listings: Dict[Path, asyncio.Task] = {}
     
     async def resolve_path(self, at_path: str, on_debug_message: callable = None) -> PathResolutionResult:
         """
@@ -192,16 +196,13 @@ class PathResolver:
         on_debug_message(f'Path {path_name} not found directly, attempting glob search')
         
         try:
-            # Create glob pattern for fuzzy search
-            glob_pattern = f"**/*{path_name}*"
-            search_path = workspace_path / glob_pattern
-            
-            # Use glob to find matching files
-            matches = list(workspace_path.glob(glob_pattern))
+            # Match "**/*{path_name}*" against the shared workspace listing
+            listing = await self._get_workspace_listing(workspace_path)
+            matches = [path for path in listing if self._matches_glob_search(path, path_name)]
             
             if matches:
                 # Take the first match
-                first_match = matches[0].resolve()
+                first_match = (workspace_path / matches[0]).resolve()
                 
                 # Security check
                 if not self._is_path_within_workspace(first_match, workspace_path):
@@ -229,6 +230,58 @@ class PathResolver:
             reason='Glob search found no matches'
         )
     
+    async def _get_workspace_listing(self, workspace_path: Path) -> List[str]:
+        """
+        Get the relative paths of all files and directories in a workspace
+        
+        The workspace is walked once, in a worker thread; concurrent
+        resolutions await the same walk.
+        
+        Args:
+            workspace_path: Workspace directory path
+            
+        Returns:
+            List of '/'-separated paths relative to the workspace, in walk order
+        """
+        if workspace_path not in self._workspace_listings:
+            self._workspace_listings[workspace_path] = asyncio.ensure_future(
+                asyncio.to_thread(self._list_workspace, workspace_path)
+            )
+        return await asyncio.shield(self._workspace_listings[workspace_path])
+    
+    @staticmethod
+    def _list_workspace(workspace_path: Path) -> List[str]:
+        listing = []
+        for dir_path, dir_names, file_names in os.walk(workspace_path):
+            dir_names.sort()
+            rel_dir = os.path.relpath(dir_path, workspace_path).replace(os.sep, '/')
+            prefix = '' if rel_dir == '.' else rel_dir + '/'
+            # Entries of a directory before those of its subdirectories, like Path.glob
+            listing.extend(prefix + name for name in sorted(dir_names + file_names))
+        return listing
+    
+    @staticmethod
+    def _matches_glob_search(relative_path: str, path_name: str) -> bool:
+        """
+        Check a listed path against the glob pattern "**/*{path_name}*"
+        
+        Args:
+            relative_path: '/'-separated path relative to the workspace
+            path_name: Path name from the @ command
+            
+        Returns:
+            True if Path.glob would yield the path for the pattern
+        """
+        pattern_parts = path_name.replace('\\', '/').split('/')
+        pattern_parts[0] = '*' + pattern_parts[0]
+        pattern_parts[-1] = pattern_parts[-1] + '*'
+        path_parts = relative_path.split('/')
+        if len(path_parts) < len(pattern_parts):
+            return False
+        
+        tail = path_parts[len(path_parts) - len(pattern_parts):]
+        return all(fnmatch.fnmatchcase(part, pattern) for part, pattern in zip(tail, pattern_parts))
+    
     def _is_path_safe(self, path_name: str) -> bool:
         """
         Check if path is safe (no path traversal attempts)
@@ -10,6 +10,7 @@ from agents import RunResult, RunResultStreaming, Agent, set_trace_processors
 
 from siada.agent_hub.coder.tracing import create_detailed_logger
 from siada.agent_hub.siada_agent import SiadaAgent
+from siada.foundation.workspace_generation import bump_generation
 
 import logging
 
@@ -75,6 +76,9 @@ class SiadaRunner:
         set_trace_processors([create_detailed_logger(console_output=console_output),
                               context_tracing_processor])
 
+        # Files may have been changed outside the agent since the last turn
+        bump_generation()
+
         if stream:
             # Stream execution
             result = await agent.run_streamed(user_input, context)
@@ -127,7 +127,7 @@ class AutoCompleter(Completer):
                     self.completion_state['just_completed'] = False
                 
                 if self.file_recommendation_engine.should_show_suggestions(query_text):
-                    suggestions = self.file_recommendation_engine.get_suggestions_sync(query_text)
+                    suggestions = self.file_recommendation_engine.request_suggestions(query_text)
                     
                     # Calculate start_position to replace from @ symbol
                     start_position = at_pos - len(text_before_cursor)
@@ -151,7 +151,7 @@ class AutoCompleter(Completer):
                         yield completion
                 else:
                     if query_text == "@":
-                        suggestions = self.file_recommendation_engine.get_suggestions_sync("@")
+                        suggestions = self.file_recommendation_engine.request_suggestions("@")
                         for suggestion in suggestions:
                             # Auto-add space after completion to indicate completion end
                             completion_text = "@" + suggestion['value'] + " "
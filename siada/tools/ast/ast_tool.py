@@ -17,6 +17,7 @@ from pygments.token import Token
 from siada.tools.coder.observation.observation import FunctionCallResult
 
 from .models import Tag
+from .parse_cache import get_parse_tree_cache
 
 # tree_sitter is throwing a FutureWarning
 warnings.simplefilter("ignore", category=FutureWarning)
@@ -94,7 +95,25 @@ def get_scm_fname(lang: str) -> Optional[Path]:
     return None
 
 
-def get_tags_raw(fname: str, rel_fname: str) -> Generator[Tag, None, None]:
+def read_source(fname: str) -> Optional[str]:
+    """
+    Read a source file as UTF-8 text.
+
+    Args:
+        fname: Absolute path to the source file
+
+    Returns:
+        File content, or None if it cannot be read
+    """
+    try:
+        with open(fname, 'r', encoding='utf-8') as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading file {fname}: {e}")
+        return None
+
+
+def get_tags_raw(fname: str, rel_fname: str, code: Optional[str] = None) -> Generator[Tag, None, None]:
     """
     Extract code tags (definitions and references) from a source file.
     
@@ -105,6 +124,7 @@ def get_tags_raw(fname: str, rel_fname: str) -> Generator[Tag, None, None]:
     Args:
         fname: Absolute path to the source file
         rel_fname: Relative path to the source file
+        code: Content of the file, if the caller already read it (optional)
         
     Yields:
         Tag: Named tuple containing identifier information with fields:
@@ -119,8 +139,9 @@ def get_tags_raw(fname: str, rel_fname: str) -> Generator[Tag, None, None]:
         return
 
     try:
-        language = get_language(lang)
-        parser = get_parser(lang)
+        # Only checks that the grammar loads; the parse tree cache builds its own parser
+        get_language(lang)
+        get_parser(lang)
     except Exception as err:
         print(f"Skipping file {fname}: {err}")
         return
@@ -130,45 +151,23 @@ def get_tags_raw(fname: str, rel_fname: str) -> Generator[Tag, None, None]:
         return
     query_scm_content = query_scm.read_text()
 
-    try:
-        with open(fname, 'r', encoding='utf-8') as f:
-            code = f.read()
-    except (OSError, UnicodeDecodeError) as e:
-        print(f"Error reading file {fname}: {e}")
-        return
-        
+    if code is None:
+        code = read_source(fname)
     if not code:
         return
-    tree = parser.parse(bytes(code, "utf-8"))
-
-    # Run the tags queries
-    query = language.query(query_scm_content)
-    captures = query.captures(tree.root_node)
+    # Reuses the previous tree of the file and reparses only what changed
+    captures = get_parse_tree_cache().captures(fname, lang, query_scm_content, code)
 
     saw = set()
-    if USING_TSL_PACK:
-        all_nodes = []
-        for tag, nodes in captures.items():
-            all_nodes += [(node, tag) for node in nodes]
-    else:
-        all_nodes = list(captures)
-
-    for node, tag in all_nodes:
-        if tag.startswith("name.definition."):
-            kind = "def"
-        elif tag.startswith("name.reference."):
-            kind = "ref"
-        else:
-            continue
-
-        saw.add(kind)
+    for capture in captures:
+        saw.add(capture.kind)
 
         result = Tag(
             rel_fname=rel_fname,
             fname=fname,
-            name=node.text.decode("utf-8"),
-            kind=kind,
-            line=node.start_point[0],
+            name=capture.name,
+            kind=capture.kind,
+            line=capture.line,
         )
 
         yield result
@@ -200,7 +199,7 @@ def get_tags_raw(fname: str, rel_fname: str) -> Generator[Tag, None, None]:
         )
 
 
-def to_tree(tags: List[Tag]) -> str:
+def to_tree(tags: List[Tag], code: Optional[str] = None) -> str:
     """
     Convert a list of tags to a formatted code tree structure (single file scenario).
     
@@ -209,6 +208,7 @@ def to_tree(tags: List[Tag]) -> str:
     
     Args:
         tags: List of Tag objects from a single file
+        code: Content of the file, if the caller already read it (optional)
         
     Returns:
         Formatted string containing code structure with context
@@ -227,12 +227,13 @@ def to_tree(tags: List[Tag]) -> str:
     rel_fname = def_tags[0].rel_fname
     abs_fname = def_tags[0].fname
     
-    # Read file content
-    try:
-        with open(abs_fname, 'r', encoding='utf-8') as f:
-            code = f.read()
-    except (OSError, UnicodeDecodeError) as e:
-        return f"Error reading file {abs_fname}: {e}"
+    # Read file content unless the caller passed it in
+    if code is None:
+        try:
+            with open(abs_fname, 'r', encoding='utf-8') as f:
+                code = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            return f"Error reading file {abs_fname}: {e}"
     
     if not code:
         return ""
@@ -311,9 +312,24 @@ def _list_code_definition_names(fname: str, rel_fname: Optional[str] = None) ->
     if rel_fname is None:
         rel_fname = Path(fname).name
     
-    # Extract tags from the file
-    tags = list(get_tags_raw(fname, rel_fname))
-    
+    # Read the file once; tag extraction and the tree view share the content
+    code = read_source(fname) if filename_to_lang(fname) else None
+    tags = list(get_tags_raw(fname, rel_fname, code=code)) if code else []
+    return format_code_definitions(rel_fname, tags, code)
+
+
+def format_code_definitions(rel_fname: str, tags: List[Tag], code: Optional[str]) -> str:
+    """
+    Format the tags of one file into the list_code_definition_names output.
+
+    Args:
+        rel_fname: Relative path shown in the header
+        tags: Tags extracted from the file
+        code: Content of the file the tags were extracted from
+
+    Returns:
+        Header with definition and reference counts followed by the tree view
+    """
     if not tags:
         return f"No code definitions found in {rel_fname}"
     
@@ -326,7 +342,7 @@ def _list_code_definition_names(fname: str, rel_fname: Optional[str] = None) ->
     header += f"Definitions: {len(definitions)}, References: {len(references)}\n\n"
     
     # Generate code tree
-    tree_output = to_tree(tags)
+    tree_output = to_tree(tags, code)
     
     if tree_output.strip():
         return header + tree_output
@@ -0,0 +1,235 @@
+"""
+Batch outline: code definitions of every file under a directory or glob,
+reading and parsing each file once.
+"""
+
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from agents import function_tool
+from grep_ast import filename_to_lang
+
+from siada.foundation.config import settings
+from siada.foundation.tools.gitignore_matcher import GitIgnoreMatcher
+from siada.tools.coder.file_search.search import estimate_tokens
+from siada.tools.coder.observation.observation import FunctionCallResult
+from siada.tools.coder.repo_map.repo_map import SQLITE_ERRORS
+from siada.tools.coder.repo_map.repo_map import Tag as RepoMapTag
+
+from .ast_tool import format_code_definitions, get_scm_fname, get_tags_raw, read_source
+from .file_index import open_tags_cache
+from .models import Tag
+
+
+class ListCodeDefinitionNamesBatchResult(FunctionCallResult):
+    """Outlines of several files, joined within a token budget."""
+
+    def __init__(self, content: str, outlined_files: int, omitted_files: int = 0):
+        self.content = content
+        self.outlined_files = outlined_files
+        self.omitted_files = omitted_files
+
+    def format_for_display(self):
+        display = f"Outlined {self.outlined_files} file(s)"
+        if self.omitted_files:
+            display += f", omitted {self.omitted_files} to stay within the token budget"
+        return display + "."
+
+    def __str__(self):
+        return self.content
+
+
+class BatchOutliner:
+    """
+    Outline many source files in one pass.
+
+    Files are read once each on a small thread pool: the same content feeds
+    tag extraction and the tree view. Tags come from the RepoMap tags cache
+    under the root when the entry's mtime still matches the file, and freshly
+    parsed tags are written back so the repo map benefits too.
+    """
+
+    MAX_FILES = 200
+    MAX_WORKERS = 8
+    MAX_OMITTED_FILES_LISTED = 50
+
+    def __init__(self, root: str, token_budget: Optional[int] = None):
+        self.root = os.path.abspath(root)
+        self.token_budget = token_budget or settings.OUTLINE_TOKEN_BUDGET
+        # The cache only saves parsing; outlines work without it
+        self._tags_cache = open_tags_cache(self.root)
+
+    def close(self) -> None:
+        """Release the tags cache connection."""
+        if self._tags_cache is not None:
+            self._tags_cache.close()
+            self._tags_cache = None
+
+    def expand(self, path: str) -> List[str]:
+        """
+        Resolve a directory, glob or file path to the source files to outline.
+
+        A directory contributes the files at its top level; a glob is matched
+        recursively ('**' allowed). Files git ignores and files without a
+        tags query for their language are left out.
+
+        Args:
+            path: Directory, glob or file, absolute or relative to the root
+
+        Returns:
+            Sorted absolute paths of the files to outline
+        """
+        target = path if os.path.isabs(path) else os.path.join(self.root, path)
+        if os.path.isdir(target):
+            candidates = [entry.path for entry in os.scandir(target) if entry.is_file()]
+        elif glob.has_magic(target):
+            candidates = [match for match in glob.glob(target, recursive=True) if os.path.isfile(match)]
+        elif os.path.isfile(target):
+            candidates = [target]
+        else:
+            return []
+
+        matcher = GitIgnoreMatcher.for_root(self.root)
+        files = []
+        for candidate in sorted(os.path.abspath(candidate) for candidate in candidates):
+            lang = filename_to_lang(candidate)
+            if not lang or not get_scm_fname(lang):
+                continue
+            if matcher.is_ignored(candidate, is_dir=False):
+                continue
+            files.append(candidate)
+        return files
+
+    def _cached_tags(self, fname: str, mtime: float) -> Optional[List[Tag]]:
+        if self._tags_cache is None:
+            return None
+        try:
+            entry = self._tags_cache.get(fname)
+        except SQLITE_ERRORS:
+            return None
+        if entry is None or entry.get("mtime") != mtime:
+            return None
+        return entry["data"]
+
+    def _store_tags(self, fname: str, mtime: float, tags: List[Tag]) -> None:
+        if self._tags_cache is None:
+            return
+        try:
+            self._tags_cache[fname] = {"mtime": mtime, "data": [RepoMapTag(*tag) for tag in tags]}
+        except SQLITE_ERRORS:
+            pass
+
+    def outline_file(self, fname: str) -> Tuple[str, Optional[str]]:
+        """
+        Outline one file, reading it exactly once.
+
+        Returns:
+            (relative path, outline), the outline being None when the file
+            has no definitions or cannot be read
+        """
+        rel_fname = os.path.relpath(fname, self.root).replace(os.sep, "/")
+        try:
+            # Taken before the read so a concurrent edit leaves a stale mtime behind
+            mtime = os.path.getmtime(fname)
+        except OSError:
+            return rel_fname, None
+        code = read_source(fname)
+        if not code:
+            return rel_fname, None
+
+        tags = self._cached_tags(fname, mtime)
+        if tags is None:
+            tags = list(get_tags_raw(fname, rel_fname, code=code))
+            self._store_tags(fname, mtime, tags)
+        if not any(tag.kind == "def" for tag in tags):
+            return rel_fname, None
+        return rel_fname, format_code_definitions(rel_fname, tags, code)
+
+    def outline(self, path: str) -> ListCodeDefinitionNamesBatchResult:
+        """
+        Outline every file selected by path and join the outlines within the token budget.
+
+        Args:
+            path: Directory, glob or file, absolute or relative to the root
+
+        Returns:
+            ListCodeDefinitionNamesBatchResult with one section per outlined file
+        """
+        files = self.expand(path)
+        if not files:
+            return ListCodeDefinitionNamesBatchResult(
+                f"No source files with code definitions support matched {path}", 0
+            )
+        skipped_over_limit = len(files) - self.MAX_FILES
+        files = files[:self.MAX_FILES]
+
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(files))) as executor:
+            outlines: Dict[str, Optional[str]] = dict(executor.map(self.outline_file, files))
+
+        sections = []
+        omitted = []
+        used_tokens = 0
+        without_definitions = 0
+        for rel_fname, outline in outlines.items():
+            if outline is None:
+                without_definitions += 1
+                continue
+            section = outline.rstrip("\n") + "\n"
+            tokens = estimate_tokens(section)
+            if omitted or used_tokens + tokens > self.token_budget:
+                omitted.append(rel_fname)
+                continue
+            sections.append(section)
+            used_tokens += tokens
+
+        notes = []
+        if without_definitions:
+            notes.append(f"[{without_definitions} file(s) without code definitions not shown]")
+        if skipped_over_limit > 0:
+            notes.append(f"[Only the first {self.MAX_FILES} files were outlined; "
+                         f"{skipped_over_limit} more matched, narrow the glob to see them]")
+        if omitted:
+            notes.append(self._omitted_notice(omitted))
+
+        content = "\n".join(sections)
+        if notes:
+            content = (content + "\n" if content else "") + "\n".join(notes)
+        return ListCodeDefinitionNamesBatchResult(content, len(sections), len(omitted))
+
+    def _omitted_notice(self, omitted_files: List[str]) -> str:
+        listed = omitted_files[:self.MAX_OMITTED_FILES_LISTED]
+        lines = [f"[Omitted {len(omitted_files)} file(s) to stay within the token budget:]"]
+        lines.extend(f"- {path}" for path in listed)
+        if len(omitted_files) > len(listed):
+            lines.append(f"- ...and {len(omitted_files) - len(listed)} more.")
+        return "\n".join(lines)
+
+
+@function_tool(name_override="list_code_definition_names_batch")
+def list_code_definition_names_batch(cwd: str, path: str, max_tokens: Optional[int] = None) -> FunctionCallResult:
+    """
+    Outline the code definitions of many source files in one call.
+
+    Prefer this over repeated list_code_definition_names calls when getting to
+    know a package: every file matched by `path` is parsed once, in parallel,
+    and the outlines come back together in a single token-budgeted response.
+
+    Args:
+        cwd (str): Current working directory; relative paths and globs are
+                  resolved against it and outlines show paths relative to it.
+        path (str): A directory (its top-level files are outlined), a glob such
+                  as "src/pkg/**/*.py", or a single file.
+        max_tokens (int, optional): Token budget of the response. Files past the
+                  budget are listed by name only.
+
+    Returns:
+        str: One outline per file, in path order, each formatted like the output
+             of list_code_definition_names, followed by notes on skipped files.
+    """
+    outliner = BatchOutliner(cwd, token_budget=max_tokens)
+    try:
+        return outliner.outline(path)
+    finally:
+        outliner.close()
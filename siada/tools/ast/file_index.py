@@ -0,0 +1,176 @@
+"""
+Base of per-root indexes that are derived file by file and kept current by
+workspace generation bumps.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import ClassVar, Dict, Hashable, List, Optional, Set
+
+from diskcache import Cache
+from grep_ast import filename_to_lang
+
+from siada.foundation.config import settings
+from siada.foundation.tools.gitignore_matcher import GitIgnoreMatcher
+from siada.foundation.workspace_generation import add_generation_listener
+from siada.tools.coder.repo_map.repo_map import SQLITE_ERRORS, RepoMap
+
+
+def open_tags_cache(root: str) -> Optional[Cache]:
+    """Open RepoMap's on-disk tags cache of a project root; None if SQLite fails."""
+    try:
+        return Cache(Path(root) / RepoMap.TAGS_CACHE_DIR)
+    except SQLITE_ERRORS:
+        return None
+
+
+class IncrementalFileIndex:
+    """
+    Index over the source files of a project root, updated file by file.
+
+    Subclasses derive data from one file in _index_file() and drop it in
+    _unindex_file(). Paths reported by workspace generation bumps are
+    reindexed on the next access; an unknown change re-lists the files and
+    reindexes those whose mtime moved. Call _ensure_current() under _lock
+    before reading the index.
+
+    Subclasses share a RepoMap of the root for tags (_get_repo_map()) and
+    RepoMap's on-disk tags cache for derived data (_cache_get/_cache_put).
+    """
+
+    _instances: ClassVar[Dict[str, "IncrementalFileIndex"]]
+    _instances_lock: ClassVar[threading.Lock]
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        # rel_fname -> mtime it was indexed at
+        self._mtimes: Dict[str, float] = {}
+        self._rescan = True
+        self._dirty: Set[str] = set()
+        self._lock = threading.RLock()
+        self._repo_map = None
+        self._disk_cache: Optional[Cache] = None
+        self._disk_cache_opened = False
+        add_generation_listener(self._on_generation)
+
+    @classmethod
+    def for_root(cls, root: str):
+        """Return the shared index of a project root."""
+        root = os.path.abspath(root)
+        with cls._instances_lock:
+            if root not in cls._instances:
+                cls._instances[root] = cls(root)
+            return cls._instances[root]
+
+    def _get_repo_map(self):
+        if self._repo_map is None:
+            from siada.tools.coder.repo_map.io import SilentIO
+            from siada.tools.coder.repo_map.token_counter import TokenCounterModel
+
+            self._repo_map = RepoMap(
+                root=self.root,
+                main_model=TokenCounterModel(settings.DEFAULT_MODEL),
+                io=SilentIO(),
+                verbose=False,
+            )
+        return self._repo_map
+
+    def _get_disk_cache(self) -> Optional[Cache]:
+        if not self._disk_cache_opened:
+            self._disk_cache_opened = True
+            self._disk_cache = open_tags_cache(self.root)
+        return self._disk_cache
+
+    def _cache_get(self, key: Hashable) -> Optional[object]:
+        """Read derived data from the on-disk cache; None on a miss or an SQLite error"""
+        cache = self._get_disk_cache()
+        if cache is None:
+            return None
+        try:
+            return cache.get(key)
+        except SQLITE_ERRORS:
+            return None
+
+    def _cache_put(self, key: Hashable, value: object) -> None:
+        cache = self._get_disk_cache()
+        if cache is None:
+            return
+        try:
+            cache[key] = value
+        except SQLITE_ERRORS:
+            # The cache only saves work; the index is complete without it
+            pass
+
+    def _accepts(self, rel_fname: str) -> bool:
+        """Whether a file belongs in the index; by default any file with a tree-sitter language"""
+        return bool(filename_to_lang(rel_fname))
+
+    def _index_file(self, rel_fname: str) -> None:
+        raise NotImplementedError
+
+    def _unindex_file(self, rel_fname: str) -> None:
+        raise NotImplementedError
+
+    def _on_updated(self, full: bool) -> None:
+        """Called after files were reindexed; full is True after a re-listing"""
+
+    def _list_files(self) -> List[str]:
+        from siada.tools.coder.file_search.search import RipgrepSearcher
+
+        files = RipgrepSearcher.get_instance().list_files(self.root)
+        rel_fnames = (
+            os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, "/") for path in files
+        )
+        return [rel_fname for rel_fname in rel_fnames if self._accepts(rel_fname)]
+
+    def _on_generation(self, generation: int, paths: Optional[List[str]]) -> None:
+        with self._lock:
+            if paths is None:
+                self._rescan = True
+                return
+            for path in paths:
+                rel_fname = os.path.relpath(os.path.abspath(path), self.root)
+                if not rel_fname.startswith(".."):
+                    self._dirty.add(rel_fname.replace(os.sep, "/"))
+
+    def _drop_file(self, rel_fname: str) -> None:
+        if self._mtimes.pop(rel_fname, None) is not None:
+            self._unindex_file(rel_fname)
+
+    def _refresh_file(self, rel_fname: str) -> bool:
+        try:
+            mtime = os.path.getmtime(os.path.join(self.root, rel_fname))
+        except OSError:
+            self._drop_file(rel_fname)
+            return True
+        if self._mtimes.get(rel_fname) == mtime:
+            return False
+        self._drop_file(rel_fname)
+        self._index_file(rel_fname)
+        self._mtimes[rel_fname] = mtime
+        return True
+
+    def _ensure_current(self) -> None:
+        if self._rescan:
+            self._rescan = False
+            self._dirty.clear()
+            listed = set(self._list_files())
+            for rel_fname in set(self._mtimes) - listed:
+                self._drop_file(rel_fname)
+            for rel_fname in sorted(listed):
+                self._refresh_file(rel_fname)
+            self._on_updated(full=True)
+            return
+
+        if self._dirty:
+            matcher = GitIgnoreMatcher.for_root(self.root)
+            dirty, self._dirty = self._dirty, set()
+            changed = False
+            for rel_fname in dirty:
+                if rel_fname in self._mtimes or (
+                    self._accepts(rel_fname) and not matcher.is_ignored(rel_fname, is_dir=False)
+                ):
+                    changed = self._refresh_file(rel_fname) or changed
+            if changed:
+                self._on_updated(full=False)
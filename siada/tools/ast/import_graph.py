@@ -0,0 +1,416 @@
+"""
+Python import graph: which workspace modules import which others.
+"""
+
+import hashlib
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import ClassVar, Dict, List, Literal, NamedTuple, Optional, Set, Tuple, get_args
+
+from agents import function_tool
+from grep_ast.tsl import get_parser
+
+from siada.tools.coder.observation.error import ErrorObservation
+from siada.tools.coder.observation.observation import FunctionCallResult
+
+from .file_index import IncrementalFileIndex
+
+ImportDirection = Literal["dependencies", "dependents", "both"]
+
+# Bump when ImportRef or the extraction changes, so old cache entries are ignored
+IMPORTS_CACHE_VERSION = 1
+
+
+class ImportRef(NamedTuple):
+    """One imported module as written in the source."""
+    # Dotted module, without the leading dots of a relative import
+    module: str
+    # Names of a from-import ('*' for a wildcard); None for a plain import
+    names: Optional[Tuple[str, ...]]
+    # Number of leading dots; 0 for an absolute import
+    level: int
+
+
+def _import_name(node) -> str:
+    if node.type == "aliased_import":
+        node = node.child_by_field_name("name")
+    return node.text.decode("utf-8")
+
+
+def extract_imports(source: bytes) -> Tuple[ImportRef, ...]:
+    """
+    Extract the imports of a Python module with tree-sitter.
+
+    Imports anywhere in the file count, including those inside functions and
+    try blocks.
+
+    Args:
+        source: Content of the module
+
+    Returns:
+        Imports in source order
+    """
+    tree = get_parser("python").parse(source)
+    imports = []
+    stack = [tree.root_node]
+    while stack:
+        node = stack.pop()
+        if node.type == "import_statement":
+            for name in node.children_by_field_name("name"):
+                imports.append(ImportRef(_import_name(name), None, 0))
+        elif node.type == "import_from_statement":
+            # "from . pkg import x" is valid; drop the whitespace
+            module = "".join(node.child_by_field_name("module_name").text.decode("utf-8").split())
+            stripped = module.lstrip(".")
+            names = tuple(_import_name(name) for name in node.children_by_field_name("name"))
+            if any(child.type == "wildcard_import" for child in node.children):
+                names = ("*",)
+            imports.append(ImportRef(stripped, names, len(module) - len(stripped)))
+        else:
+            stack.extend(reversed(node.children))
+    return tuple(imports)
+
+
+class ImportGraph(IncrementalFileIndex):
+    """
+    Import graph over the Python files of a project root.
+
+    Imports are extracted per file with tree-sitter and cached by content
+    hash, in memory and in RepoMap's on-disk tags cache, so a file is only
+    parsed once per distinct content. Like the other file indexes, the graph
+    follows workspace generation bumps and reindexes changed files only.
+
+    Imports are resolved against the workspace layout: a module is known by
+    its path from the root (siada/tools/x.py -> siada.tools.x) and, inside a
+    regular package, by its path from the package's parent directory (src
+    layouts). Relative imports are resolved by path. Imports that resolve to
+    no workspace file are kept as external top-level module names.
+    """
+
+    _instances: ClassVar[Dict[str, "ImportGraph"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, root: str):
+        super().__init__(root)
+        self._imports: Dict[str, Tuple[ImportRef, ...]] = {}
+        self._imports_by_hash: Dict[str, Tuple[ImportRef, ...]] = {}
+        self._modules: Dict[str, str] = {}
+        self._dependencies: Dict[str, Set[str]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._external: Dict[str, Set[str]] = {}
+        self._resolved = False
+
+    def _accepts(self, rel_fname: str) -> bool:
+        return rel_fname.endswith(".py")
+
+    def _imports_for(self, source: bytes) -> Tuple[ImportRef, ...]:
+        digest = hashlib.sha256(source).hexdigest()
+        imports = self._imports_by_hash.get(digest)
+        if imports is not None:
+            return imports
+
+        key = ("imports", IMPORTS_CACHE_VERSION, digest)
+        imports = self._cache_get(key)
+        if imports is None:
+            imports = extract_imports(source)
+            self._cache_put(key, imports)
+        self._imports_by_hash[digest] = imports
+        return imports
+
+    def _index_file(self, rel_fname: str) -> None:
+        try:
+            source = Path(self.root, rel_fname).read_bytes()
+        except OSError:
+            return
+        self._imports[rel_fname] = self._imports_for(source)
+
+    def _unindex_file(self, rel_fname: str) -> None:
+        self._imports.pop(rel_fname, None)
+
+    def _on_updated(self, full: bool) -> None:
+        self._resolved = False
+
+    def _build_module_map(self) -> Dict[str, str]:
+        files = set(self._imports)
+        modules: Dict[str, str] = {}
+        package_names: Dict[str, str] = {}
+        for rel_fname in sorted(files):
+            directory_parts = rel_fname.split("/")[:-1]
+            module_parts = rel_fname[:-3].split("/")
+            if module_parts[-1] == "__init__":
+                module_parts = module_parts[:-1]
+            if module_parts:
+                modules.setdefault(".".join(module_parts), rel_fname)
+
+            # Inside a regular package the module is also importable from the
+            # directory above the outermost package (src layouts)
+            top = len(directory_parts)
+            while top > 0 and "/".join(directory_parts[:top] + ["__init__.py"]) in files:
+                top -= 1
+            if 0 < top < len(directory_parts):
+                package_names.setdefault(".".join(module_parts[top:]), rel_fname)
+        for name, rel_fname in package_names.items():
+            modules.setdefault(name, rel_fname)
+        return modules
+
+    def _module_at(self, path: str) -> Optional[str]:
+        for candidate in (f"{path}.py", f"{path}/__init__.py"):
+            if candidate in self._imports:
+                return candidate
+        return None
+
+    def _find_module(self, rel_fname: str, module: str) -> Optional[str]:
+        # A script outside any package imports its siblings by bare name
+        directory = rel_fname.rsplit("/", 1)[0] if "/" in rel_fname else ""
+        if directory and f"{directory}/__init__.py" not in self._imports:
+            sibling = self._module_at(f"{directory}/{module.replace('.', '/')}")
+            if sibling is not None:
+                return sibling
+        return self._modules.get(module)
+
+    def _deepest_module(self, rel_fname: str, module: str) -> Optional[str]:
+        # Importing a.b.c depends on the deepest workspace module of the chain
+        parts = module.split(".")
+        for end in range(len(parts), 0, -1):
+            target = self._find_module(rel_fname, ".".join(parts[:end]))
+            if target is not None:
+                return target
+        return None
+
+    def _resolve_import(self, rel_fname: str, ref: ImportRef) -> Tuple[Set[str], Set[str]]:
+        """Resolve one import to (workspace files, external top-level modules)"""
+        if ref.level:
+            base = rel_fname.split("/")[:-1]
+            if ref.level - 1 > len(base):
+                return set(), set()
+            base = base[:len(base) - (ref.level - 1)]
+            package = "/".join(base + (ref.module.split(".") if ref.module else []))
+
+            def find_submodule(name: str) -> Optional[str]:
+                return self._module_at(f"{package}/{name}" if package else name)
+
+            def find_package() -> Optional[str]:
+                return self._module_at(package) if package else None
+        else:
+            def find_submodule(name: str) -> Optional[str]:
+                return self._find_module(rel_fname, f"{ref.module}.{name}")
+
+            def find_package() -> Optional[str]:
+                return self._deepest_module(rel_fname, ref.module)
+
+        targets: Set[str] = set()
+        # Names of a from-import may be submodules; other names come from the package
+        needs_package = ref.names is None
+        for name in ref.names or ():
+            target = find_submodule(name) if name != "*" else None
+            if target is None:
+                needs_package = True
+            else:
+                targets.add(target)
+        if needs_package:
+            target = find_package()
+            if target is not None:
+                targets.add(target)
+
+        if not targets and not ref.level:
+            return targets, {ref.module.split(".")[0]}
+        return targets, set()
+
+    def _resolve(self) -> None:
+        self._modules = self._build_module_map()
+        dependencies: Dict[str, Set[str]] = {}
+        dependents: Dict[str, Set[str]] = {}
+        external: Dict[str, Set[str]] = {}
+        for rel_fname, imports in self._imports.items():
+            file_dependencies: Set[str] = set()
+            file_external: Set[str] = set()
+            for ref in imports:
+                targets, modules = self._resolve_import(rel_fname, ref)
+                file_dependencies |= targets
+                file_external |= modules
+            file_dependencies.discard(rel_fname)
+            dependencies[rel_fname] = file_dependencies
+            external[rel_fname] = file_external
+            for target in file_dependencies:
+                dependents.setdefault(target, set()).add(rel_fname)
+        self._dependencies, self._dependents, self._external = dependencies, dependents, external
+        self._resolved = True
+
+    def _ensure_resolved(self) -> None:
+        self._ensure_current()
+        if not self._resolved:
+            self._resolve()
+
+    def resolve(self, module: str) -> Optional[str]:
+        """
+        Find the workspace file of a module.
+
+        Args:
+            module: Dotted module name, or a file path (absolute or relative to the root)
+
+        Returns:
+            Path of the module relative to the root, or None if it is not a workspace module
+        """
+        with self._lock:
+            self._ensure_resolved()
+            path = module if os.path.isabs(module) else os.path.join(self.root, module)
+            rel_fname = os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, "/")
+            if rel_fname in self._imports:
+                return rel_fname
+            if os.path.isdir(path):
+                return self._module_at(rel_fname)
+            return self._modules.get(module)
+
+    def files(self) -> List[str]:
+        """Get the paths of all Python files in the graph, relative to the root."""
+        with self._lock:
+            self._ensure_current()
+            return sorted(self._imports)
+
+    def _walk(self, edges: Dict[str, Set[str]], start: str, transitive: bool) -> List[str]:
+        if not transitive:
+            return sorted(edges.get(start, ()))
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            for neighbour in edges.get(queue.popleft(), ()):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+        seen.discard(start)
+        return sorted(seen)
+
+    def dependencies(self, module: str, transitive: bool = False) -> List[str]:
+        """
+        Get the workspace modules a module imports.
+
+        Args:
+            module: Dotted module name or file path
+            transitive: Follow imports of imports as well
+
+        Returns:
+            Sorted paths relative to the root; empty if the module is unknown
+        """
+        with self._lock:
+            rel_fname = self.resolve(module)
+            if rel_fname is None:
+                return []
+            return self._walk(self._dependencies, rel_fname, transitive)
+
+    def dependents(self, module: str, transitive: bool = False) -> List[str]:
+        """
+        Get the workspace modules that import a module.
+
+        Args:
+            module: Dotted module name or file path
+            transitive: Include modules importing it indirectly
+
+        Returns:
+            Sorted paths relative to the root; empty if the module is unknown
+        """
+        with self._lock:
+            rel_fname = self.resolve(module)
+            if rel_fname is None:
+                return []
+            return self._walk(self._dependents, rel_fname, transitive)
+
+    def external_imports(self, module: str) -> List[str]:
+        """Get the top-level names of the non-workspace modules a module imports."""
+        with self._lock:
+            rel_fname = self.resolve(module)
+            if rel_fname is None:
+                return []
+            return sorted(self._external.get(rel_fname, ()))
+
+
+class ImportGraphResult(FunctionCallResult):
+    """Dependencies and dependents of one module."""
+
+    MAX_LISTED = 200
+
+    def __init__(self, module: str, rel_fname: Optional[str], dependencies: Optional[List[str]] = None,
+                 dependents: Optional[List[str]] = None, external: Optional[List[str]] = None,
+                 transitive: bool = False):
+        self.module = module
+        self.rel_fname = rel_fname
+        self.dependencies = dependencies
+        self.dependents = dependents
+        self.external = external
+        self.transitive = transitive
+
+    def _section(self, title: str, paths: List[str]) -> List[str]:
+        lines = [f"{title} ({len(paths)}):"]
+        lines.extend(f"  {path}" for path in paths[:self.MAX_LISTED])
+        if len(paths) > self.MAX_LISTED:
+            lines.append(f"  ...and {len(paths) - self.MAX_LISTED} more.")
+        return lines
+
+    @property
+    def content(self) -> str:
+        if self.rel_fname is None:
+            return f"`{self.module}` is not a Python module of the workspace"
+        qualifier = " (transitively)" if self.transitive else ""
+        lines = [f"Module: {self.rel_fname}"]
+        if self.dependencies is not None:
+            lines += self._section(f"Imports{qualifier}", self.dependencies)
+        if self.external:
+            lines.append(f"External imports: {', '.join(self.external)}")
+        if self.dependents is not None:
+            lines += self._section(f"Imported by{qualifier}", self.dependents)
+        return "\n".join(lines)
+
+    def format_for_display(self):
+        if self.rel_fname is None:
+            return f"{self.module} is not a workspace module."
+        counts = []
+        if self.dependencies is not None:
+            counts.append(f"{len(self.dependencies)} imports")
+        if self.dependents is not None:
+            counts.append(f"{len(self.dependents)} dependents")
+        return f"{self.rel_fname}: {', '.join(counts)}."
+
+    def __str__(self):
+        return self.content
+
+
+@function_tool(name_override="import_graph")
+def import_graph(
+    cwd: str, module: str, direction: ImportDirection = "both", transitive: bool = False
+) -> FunctionCallResult:
+    """
+    Show which workspace Python modules a module imports and which import it.
+
+    Useful to estimate the blast radius of a change before editing, or to find
+    the code a module relies on. Imports are read with tree-sitter and resolved
+    against the workspace package layout, including relative imports.
+
+    Args:
+        cwd (str): Current working directory; the project root the graph is built for.
+        module (str): Dotted module name (e.g. "siada.tools.ast.ast_tool") or
+                  file path, absolute or relative to cwd.
+        direction (str): "dependencies" (what it imports), "dependents" (what
+                  imports it) or "both".
+        transitive (bool): Follow the graph beyond direct imports.
+
+    Returns:
+        str: Paths relative to cwd of the dependencies and/or dependents, plus
+             the external (non-workspace) modules it imports.
+    """
+    if direction not in get_args(ImportDirection):
+        return ErrorObservation(
+            content=f"Invalid direction {direction!r}; use \"dependencies\", \"dependents\" or \"both\"."
+        )
+    graph = ImportGraph.for_root(cwd)
+    rel_fname = graph.resolve(module)
+    if rel_fname is None:
+        return ImportGraphResult(module, None)
+    return ImportGraphResult(
+        module,
+        rel_fname,
+        dependencies=graph.dependencies(rel_fname, transitive) if direction in ("dependencies", "both") else None,
+        dependents=graph.dependents(rel_fname, transitive) if direction in ("dependents", "both") else None,
+        external=graph.external_imports(rel_fname) if direction in ("dependencies", "both") else None,
+        transitive=transitive,
+    )
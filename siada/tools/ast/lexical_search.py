@@ -0,0 +1,336 @@
+"""
+Lexical code search: a BM25 index over code chunks.
+
+Files are cut into chunks at the definitions RepoMap finds, so a hit points
+at a function or class rather than a whole file. Chunk text is tokenized
+into identifier parts (RepoMap -> repo, map, repomap), so a query in plain
+words finds code written in camelCase or snake_case. No network or
+embedding model is involved.
+"""
+
+import hashlib
+import heapq
+import math
+import os
+import re
+import threading
+from collections import Counter
+from fnmatch import fnmatch
+from typing import ClassVar, Dict, List, NamedTuple, Tuple
+
+from agents import function_tool
+
+from siada.tools.coder.observation.observation import FunctionCallResult
+
+from .ast_tool import read_source
+from .file_index import IncrementalFileIndex
+
+# Bump when chunking or tokenization changes, so old cache entries are ignored
+LEXICAL_CACHE_VERSION = 1
+
+_WORD_RE = re.compile(r"[A-Za-z0-9_]+")
+_SUBWORD_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be but by do does for from has have how if in into is it its
+    no not of on or so that the their then there these this to was were what when
+    where which while who why will with you your
+    def class self cls return import none true false elif else try except finally
+    raise pass lambda yield async await global nonlocal del assert
+    """.split()
+)
+
+
+def _stem(token: str) -> str:
+    # Just enough stemming to match plurals and verb forms of identifier parts:
+    # parse, parses, parsed and parsing all become "pars"
+    for suffix in ("ing", "ed", "es", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3 and not token.endswith("ss"):
+            token = token[:-len(suffix)]
+            break
+    if token.endswith("e") and len(token) > 3:
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lower-cased search terms.
+
+    Identifiers are split into their camelCase and snake_case parts; the
+    whole identifier is kept as a term too, so an exact name ranks higher.
+    Short terms, numbers and stopwords are dropped.
+
+    Args:
+        text: Source code, comments or a query
+
+    Returns:
+        Terms in text order, with repetitions
+    """
+    terms = []
+    for word in _WORD_RE.findall(text):
+        parts = _SUBWORD_RE.findall(word)
+        if len(parts) > 1:
+            compound = word.replace("_", "").lower()
+            if compound not in _STOPWORDS:
+                terms.append(compound)
+        for part in parts:
+            part = part.lower()
+            if len(part) < 2 or part.isdigit() or part in _STOPWORDS:
+                continue
+            terms.append(_stem(part))
+    return terms
+
+
+class Chunk(NamedTuple):
+    """A searchable range of a file."""
+    # 0-based, end exclusive
+    start: int
+    end: int
+    # Name of the definition the chunk starts with; "" for other chunks
+    name: str
+
+
+class LexicalHit(NamedTuple):
+    """A chunk matching a query."""
+    rel_fname: str
+    chunk: Chunk
+    score: float
+
+
+def split_chunks(line_count: int, definitions: List[Tuple[int, str]],
+                 max_lines: int = 200, window: int = 50) -> List[Chunk]:
+    """
+    Cut a file into chunks, one per definition.
+
+    A chunk runs from a definition to the next one, so a class body before its
+    first method is a chunk of its own. Lines before the first definition form
+    a chunk too. Chunks longer than max_lines are split; a file without
+    definitions is cut into windows of window lines.
+
+    Args:
+        line_count: Number of lines in the file
+        definitions: (0-based line, name) of each definition
+        max_lines: Longest chunk
+        window: Chunk length for files without definitions
+
+    Returns:
+        Chunks covering the file, in order
+    """
+    starts: Dict[int, str] = {}
+    for line, name in sorted(definitions):
+        if 0 <= line < line_count:
+            starts.setdefault(line, name)
+    if not starts:
+        return [Chunk(start, min(start + window, line_count), "") for start in range(0, line_count, window)]
+
+    bounds = sorted(starts)
+    if bounds[0] > 0:
+        bounds.insert(0, 0)
+    chunks = []
+    for index, start in enumerate(bounds):
+        end = bounds[index + 1] if index + 1 < len(bounds) else line_count
+        name = starts.get(start, "")
+        for piece_start in range(start, end, max_lines):
+            chunks.append(Chunk(piece_start, min(piece_start + max_lines, end), name))
+    return chunks
+
+
+class LexicalIndex(IncrementalFileIndex):
+    """
+    BM25 index over the definition chunks of a project root.
+
+    Chunks and their term counts are cached by content hash in RepoMap's
+    on-disk tags cache, so a new session only tokenizes files that changed.
+    The in-memory postings are updated file by file as the workspace changes.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    MAX_CHUNK_LINES = 200
+    WINDOW_LINES = 50
+
+    _instances: ClassVar[Dict[str, "LexicalIndex"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, root: str):
+        super().__init__(root)
+        # term -> (rel_fname, chunk index) -> term frequency
+        self._postings: Dict[str, Dict[Tuple[str, int], int]] = {}
+        # rel_fname -> chunks and the length of each in terms
+        self._file_chunks: Dict[str, List[Chunk]] = {}
+        self._file_lengths: Dict[str, List[int]] = {}
+        self._file_terms: Dict[str, List[str]] = {}
+        self._chunk_count = 0
+        self._total_length = 0
+
+    def _analyze(self, rel_fname: str, code: str) -> List[Tuple[Chunk, Dict[str, int]]]:
+        """Chunk a file and count the terms of each chunk"""
+        fname = os.path.join(self.root, rel_fname)
+        tags = self._get_repo_map().get_tags(fname, rel_fname) or []
+        definitions = [(tag.line, tag.name) for tag in tags if tag.kind == "def"]
+        lines = code.splitlines()
+        chunks = split_chunks(len(lines), definitions, self.MAX_CHUNK_LINES, self.WINDOW_LINES)
+        return [(chunk, dict(Counter(tokenize("\n".join(lines[chunk.start:chunk.end]))))) for chunk in chunks]
+
+    def _analyze_cached(self, rel_fname: str, code: str) -> List[Tuple[Chunk, Dict[str, int]]]:
+        digest = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        # The extension picks the tags query, so it is part of the key
+        key = ("lexical", LEXICAL_CACHE_VERSION, os.path.splitext(rel_fname)[1], digest)
+        analyzed = self._cache_get(key)
+        if analyzed is not None:
+            return [(Chunk(*chunk), counts) for chunk, counts in analyzed]
+        analyzed = self._analyze(rel_fname, code)
+        self._cache_put(key, [(tuple(chunk), counts) for chunk, counts in analyzed])
+        return analyzed
+
+    def _index_file(self, rel_fname: str) -> None:
+        code = read_source(os.path.join(self.root, rel_fname))
+        if code is None:
+            return
+        # Path parts match too: "repo map" finds repo_map.py
+        path_terms = Counter(tokenize(rel_fname))
+        chunks = []
+        lengths = []
+        terms = set()
+        for chunk_index, (chunk, counts) in enumerate(self._analyze_cached(rel_fname, code)):
+            counts = Counter(counts)
+            counts.update(path_terms)
+            for term, count in counts.items():
+                self._postings.setdefault(term, {})[(rel_fname, chunk_index)] = count
+            terms.update(counts)
+            chunks.append(chunk)
+            length = sum(counts.values())
+            lengths.append(length)
+            self._total_length += length
+        self._file_chunks[rel_fname] = chunks
+        self._file_lengths[rel_fname] = lengths
+        self._file_terms[rel_fname] = list(terms)
+        self._chunk_count += len(chunks)
+
+    def _unindex_file(self, rel_fname: str) -> None:
+        chunks = self._file_chunks.pop(rel_fname, [])
+        lengths = self._file_lengths.pop(rel_fname, [])
+        for term in self._file_terms.pop(rel_fname, []):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            for chunk_index in range(len(chunks)):
+                postings.pop((rel_fname, chunk_index), None)
+            if not postings:
+                del self._postings[term]
+        self._chunk_count -= len(chunks)
+        self._total_length -= sum(lengths)
+
+    def search(self, query: str, max_results: int = 10, file_pattern: str = "*") -> List[LexicalHit]:
+        """
+        Rank the chunks matching a query with BM25.
+
+        Args:
+            query: Words or identifiers to look for
+            max_results: Number of chunks to return
+            file_pattern: Glob the relative path of a chunk's file must match
+
+        Returns:
+            Best chunks first
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            self._ensure_current()
+            if not terms or not self._chunk_count:
+                return []
+            average_length = self._total_length / self._chunk_count
+            allowed: Dict[str, bool] = {}
+            scores: Dict[Tuple[str, int], float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (self._chunk_count - df + 0.5) / (df + 0.5))
+                for key, tf in postings.items():
+                    rel_fname = key[0]
+                    if rel_fname not in allowed:
+                        allowed[rel_fname] = file_pattern in ("", "*") or fnmatch(rel_fname, file_pattern)
+                    if not allowed[rel_fname]:
+                        continue
+                    length = self._file_lengths[rel_fname][key[1]]
+                    norm = self.K1 * (1 - self.B + self.B * length / average_length)
+                    scores[key] = scores.get(key, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+
+            best = heapq.nlargest(max_results, scores.items(), key=lambda item: (item[1], item[0]))
+            return [
+                LexicalHit(rel_fname, self._file_chunks[rel_fname][chunk_index], score)
+                for (rel_fname, chunk_index), score in best
+            ]
+
+
+class LexicalSearchResult(FunctionCallResult):
+    """Ranked chunks of a lexical search, with the first lines of each."""
+
+    SNIPPET_LINES = 12
+
+    def __init__(self, root: str, query: str, hits: List[LexicalHit]):
+        self.root = root
+        self.query = query
+        self.hits = hits
+
+    @property
+    def content(self) -> str:
+        if not self.hits:
+            return (
+                f"No code matches `{self.query}` in the lexical index. "
+                f"Try other words, or regex_search_files for exact text."
+            )
+
+        lines = [f"Found {len(self.hits)} chunk(s) for `{self.query}`, best first:"]
+        for hit in self.hits:
+            chunk = hit.chunk
+            title = f"{hit.rel_fname}:{chunk.start + 1}-{chunk.end}"
+            if chunk.name:
+                title += f" ({chunk.name})"
+            lines.append("")
+            lines.append(f"{title} score={hit.score:.2f}")
+            code = read_source(os.path.join(self.root, hit.rel_fname))
+            if code is None:
+                continue
+            source_lines = code.splitlines()[chunk.start:chunk.end]
+            shown = source_lines[:self.SNIPPET_LINES]
+            lines.extend(f"{chunk.start + number + 1:>5}| {text}" for number, text in enumerate(shown))
+            if len(source_lines) > len(shown):
+                lines.append(f"     | ...{len(source_lines) - len(shown)} more line(s)")
+        return "\n".join(lines)
+
+    def format_for_display(self):
+        return f"Found {len(self.hits)} chunk(s) for {self.query}."
+
+    def __str__(self):
+        return self.content
+
+
+@function_tool(name_override="lexical_search")
+def lexical_search(cwd: str, query: str, max_results: int = 10, file_pattern: str = "*") -> FunctionCallResult:
+    """
+    Search the code by keywords, ranked by relevance (BM25).
+
+    Use this when you know what the code does but not what it is called, e.g.
+    "parse config file" or "retry http request". Identifiers are split into
+    words, so the query does not need the exact names. Each hit is a whole
+    function, class or other chunk of a file. For exact text or regexes use
+    regex_search_files instead.
+
+    Args:
+        cwd (str): Current working directory; the project indexed and the base
+                  of the relative paths in the output.
+        query (str): Words or identifiers describing the code to find.
+        max_results (int): Number of chunks to return. Defaults to 10.
+        file_pattern (str): Glob the relative file path must match, e.g.
+                  "siada/*.py". Defaults to "*".
+
+    Returns:
+        str: Chunks best first, each as "path:start-end (name) score" followed
+             by its first lines.
+    """
+    index = LexicalIndex.for_root(cwd)
+    return LexicalSearchResult(index.root, query, index.search(query, max_results, file_pattern))
@@ -0,0 +1,312 @@
+"""
+Parse tree cache with incremental reparsing.
+
+Tag extraction used to parse every file from scratch, even right after a
+one-line edit. The cache keeps the last tree-sitter tree and tag captures of
+each file. When a file comes back with different content, the changed byte
+range is applied to the old tree with tree.edit() and the file is reparsed
+incrementally; captures outside the lines tree-sitter reports as changed are
+shifted and reused, and the tags query only runs over the changed lines.
+
+edit_file reports its old and new content through record_edit(), so the edit
+is applied before anyone asks for the file again.
+"""
+
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, NamedTuple, Optional, Tuple
+
+# tree_sitter is throwing a FutureWarning
+warnings.simplefilter("ignore", category=FutureWarning)
+from grep_ast.tsl import USING_TSL_PACK, get_language, get_parser  # noqa: E402
+
+
+class Capture(NamedTuple):
+    """A definition or reference name found by a tags query."""
+    start_byte: int
+    line: int
+    kind: str
+    name: str
+
+
+class _Edit(NamedTuple):
+    start_byte: int
+    old_end_byte: int
+    new_end_byte: int
+
+
+@dataclass
+class _Entry:
+    lang: str
+    query_scm: str
+    source: bytes
+    tree: object
+    captures: List[Capture]
+    # Edit applied to tree but not reparsed yet, and the source before it
+    pending: Optional[_Edit] = None
+    old_source: Optional[bytes] = None
+    size: int = field(default=0)
+
+
+def _common_prefix_length(a: bytes, b: bytes, limit: int) -> int:
+    # Binary search over slice comparisons keeps the byte work in C
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix_length(a: bytes, b: bytes, limit: int) -> int:
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:] == b[len(b) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def diff_range(old: bytes, new: bytes) -> _Edit:
+    """
+    Find the single byte range that turns old into new.
+
+    Returns:
+        (start, old end, new end) of the replaced range
+    """
+    prefix = _common_prefix_length(old, new, min(len(old), len(new)))
+    suffix = _common_suffix_length(old, new, min(len(old), len(new)) - prefix)
+    return _Edit(prefix, len(old) - suffix, len(new) - suffix)
+
+
+def _point(source: bytes, offset: int) -> Tuple[int, int]:
+    row = source.count(b"\n", 0, offset)
+    return row, offset - (source.rfind(b"\n", 0, offset) + 1)
+
+
+def _line_start(source: bytes, offset: int) -> int:
+    return source.rfind(b"\n", 0, offset) + 1
+
+
+def _line_end(source: bytes, offset: int) -> int:
+    end = source.find(b"\n", offset)
+    return len(source) if end < 0 else end + 1
+
+
+def _run_query(language, query_scm: str, root_node, byte_range: Optional[Tuple[int, int]] = None) -> List[Capture]:
+    query = language.query(query_scm)
+    if byte_range is not None:
+        query.set_byte_range(byte_range)
+    captures = query.captures(root_node)
+
+    if USING_TSL_PACK:
+        all_nodes = []
+        for tag, nodes in captures.items():
+            all_nodes += [(node, tag) for node in nodes]
+    else:
+        all_nodes = list(captures)
+
+    results = []
+    for node, tag in all_nodes:
+        if tag.startswith("name.definition."):
+            kind = "def"
+        elif tag.startswith("name.reference."):
+            kind = "ref"
+        else:
+            continue
+        if byte_range is not None and not byte_range[0] <= node.start_byte < byte_range[1]:
+            continue
+        results.append(Capture(node.start_byte, node.start_point[0], kind, node.text.decode("utf-8")))
+    results.sort(key=lambda capture: capture.start_byte)
+    return results
+
+
+class ParseTreeCache:
+    """
+    LRU cache of tree-sitter trees and tag captures, keyed by absolute path.
+
+    Entries are validated by content, not by mtime: a lookup with the same
+    bytes is a hit, and different bytes are treated as an edit of the cached
+    version. Bounded by the total size of the cached sources.
+    """
+
+    MAX_ENTRIES = 256
+    MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        # Number of full parses and incremental reparses, for diagnostics
+        self.full_parses = 0
+        self.incremental_parses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _take(self, fname: str) -> Optional[_Entry]:
+        # An entry is owned by one thread while it is being updated
+        with self._lock:
+            entry = self._entries.pop(fname, None)
+            if entry is not None:
+                self._total_bytes -= entry.size
+            return entry
+
+    def _put(self, fname: str, entry: _Entry) -> None:
+        entry.size = len(entry.source)
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(fname, None)
+            if previous is not None:
+                self._total_bytes -= previous.size
+            self._entries[fname] = entry
+            self._total_bytes += entry.size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.size
+
+    def invalidate(self, fname: str) -> None:
+        """Forget a file."""
+        self._take(os.path.abspath(fname))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _apply_edit(self, entry: _Entry, new_source: bytes) -> _Entry:
+        """Apply the edit turning entry.source into new_source to the tree, without reparsing"""
+        if entry.pending is not None:
+            # A second edit before anyone asked for the tags: settle the first one
+            entry = self._reparse(entry, get_language(entry.lang), get_parser(entry.lang))
+        edit = diff_range(entry.source, new_source)
+        entry.tree.edit(
+            start_byte=edit.start_byte,
+            old_end_byte=edit.old_end_byte,
+            new_end_byte=edit.new_end_byte,
+            start_point=_point(entry.source, edit.start_byte),
+            old_end_point=_point(entry.source, edit.old_end_byte),
+            new_end_point=_point(new_source, edit.new_end_byte),
+        )
+        # Captures keep old coordinates until the reparse merges them
+        entry.pending = edit
+        entry.old_source = entry.source
+        entry.source = new_source
+        return entry
+
+    def record_edit(self, fname: str, old_content: Optional[str], new_content: Optional[str]) -> None:
+        """
+        Tell the cache a file was edited from old_content to new_content.
+
+        The edit is applied to the cached tree right away; the reparse waits
+        until the file's tags are asked for. If the cached version is not
+        old_content, the entry is dropped.
+
+        Args:
+            fname: Path of the edited file
+            old_content: Content before the edit (None if the file is new)
+            new_content: Content after the edit (None if the file is gone)
+        """
+        fname = os.path.abspath(fname)
+        entry = self._take(fname)
+        if entry is None or old_content is None or new_content is None:
+            return
+        if entry.source != old_content.encode("utf-8"):
+            return
+        self._put(fname, self._apply_edit(entry, new_content.encode("utf-8")))
+
+    def captures(self, fname: str, lang: str, query_scm: str, code: str) -> List[Capture]:
+        """
+        Get the definition and reference captures of a file's tags query.
+
+        Args:
+            fname: Path of the file, used as the cache key
+            lang: tree-sitter language name
+            query_scm: Tags query for the language
+            code: Current content of the file
+
+        Returns:
+            Captures in file order
+        """
+        fname = os.path.abspath(fname)
+        source = code.encode("utf-8")
+        language = get_language(lang)
+        parser = get_parser(lang)
+
+        entry = self._take(fname)
+        if entry is not None and (entry.lang != lang or entry.query_scm != query_scm):
+            entry = None
+        if entry is not None and entry.source != source:
+            entry = self._apply_edit(entry, source)
+        if entry is not None and entry.pending is not None:
+            entry = self._reparse(entry, language, parser)
+
+        if entry is None:
+            tree = parser.parse(source)
+            entry = _Entry(lang, query_scm, source, tree, _run_query(language, query_scm, tree.root_node))
+            self.full_parses += 1
+
+        self._put(fname, entry)
+        return list(entry.captures)
+
+    def _reparse(self, entry: _Entry, language, parser) -> _Entry:
+        old_tree, edit = entry.tree, entry.pending
+        old_source, source = entry.old_source, entry.source
+        tree = parser.parse(source, old_tree)
+        if tree.root_node.has_error:
+            # Error recovery may settle differently than in a fresh parse;
+            # broken files get one so their tags do not depend on edit history
+            tree = parser.parse(source)
+            self.full_parses += 1
+            return _Entry(entry.lang, entry.query_scm, source, tree,
+                          _run_query(language, entry.query_scm, tree.root_node))
+        self.incremental_parses += 1
+
+        # Lines whose syntax may have changed, in new coordinates
+        start = edit.start_byte
+        end = edit.new_end_byte
+        for changed in old_tree.changed_ranges(tree):
+            start = min(start, changed.start_byte)
+            end = max(end, changed.end_byte)
+        start = _line_start(source, start)
+        end = _line_end(source, end)
+
+        delta_bytes = edit.new_end_byte - edit.old_end_byte
+        delta_lines = source.count(b"\n", 0, edit.new_end_byte) - old_source.count(b"\n", 0, edit.old_end_byte)
+
+        before = []
+        after = []
+        for capture in entry.captures:
+            if capture.start_byte < edit.start_byte:
+                if capture.start_byte < start:
+                    before.append(capture)
+            elif capture.start_byte >= edit.old_end_byte:
+                shifted = capture._replace(
+                    start_byte=capture.start_byte + delta_bytes,
+                    line=capture.line + delta_lines,
+                )
+                if shifted.start_byte >= end:
+                    after.append(shifted)
+
+        changed_captures = _run_query(language, entry.query_scm, tree.root_node, (start, end))
+        return _Entry(entry.lang, entry.query_scm, source, tree, before + changed_captures + after)
+
+
+_parse_tree_cache = ParseTreeCache()
+
+
+def get_parse_tree_cache() -> ParseTreeCache:
+    """Get the process-wide parse tree cache."""
+    return _parse_tree_cache
@@ -0,0 +1,234 @@
+"""
+Symbol index: where names are defined and referenced, built from RepoMap tags.
+"""
+
+import hashlib
+import math
+import os
+import threading
+from typing import ClassVar, Dict, List, NamedTuple, Optional, Set
+
+from agents import function_tool
+
+from siada.tools.coder.observation.observation import FunctionCallResult
+
+from .ast_tool import read_source
+from .file_index import IncrementalFileIndex
+
+
+class BloomFilter:
+    """
+    Bloom filter over strings.
+
+    Answers "definitely absent" or "maybe present"; sized for an expected
+    number of items and false positive rate.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        # Double hashing: k positions from two independent hashes
+        for index in range(self.hash_count):
+            yield (first + index * second) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class SymbolLocation(NamedTuple):
+    """A definition or reference of a symbol."""
+    rel_fname: str
+    # 0-based; -1 for references found by the pygments fallback
+    line: int
+    kind: str
+
+
+class SymbolIndex(IncrementalFileIndex):
+    """
+    Name -> locations index over the def/ref tags RepoMap extracts.
+
+    Tags come from RepoMap's persistent tags cache, so building the index in
+    a new session only parses files that changed since. Lookups check a Bloom
+    filter first, so names that appear nowhere are rejected without touching
+    the maps.
+    """
+
+    _instances: ClassVar[Dict[str, "SymbolIndex"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, root: str):
+        super().__init__(root)
+        # rel_fname -> names it was indexed under
+        self._file_names: Dict[str, Set[str]] = {}
+        # name -> rel_fname -> sorted lines
+        self._definitions: Dict[str, Dict[str, List[int]]] = {}
+        self._references: Dict[str, Dict[str, List[int]]] = {}
+        self._bloom: Optional[BloomFilter] = None
+
+    def _unindex_file(self, rel_fname: str) -> None:
+        for name in self._file_names.pop(rel_fname, ()):
+            for index in (self._definitions, self._references):
+                files = index.get(name)
+                if files is not None and files.pop(rel_fname, None) is not None and not files:
+                    del index[name]
+
+    def _index_file(self, rel_fname: str) -> None:
+        fname = os.path.join(self.root, rel_fname)
+        tags = self._get_repo_map().get_tags(fname, rel_fname) or []
+
+        lines: Dict[tuple, Set[int]] = {}
+        for tag in tags:
+            if tag.kind in ("def", "ref"):
+                lines.setdefault((tag.kind, tag.name), set()).add(tag.line)
+        names = set()
+        for (kind, name), name_lines in lines.items():
+            if kind == "ref" and name_lines == {-1} and ("def", name) in lines:
+                # The pygments fallback reports every name, the definitions included
+                continue
+            index = self._definitions if kind == "def" else self._references
+            index.setdefault(name, {})[rel_fname] = sorted(name_lines)
+            names.add(name)
+            if self._bloom is not None:
+                self._bloom.add(name)
+        self._file_names[rel_fname] = names
+
+    def _rebuild_bloom(self) -> None:
+        names = self._definitions.keys() | self._references.keys()
+        # Room to grow before incremental updates force another rebuild
+        self._bloom = BloomFilter(capacity=2 * len(names) + 1024)
+        for name in names:
+            self._bloom.add(name)
+
+    def _on_updated(self, full: bool) -> None:
+        if full or self._bloom is None or self._bloom.count > self._bloom.capacity:
+            self._rebuild_bloom()
+
+    def _lookup(self, index: Dict[str, Dict[str, List[int]]], name: str) -> List[SymbolLocation]:
+        kind = "def" if index is self._definitions else "ref"
+        with self._lock:
+            self._ensure_current()
+            if name not in self._bloom:
+                return []
+            files = index.get(name)
+            if not files:
+                return []
+            return [
+                SymbolLocation(rel_fname, line, kind)
+                for rel_fname in sorted(files)
+                for line in files[rel_fname]
+            ]
+
+    def find_definitions(self, name: str) -> List[SymbolLocation]:
+        """Return where name is defined, sorted by file and line."""
+        return self._lookup(self._definitions, name)
+
+    def find_references(self, name: str) -> List[SymbolLocation]:
+        """Return where name is referenced, sorted by file and line."""
+        return self._lookup(self._references, name)
+
+
+class SymbolLookupResult(FunctionCallResult):
+    """Locations of a symbol, with the source line of each."""
+
+    MAX_LOCATIONS = 100
+    MAX_LINE_LENGTH = 100
+
+    def __init__(self, root: str, symbol: str, kind: str, locations: List[SymbolLocation]):
+        self.root = root
+        self.symbol = symbol
+        self.kind = kind
+        self.locations = locations
+
+    @property
+    def content(self) -> str:
+        noun = "definition" if self.kind == "def" else "reference"
+        if not self.locations:
+            return (
+                f"No {noun}s of `{self.symbol}` found in the symbol index. "
+                f"It only holds identifiers tree-sitter tags as definitions or references; "
+                f"use regex_search_files for other text."
+            )
+
+        shown = self.locations[:self.MAX_LOCATIONS]
+        lines = [f"Found {len(self.locations)} {noun}(s) of `{self.symbol}`:"]
+        sources: Dict[str, Optional[List[str]]] = {}
+        for location in shown:
+            if location.line < 0:
+                lines.append(f"{location.rel_fname}: (line unknown)")
+                continue
+            if location.rel_fname not in sources:
+                code = read_source(os.path.join(self.root, location.rel_fname))
+                sources[location.rel_fname] = code.splitlines() if code is not None else None
+            source_lines = sources[location.rel_fname]
+            text = ""
+            if source_lines is not None and location.line < len(source_lines):
+                text = source_lines[location.line].strip()
+                if len(text) > self.MAX_LINE_LENGTH:
+                    text = text[:self.MAX_LINE_LENGTH] + "..."
+            lines.append(f"{location.rel_fname}:{location.line + 1}: {text}".rstrip())
+        if len(self.locations) > len(shown):
+            lines.append(f"...and {len(self.locations) - len(shown)} more.")
+        return "\n".join(lines)
+
+    def format_for_display(self):
+        noun = "definition" if self.kind == "def" else "reference"
+        return f"Found {len(self.locations)} {noun}(s) of {self.symbol}."
+
+    def __str__(self):
+        return self.content
+
+
+@function_tool(name_override="find_definition")
+def find_definition(cwd: str, symbol: str) -> FunctionCallResult:
+    """
+    Find where a symbol (function, class, method, variable, ...) is defined.
+
+    Answers from a symbol index built with tree-sitter, so hits in comments and
+    strings are never reported. Prefer this over regex_search_files when
+    looking up an identifier by its exact name.
+
+    Args:
+        cwd (str): Current working directory; the project indexed and the base
+                  of the relative paths in the output.
+        symbol (str): Exact, case-sensitive identifier to look up, e.g. "RepoMap".
+
+    Returns:
+        str: One line per definition, "path:line: source line", sorted by path.
+    """
+    index = SymbolIndex.for_root(cwd)
+    return SymbolLookupResult(index.root, symbol, "def", index.find_definitions(symbol))
+
+
+@function_tool(name_override="find_references")
+def find_references(cwd: str, symbol: str) -> FunctionCallResult:
+    """
+    Find where a symbol is used (called, instantiated, read, ...).
+
+    Answers from a symbol index built with tree-sitter, so hits in comments and
+    strings are never reported. Definitions are not included; use
+    find_definition for those.
+
+    Args:
+        cwd (str): Current working directory; the project indexed and the base
+                  of the relative paths in the output.
+        symbol (str): Exact, case-sensitive identifier to look up.
+
+    Returns:
+        str: One line per reference, "path:line: source line", sorted by path,
+             limited to 100 references.
+    """
+    index = SymbolIndex.for_root(cwd)
+    return SymbolLookupResult(index.root, symbol, "ref", index.find_references(symbol))
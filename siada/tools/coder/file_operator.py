@@ -1,4 +1,3 @@
-import base64
 import mimetypes
 from pathlib import Path
 
@@ -18,6 +17,26 @@ from siada.tools.coder.observation.error import ErrorObservation
 from siada.tools.coder.observation.observation import FileReadSource
 from siada.tools.coder.tool_docs import EDIT_DOCS
 from siada.foundation.code_agent_context import CodeAgentContext
+from siada.foundation.workspace_generation import bump_generation
+from siada.foundation.tools.binary_part import BinaryPart, BinaryPartTooLarge
+from siada.foundation.tools.file_content_cache import get_file_content_cache
+from siada.tools.ast.parse_cache import get_parse_tree_cache
+
+# Binary files above this size are refused before anything is read
+MAX_BINARY_FILE_BYTES = 20 * 1024 * 1024
+
+_BINARY_EXTENSIONS = {
+    'image': ('.png', '.jpg', '.jpeg', '.bmp', '.gif'),
+    'pdf': ('.pdf',),
+    'video': ('.mp4', '.webm', '.ogg'),
+}
+
+# Used when the MIME type cannot be guessed from the extension
+_DEFAULT_MIME_TYPES = {
+    'image': 'image/png',
+    'pdf': 'application/pdf',
+    'video': 'video/mp4',
+}
 
 
 @function_tool(
@@ -36,9 +55,9 @@ async def read(
     
     This function handles different file types and returns appropriate observations:
     - Text files: Returns content as string with optional line range selection
-    - Image files: Returns base64-encoded data URI
-    - PDF files: Returns base64-encoded data URI
-    - Video files: Returns base64-encoded data URI
+    - Image, PDF and video files: Returns a short description of the file and
+      carries the lazy BinaryPart, which is encoded only when the next model
+      request is built
     - Binary files: Returns error observation
     
     Args:
@@ -56,8 +75,8 @@ async def read(
         No exceptions are raised directly - all errors are captured and returned as ErrorObservation
     """
 
-    # Cannot read binary files
-    if is_binary(path):
+    # Cannot read binary files, other than images, PDFs and videos
+    if _binary_kind(path) is None and is_binary(path):
         return ErrorObservation('ERROR_BINARY_FILE')
 
     # Get the working directory from context and initialize file editor
@@ -84,39 +103,28 @@ async def read(
     # Resolve the file path (convert relative to absolute if needed)
     filepath = _resolve_path(path, working_dir)
     try:
-        # Handle image files - return as base64-encoded data URI
-        if filepath.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif')):
-            with open(filepath, 'rb') as file:  # noqa: ASYNC101
-                image_data = file.read()
-                encoded_image = base64.b64encode(image_data).decode('utf-8')
-                mime_type, _ = mimetypes.guess_type(filepath)
-                if mime_type is None:
-                    mime_type = 'image/png'  # default to PNG if mime type cannot be determined
-                encoded_image = f'data:{mime_type};base64,{encoded_image}'
-
-            return FileReadObservation(path=filepath, content=encoded_image)
-        # Handle PDF files - return as base64-encoded data URI
-        elif filepath.lower().endswith('.pdf'):
-            with open(filepath, 'rb') as file:  # noqa: ASYNC101
-                pdf_data = file.read()
-                encoded_pdf = base64.b64encode(pdf_data).decode('utf-8')
-                encoded_pdf = f'data:application/pdf;base64,{encoded_pdf}'
-            return FileReadObservation(path=filepath, content=encoded_pdf)
-        # Handle video files - return as base64-encoded data URI
-        elif filepath.lower().endswith(('.mp4', '.webm', '.ogg')):
-            with open(filepath, 'rb') as file:  # noqa: ASYNC101
-                video_data = file.read()
-                encoded_video = base64.b64encode(video_data).decode('utf-8')
-                mime_type, _ = mimetypes.guess_type(filepath)
-                if mime_type is None:
-                    mime_type = 'video/mp4'  # default to MP4 if MIME type cannot be determined
-                encoded_video = f'data:{mime_type};base64,{encoded_video}'
-
-            return FileReadObservation(path=filepath, content=encoded_video)
+        # Image, PDF and video files are returned as lazy handles: the
+        # observation text is a short description, and the part is recorded
+        # under the tool call so the model request can attach the content
+        binary_kind = _binary_kind(filepath)
+        if binary_kind:
+            mime_type, _ = mimetypes.guess_type(filepath)
+            if mime_type is None:
+                mime_type = _DEFAULT_MIME_TYPES[binary_kind]
+            try:
+                part = BinaryPart.from_file(filepath, binary_kind, mime_type, MAX_BINARY_FILE_BYTES)
+            except BinaryPartTooLarge as e:
+                return ErrorObservation(f'{e}: {filepath}')
+            call_id = getattr(context, 'tool_call_id', None)
+            if call_id and isinstance(context.context, CodeAgentContext):
+                context.context.add_tool_binary_part(call_id, part)
+            return FileReadObservation(path=filepath, content=part.placeholder(), binary_part=part)
 
         # Handle text files - read with UTF-8 encoding and apply line range if specified
-        with open(filepath, 'r', encoding='utf-8') as file:  # noqa: ASYNC101
-            lines = read_lines(file.readlines(), start, end)
+        all_lines = get_file_content_cache().get_or_load(
+            filepath, 'lines', lambda: _read_text_lines(filepath)
+        )
+        lines = read_lines(all_lines, start, end)
     except FileNotFoundError:
         # File does not exist at the specified path
         return ErrorObservation(
@@ -181,6 +189,11 @@ def _edit_file(
         view_range=view_range,
         enable_linting=False,
     )
+    if command != 'view' and new_content is not None:
+        resolved_path = _resolve_path(path, context.context.root_dir)
+        bump_generation([resolved_path])
+        # Lets the next tag extraction reparse only the edited range
+        get_parse_tree_cache().record_edit(resolved_path, old_content, new_content)
 
     return FileEditObservation(
         content=result_str,
@@ -262,6 +275,19 @@ def _execute_file_editor(
 
     return result.output, (result.old_content, result.new_content)
 
+def _binary_kind(filepath: str) -> str | None:
+    lowered = filepath.lower()
+    for kind, extensions in _BINARY_EXTENSIONS.items():
+        if lowered.endswith(extensions):
+            return kind
+    return None
+
+
+def _read_text_lines(filepath: str) -> list[str]:
+    with open(filepath, 'r', encoding='utf-8') as file:  # noqa: ASYNC101
+        return file.readlines()
+
+
 def _resolve_path(path: str, working_dir: str) -> str:
     """
     Resolve a file path to an absolute path.
@@ -4,7 +4,11 @@ File Search - 高性能文件搜索工具
 基于 ripgrep 的 Python 文件搜索模块，提供快速、准确的代码搜索功能。
 """
 
-from .search import RipgrepSearcher, SearchResult, regex_search_files
+from .search import RipgrepSearcher, SearchResult, next_page, regex_search_files
+from .batch_search import RipgrepBatchSearcher, SearchQuery, regex_search_files_batch
 
-__all__ = ['RipgrepSearcher', 'SearchResult', 'regex_search_files']
+__all__ = [
+    'RipgrepSearcher', 'SearchResult', 'regex_search_files', 'next_page',
+    'RipgrepBatchSearcher', 'SearchQuery', 'regex_search_files_batch',
+]
 __version__ = '1.0.0'
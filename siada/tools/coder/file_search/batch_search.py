@@ -0,0 +1,257 @@
+"""
+Batch regex search: answer several (regex, glob) queries with one ripgrep
+walk per glob group.
+"""
+
+import asyncio
+import dataclasses
+import os
+import re
+from typing import Dict, List, Optional
+
+from agents import function_tool
+from pydantic import BaseModel, Field
+
+from siada.foundation.workspace_generation import current_generation
+from siada.tools.coder.file_search.cache import search_result_cache
+from siada.tools.coder.file_search.regex_syntax import is_portable_regex
+from siada.tools.coder.file_search.search import (
+    RipgrepSearcher,
+    RipgrepSearchResult,
+    RipgrepStreamParser,
+    SearchResult,
+)
+from siada.tools.coder.observation.observation import FunctionCallResult
+
+
+class SearchQuery(BaseModel):
+    """A single query of a batch search."""
+    regex: str = Field(description="Regular expression to search for (Rust regex syntax)")
+    file_pattern: str = Field(default="*", description="Glob pattern to filter files, e.g. '*.py'")
+
+
+class BatchSearchResult(FunctionCallResult):
+    """Per-query results of a batch search, in query order."""
+    queries: List[SearchQuery]
+    results: List[RipgrepSearchResult]
+    errors: Dict[int, str]
+
+    def __init__(
+        self,
+        queries: List[SearchQuery],
+        results: List[RipgrepSearchResult],
+        errors: Optional[Dict[int, str]] = None,
+    ):
+        self.queries = queries
+        self.results = results
+        # Query index -> why ripgrep could not run it
+        self.errors = errors or {}
+
+    @property
+    def content(self) -> str:
+        if not self.queries:
+            return "No queries provided"
+        sections = []
+        for index, (query, result) in enumerate(zip(self.queries, self.results), start=1):
+            error = self.errors.get(index - 1)
+            sections.append(
+                f"=== Query {index}: regex={query.regex!r}, file_pattern={query.file_pattern!r} ===\n"
+                f"{f'Error: {error}' if error is not None else result.content}"
+            )
+        return "\n\n".join(sections)
+
+    def format_for_display(self):
+        total = sum(len(result.search_results) for result in self.results)
+        match_term = "match" if total == 1 else "matches"
+        summary = f"Ran {len(self.queries)} searches, found {total} {match_term}."
+        if self.errors:
+            summary += f" {len(self.errors)} failed."
+        return summary
+
+    def __str__(self):
+        return self.content
+
+
+class RipgrepBatchSearcher:
+    """
+    Runs a batch of queries with as few ripgrep walks as possible.
+
+    Queries sharing a glob are combined into one rg invocation with multiple
+    ``-e`` patterns; each match line is then attributed back to the queries
+    whose regex matches it with Python's ``re``. rg uses Rust regex syntax, so
+    only queries in the syntax both engines read the same way are grouped
+    (see is_portable_regex); any other query, e.g. one with a POSIX class or
+    lookaround, gets its own rg invocation and needs no attribution. Should a
+    group fail anyway, its queries are rerun one by one.
+    """
+
+    def __init__(self, searcher: Optional[RipgrepSearcher] = None):
+        self.searcher = searcher or RipgrepSearcher.get_instance()
+
+    @staticmethod
+    def _compile(regex: str) -> Optional[re.Pattern]:
+        try:
+            return re.compile(regex)
+        except (re.error, RecursionError):
+            return None
+
+    def _plan_groups(self, queries: List[SearchQuery], indexes: Optional[List[int]] = None) -> List[List[int]]:
+        """Group query indexes that can share one rg invocation."""
+        groups: Dict[str, List[int]] = {}
+        isolated: List[List[int]] = []
+        for index in range(len(queries)) if indexes is None else indexes:
+            query = queries[index]
+            if not is_portable_regex(query.regex) or self._compile(query.regex) is None:
+                isolated.append([index])
+            else:
+                groups.setdefault(query.file_pattern, []).append(index)
+        return list(groups.values()) + isolated
+
+    def _search_group(
+        self,
+        directory_path: str,
+        queries: List[SearchQuery],
+        indexes: List[int],
+        max_results_per_query: int,
+    ) -> Dict[int, List[SearchResult]]:
+        """Run one rg invocation for a group and split its results per query."""
+        results: Dict[int, List[SearchResult]] = {index: [] for index in indexes}
+        if max_results_per_query <= 0:
+            return results
+
+        file_pattern = queries[indexes[0]].file_pattern
+        paths = self.searcher.narrow_search_paths(
+            directory_path, [queries[index].regex for index in indexes], file_pattern
+        )
+        if paths == []:
+            return results
+
+        args = ["--json"]
+        for index in indexes:
+            args += ["-e", queries[index].regex]
+        args += [
+            "--glob", file_pattern,
+            "--context", str(RipgrepStreamParser.CONTEXT_LINES),
+            "--",
+        ] + (paths if paths is not None else [directory_path])
+
+        # A query running alone needs no attribution, and may not be valid for re
+        patterns = {index: self._compile(queries[index].regex) for index in indexes} if len(indexes) > 1 else {}
+        open_indexes = set(indexes)
+
+        def attribute(result: SearchResult) -> None:
+            if len(indexes) == 1:
+                matched = indexes
+            else:
+                line = result.match.rstrip("\r\n")
+                matched = [index for index in indexes if patterns[index].search(line)]
+            for index in matched:
+                if index in open_indexes:
+                    results[index].append(dataclasses.replace(
+                        result,
+                        before_context=list(result.before_context),
+                        after_context=list(result.after_context),
+                    ))
+                    if len(results[index]) >= max_results_per_query:
+                        open_indexes.discard(index)
+
+        parser = RipgrepStreamParser()
+        events = self.searcher._stream_ripgrep(args)
+        try:
+            for event in events:
+                for result in parser.feed(event):
+                    attribute(result)
+                # Stop the walk once every query in the group is full
+                if not open_indexes:
+                    return results
+            for result in parser.finish():
+                attribute(result)
+        finally:
+            events.close()
+        return results
+
+    async def search(
+        self,
+        directory_path: str,
+        queries: List[SearchQuery],
+        cwd: Optional[str] = None,
+        max_results_per_query: Optional[int] = None,
+    ) -> BatchSearchResult:
+        """Run all queries, one concurrent rg process per group."""
+        cwd = cwd or os.getcwd()
+        cap = RipgrepSearcher.MAX_RESULTS if max_results_per_query is None else max_results_per_query
+        generation = current_generation()
+
+        def cache_key(query: SearchQuery):
+            return search_result_cache.make_key(directory_path, query.regex, query.file_pattern, cap)
+
+        merged: Dict[int, List[SearchResult]] = {}
+        errors: Dict[int, str] = {}
+        pending: List[int] = []
+        for index, query in enumerate(queries):
+            cached = search_result_cache.get(cache_key(query))
+            if cached is None:
+                pending.append(index)
+            else:
+                merged[index] = list(cached)
+
+        async def run_group(indexes: List[int]) -> Dict[int, List[SearchResult]]:
+            try:
+                group_results = await asyncio.to_thread(self._search_group, directory_path, queries, indexes, cap)
+            except Exception as e:
+                if len(indexes) == 1:
+                    errors[indexes[0]] = str(e)
+                    return {indexes[0]: []}
+                # One pattern rg rejects fails the whole group; find it by running each alone
+                group_results = {}
+                for single_results in await asyncio.gather(*(run_group([index]) for index in indexes)):
+                    group_results.update(single_results)
+                return group_results
+            for index, results in group_results.items():
+                search_result_cache.put(cache_key(queries[index]), results, generation)
+            return group_results
+
+        groups = self._plan_groups(queries, pending)
+        for group_results in await asyncio.gather(*(run_group(indexes) for indexes in groups)):
+            merged.update(group_results)
+
+        return BatchSearchResult(
+            queries=queries,
+            results=[
+                RipgrepSearchResult(search_results=merged.get(index, []), cwd=cwd)
+                for index in range(len(queries))
+            ],
+            errors=errors,
+        )
+
+
+@function_tool(
+    name_override="regex_search_files_batch"
+)
+async def regex_search_files_batch(
+    cwd: str,
+    directory_path: str,
+    queries: List[SearchQuery]
+) -> FunctionCallResult:
+    """
+    Run several regex searches over the same directory in a single pass.
+
+    Prefer this over repeated regex_search_files calls when looking for several
+    related identifiers or patterns: queries sharing a file_pattern are answered
+    by a single directory walk.
+
+    Args:
+        cwd (str): Current working directory used as the base for calculating
+                  relative file paths in the output.
+        directory_path (str): The target directory to search in.
+        queries (List[SearchQuery]): The searches to run. Each query has a
+                  `regex` (Rust regex syntax) and a `file_pattern` glob
+                  ("*" for all files).
+
+    Returns:
+        str: One section per query, in the order given, each formatted like the
+             output of regex_search_files and limited to 300 results.
+    """
+    if not queries:
+        return BatchSearchResult(queries=[], results=[])
+    return await RipgrepBatchSearcher().search(directory_path, queries, cwd=cwd)
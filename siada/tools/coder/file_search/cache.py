@@ -0,0 +1,71 @@
+"""
+In-process cache of search results, invalidated by the workspace generation.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from siada.foundation.workspace_generation import current_generation
+
+
+class SearchResultCache:
+    """
+    LRU cache of search results keyed by (directory, regex, glob, ...).
+
+    Every entry remembers the workspace generation it was computed at. Any
+    edit through edit_file or run_cmd bumps the generation, so a hit is only
+    returned while the workspace is known to be unchanged.
+    """
+
+    MAX_ENTRIES = 128
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[int, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(directory_path: str, *parts: Hashable) -> Tuple:
+        """Build a cache key, normalizing the directory to an absolute path."""
+        return (os.path.abspath(directory_path),) + tuple(parts)
+
+    def get(self, key: Hashable) -> Optional[object]:
+        """Return the cached value for key if it is from the current generation."""
+        generation = current_generation()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != generation:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, value: object, generation: Optional[int] = None) -> None:
+        """
+        Store a value.
+
+        Callers should pass the generation read before the search started, so a
+        workspace change during the search never produces a fresh-looking entry.
+        """
+        generation = current_generation() if generation is None else generation
+        with self._lock:
+            self._entries[key] = (generation, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Process-wide cache shared by the search tools
+search_result_cache = SearchResultCache()
@@ -0,0 +1,152 @@
+"""
+Server-side result spools backing cursor-based pagination of search results.
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+from siada.foundation.workspace_generation import add_generation_listener, current_generation
+
+if TYPE_CHECKING:
+    from siada.tools.coder.file_search.search import SearchResult
+
+
+class SearchSpool:
+    """
+    Results of one search, pulled lazily from the live result stream.
+
+    The first page is read right away; the rg process then stays paused on its
+    output pipe until a later page asks for more, so paging never re-runs the
+    search. A spool stops (and kills rg) after MAX_RESULTS results, or when the
+    workspace changes before it was read to the end.
+    """
+
+    MAX_RESULTS = 3000
+
+    def __init__(self, results: Iterator["SearchResult"], cwd: str, max_results: Optional[int] = None):
+        self.spool_id = uuid.uuid4().hex[:12]
+        self.cwd = cwd
+        self.generation = current_generation()
+        self.max_results = self.MAX_RESULTS if max_results is None else max_results
+        self.results: List["SearchResult"] = []
+        self.truncated = False
+        self.failed = False
+        # Closed before the search finished, so results is incomplete
+        self.interrupted = False
+        # SearchResultRanker that ordered the results, if any
+        self.ranker = None
+        self._stream: Optional[Iterator["SearchResult"]] = results
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self._stream is None
+
+    @property
+    def is_stale(self) -> bool:
+        """True if the workspace may have changed since the search ran."""
+        return self.generation != current_generation()
+
+    def _fill(self, count: int) -> None:
+        while self._stream is not None and len(self.results) < count:
+            try:
+                result = next(self._stream)
+            except StopIteration:
+                self._stream = None
+                break
+            except Exception:
+                self.failed = True
+                self._close()
+                break
+            if len(self.results) >= self.max_results:
+                self.truncated = True
+                self._close()
+                break
+            self.results.append(result)
+
+    def page(self, offset: int, size: int) -> Tuple[List["SearchResult"], bool]:
+        """
+        Return results[offset:offset + size] and whether more results follow.
+        """
+        with self._lock:
+            # Read one extra result so has_more is exact
+            self._fill(offset + size + 1)
+            has_more = len(self.results) > offset + size
+            return self.results[offset:offset + size], has_more
+
+    def _close(self) -> None:
+        stream, self._stream = self._stream, None
+        if stream is not None and hasattr(stream, "close"):
+            stream.close()
+
+    def close(self) -> None:
+        """Stop the underlying search; results read so far stay available."""
+        with self._lock:
+            if self._stream is not None:
+                self.interrupted = True
+            self._close()
+
+
+class SearchSpoolRegistry:
+    """LRU registry of live spools, addressed by opaque cursors."""
+
+    MAX_SPOOLS = 16
+
+    def __init__(self, max_spools: Optional[int] = None):
+        self.max_spools = self.MAX_SPOOLS if max_spools is None else max_spools
+        self._spools: "OrderedDict[str, SearchSpool]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, spool: SearchSpool) -> None:
+        with self._lock:
+            self._spools[spool.spool_id] = spool
+            self._spools.move_to_end(spool.spool_id)
+            while len(self._spools) > self.max_spools:
+                _, evicted = self._spools.popitem(last=False)
+                evicted.close()
+
+    def close_unfinished(self, generation: int, paths: Optional[List[str]] = None) -> None:
+        """
+        Drop and close the spools still reading a search, so no rg process
+        stays paused on results of a workspace that has changed. Spools read
+        to the end keep serving their cursors.
+        """
+        with self._lock:
+            unfinished = [spool for spool in self._spools.values() if not spool.done]
+            for spool in unfinished:
+                del self._spools[spool.spool_id]
+        for spool in unfinished:
+            spool.close()
+
+    def contains(self, spool: SearchSpool) -> bool:
+        with self._lock:
+            return self._spools.get(spool.spool_id) is spool
+
+    def get(self, spool_id: str) -> Optional[SearchSpool]:
+        with self._lock:
+            spool = self._spools.get(spool_id)
+            if spool is not None:
+                self._spools.move_to_end(spool_id)
+            return spool
+
+    @staticmethod
+    def make_cursor(spool: SearchSpool, offset: int) -> str:
+        return f"{spool.spool_id}:{offset}"
+
+    def resolve(self, cursor: str) -> Tuple[Optional[SearchSpool], int]:
+        """Return the spool and offset a cursor points at (spool None if expired)."""
+        spool_id, _, offset = (cursor or "").strip().partition(":")
+        try:
+            offset_value = int(offset)
+        except ValueError:
+            return None, 0
+        if offset_value < 0:
+            return None, 0
+        return self.get(spool_id), offset_value
+
+
+# Process-wide registry shared by regex_search_files and next_page
+search_spool_registry = SearchSpoolRegistry()
+add_generation_listener(search_spool_registry.close_unfinished)
@@ -0,0 +1,130 @@
+"""
+Order search results by repo-map importance.
+"""
+
+import os
+import threading
+from typing import TYPE_CHECKING, ClassVar, Dict, List, Optional, Set, Tuple
+
+from siada.foundation.config import settings
+from siada.foundation.workspace_generation import current_generation
+
+if TYPE_CHECKING:
+    from siada.tools.coder.file_search.search import SearchResult
+
+
+class SearchResultRanker:
+    """
+    Ranks search results with the PageRank scores RepoMap computes for files.
+
+    Results in higher ranked files come first; within equally ranked files a
+    match on a definition line comes before a reference. Ranks are recomputed
+    when the workspace generation moves on. Ranking is only a heuristic, so
+    until a recomputation finishes in the background the previous ranks are
+    used.
+    """
+
+    _instances: ClassVar[Dict[str, "SearchResultRanker"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self._repo_map = None
+        self._ranks: Optional[Dict[str, float]] = None
+        self._definition_lines: Dict[str, Set[int]] = {}
+        self._generation: Optional[int] = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_root(cls, root: str) -> "SearchResultRanker":
+        """Return the shared ranker of a project root."""
+        root = os.path.abspath(root)
+        with cls._instances_lock:
+            if root not in cls._instances:
+                cls._instances[root] = cls(root)
+            return cls._instances[root]
+
+    def _get_repo_map(self):
+        if self._repo_map is None:
+            from siada.tools.coder.repo_map.io import SilentIO
+            from siada.tools.coder.repo_map.repo_map import RepoMap
+            from siada.tools.coder.repo_map.token_counter import TokenCounterModel
+
+            self._repo_map = RepoMap(
+                root=self.root,
+                main_model=TokenCounterModel(settings.DEFAULT_MODEL),
+                io=SilentIO(),
+                verbose=False,
+            )
+        return self._repo_map
+
+    def _list_files(self) -> List[str]:
+        from siada.tools.coder.file_search.search import RipgrepSearcher
+
+        files = RipgrepSearcher.get_instance().list_files(self.root)
+        return [os.path.abspath(path) for path in files]
+
+    def _compute(self) -> Tuple[Dict[str, float], Dict[str, Set[int]]]:
+        repo_map = self._get_repo_map()
+        ranks = repo_map.get_file_ranks(self._list_files())
+        definition_lines = {
+            rel_fname: set(lines) for rel_fname, lines in repo_map.definition_lines.items()
+        }
+        return ranks, definition_lines
+
+    def _refresh(self, generation: int) -> None:
+        try:
+            ranks, definition_lines = self._compute()
+            with self._lock:
+                self._ranks, self._definition_lines = ranks, definition_lines
+                self._generation = generation
+        except Exception:
+            pass
+        finally:
+            self._refreshing = False
+
+    def get_ranks(self) -> Tuple[Dict[str, float], Dict[str, Set[int]]]:
+        """
+        Return (file ranks, definition lines), both keyed by path relative to root.
+        """
+        generation = current_generation()
+        with self._lock:
+            if self._ranks is None:
+                self._ranks, self._definition_lines = self._compute()
+                self._generation = generation
+            elif self._generation != generation and not self._refreshing:
+                self._refreshing = True
+                threading.Thread(target=self._refresh, args=(generation,), daemon=True).start()
+            return self._ranks, self._definition_lines
+
+    def _rel_path(self, file_path: str) -> str:
+        try:
+            return os.path.relpath(os.path.abspath(file_path), self.root)
+        except ValueError:
+            return file_path
+
+    def rank(self, results: List["SearchResult"]) -> List["SearchResult"]:
+        """Return results ordered by importance, keeping rg's order for ties."""
+        ranks, definition_lines = self.get_ranks()
+
+        def sort_key(item):
+            index, result = item
+            rel_path = self._rel_path(result.file_path)
+            # Tag lines are 0-based, rg line numbers 1-based
+            is_definition = (result.line - 1) in definition_lines.get(rel_path, ())
+            return -ranks.get(rel_path, 0.0), not is_definition, index
+
+        return [result for _, result in sorted(enumerate(results), key=sort_key)]
+
+    def ranks_relative_to(self, results: List["SearchResult"], cwd: str) -> Dict[str, float]:
+        """Return the ranks of the files in results, keyed by path relative to cwd."""
+        ranks, _ = self.get_ranks()
+        relative_ranks = {}
+        for result in results:
+            try:
+                relative_path = os.path.relpath(result.file_path, cwd).replace('\\', '/')
+            except ValueError:
+                relative_path = result.file_path
+            relative_ranks[relative_path] = ranks.get(self._rel_path(result.file_path), 0.0)
+        return relative_ranks
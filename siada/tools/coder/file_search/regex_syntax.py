@@ -0,0 +1,135 @@
+"""
+Check whether a regex only uses syntax ripgrep and Python's re agree on.
+
+rg reads patterns with Rust's regex syntax. Code that reasons about a pattern
+with Python's re (attributing batch matches, extracting trigrams) is only
+sound when both engines read the pattern the same way. Anything outside the
+shared subset, such as POSIX classes ([[:digit:]]), Unicode classes (\\p{L}),
+nested classes, lookaround, backreferences or inline flags other than i, has
+to be left to rg alone.
+"""
+
+import re
+
+# Escapes both engines read the same way
+_SHARED_LETTER_ESCAPES = set("dDwWsSbBntr")
+# Escapes that are only shared inside a character class (\b is a backspace there in Python)
+_SHARED_CLASS_LETTER_ESCAPES = set("dDwWsSntr")
+_QUANTIFIER_RE = re.compile(r"\{\d+(,\d*)?\}")
+_GROUP_PREFIXES = ("(?:", "(?i:", "(?i)")
+
+
+def _escape_length(regex: str, position: int, in_class: bool) -> int:
+    """Length of the shared escape at position, or 0 if it is not shared"""
+    if position + 1 >= len(regex):
+        return 0
+    char = regex[position + 1]
+    if char.isascii() and char.isalnum():
+        allowed = _SHARED_CLASS_LETTER_ESCAPES if in_class else _SHARED_LETTER_ESCAPES
+        return 2 if char in allowed else 0
+    # Escaped punctuation is a literal in both engines, except \< and \>,
+    # which are word boundaries in Rust
+    return 2 if char.isascii() and char.isprintable() and char not in " <>" else 0
+
+
+def _class_length(regex: str, position: int) -> int:
+    """Length of the plain character class at position, or 0 if it is not plain"""
+    index = position + 1
+    if index < len(regex) and regex[index] == "^":
+        index += 1
+    # A leading ] is a literal in Python but an empty class error in Rust
+    if index < len(regex) and regex[index] == "]":
+        return 0
+    while index < len(regex):
+        char = regex[index]
+        if char == "]":
+            return index + 1 - position
+        if char == "[":
+            # Nested and POSIX classes
+            return 0
+        if char == "\\":
+            length = _escape_length(regex, index, in_class=True)
+            if not length:
+                return 0
+            index += length
+            continue
+        if regex.startswith(("&&", "--", "~~"), index):
+            # Rust class set operations
+            return 0
+        index += 1
+    return 0
+
+
+def is_portable_regex(regex: str) -> bool:
+    """
+    Whether rg and Python's re read a regex the same way.
+
+    The shared subset is literals, escaped punctuation, ., ^, $, \\d \\w \\s
+    and their negations, \\b, plain character classes, greedy and lazy
+    quantifiers, alternation, capturing and (?:...) groups, and the i flag.
+    """
+    depth = 0
+    index = 0
+    # Whether the previous item can take a quantifier
+    quantifiable = False
+    while index < len(regex):
+        char = regex[index]
+        if char == "\\":
+            length = _escape_length(regex, index, in_class=False)
+            if not length:
+                return False
+            quantifiable = regex[index + 1] not in "bB"
+            index += length
+        elif char == "[":
+            length = _class_length(regex, index)
+            if not length:
+                return False
+            quantifiable = True
+            index += length
+        elif char == "(":
+            if regex.startswith("(?", index):
+                prefix = next((prefix for prefix in _GROUP_PREFIXES if regex.startswith(prefix, index)), None)
+                if prefix is None:
+                    return False
+                if prefix == "(?i)":
+                    # A global flag must come first to mean the same in both engines
+                    if index != 0:
+                        return False
+                    quantifiable = False
+                    index += len(prefix)
+                    continue
+                index += len(prefix)
+            else:
+                index += 1
+            depth += 1
+            quantifiable = False
+        elif char == ")":
+            if depth == 0:
+                return False
+            depth -= 1
+            quantifiable = True
+            index += 1
+        elif char in "*+?{":
+            if not quantifiable:
+                return False
+            if char == "{":
+                match = _QUANTIFIER_RE.match(regex, index)
+                if match is None:
+                    return False
+                index = match.end()
+            else:
+                index += 1
+            # Lazy quantifiers are shared; possessive ones and stacked repeats are not
+            if index < len(regex) and regex[index] == "?":
+                index += 1
+            quantifiable = False
+        elif char in "]}":
+            return False
+        elif char == "|":
+            quantifiable = False
+            index += 1
+        else:
+            # Literals, ., ^ and $
+            quantifiable = char not in "^$"
+            index += 1
+    return depth == 0
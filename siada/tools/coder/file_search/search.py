@@ -2,18 +2,29 @@
 Core search functionality using ripgrep binary.
 """
 
+import asyncio
+import hashlib
 import json
 import os
 import platform
 import subprocess
 import sys
 import stat
+import threading
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import ClassVar, Deque, Dict, Iterator, List, Optional
 
 from agents import function_tool
 
+from siada.foundation.config import settings
+from siada.foundation.workspace_generation import current_generation
+from siada.tools.coder.file_search.cache import search_result_cache
+from siada.tools.coder.file_search.pagination import SearchSpool, search_spool_registry
+from siada.tools.coder.file_search.ranking import SearchResultRanker
+from siada.tools.coder.file_search.trigram_index import TrigramIndex
+from siada.tools.coder.observation.error import ErrorObservation
 from siada.tools.coder.observation.observation import FunctionCallResult
 
 # Try to import importlib.resources for packaged environments
@@ -37,24 +48,69 @@ class SearchResult:
     after_context: List[str]
 
 
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4
+
+
 class RipgrepSearchResult(FunctionCallResult):
     """Represents a single search result with context."""
     search_results: List[SearchResult]
     cwd: str
 
-    def __init__(self, search_results: List[SearchResult], cwd: str):
+    def __init__(
+        self,
+        search_results: List[SearchResult],
+        cwd: str,
+        offset: int = 0,
+        has_more: Optional[bool] = None,
+        next_cursor: Optional[str] = None,
+        truncated: bool = False,
+        stale: bool = False,
+        file_ranks: Optional[Dict[str, float]] = None
+    ):
         self.search_results = search_results
         self.cwd = cwd
+        self.file_ranks = file_ranks
+        self.offset = offset
+        self.has_more = has_more
+        self.next_cursor = next_cursor
+        self.truncated = truncated
+        self.stale = stale
         # super().__init__(content=content)
 
 
     @property
     def content(self) -> str:
         """Generate content dynamically from search results."""
-        if self.search_results:
-            return RipgrepSearcher.format_results(self.search_results, self.cwd)
+        if self.search_results and settings.SEARCH_OUTPUT_FORMAT == "compact":
+            content = RipgrepSearcher.format_results_compact(
+                self.search_results,
+                self.cwd,
+                offset=self.offset,
+                has_more=self.has_more,
+                next_cursor=self.next_cursor,
+                truncated=self.truncated,
+                token_budget=settings.SEARCH_TOKEN_BUDGET,
+                file_ranks=self.file_ranks,
+            )
+        elif self.search_results:
+            content = RipgrepSearcher.format_results(
+                self.search_results,
+                self.cwd,
+                offset=self.offset,
+                has_more=self.has_more,
+                next_cursor=self.next_cursor,
+                truncated=self.truncated,
+            )
+        elif self.offset:
+            content = "No more results"
         else:
-            return "No results found"
+            content = "No results found"
+        if self.stale:
+            content = ("Note: files changed since this search ran; line numbers may be outdated.\n\n"
+                       + content)
+        return content
 
     def format_for_display(self):
         if self.search_results:
@@ -67,16 +123,199 @@ class RipgrepSearchResult(FunctionCallResult):
         return self.content
 
 
+class RipgrepStreamParser:
+    """
+    Incremental parser for ripgrep's --json event stream.
+
+    Events are fed one at a time; a SearchResult is returned once no further
+    context can belong to it, i.e. when the next match, an out-of-range
+    context line, or the end of its file is seen.
+    """
+
+    CONTEXT_LINES = 1
+
+    def __init__(self):
+        self._current: Optional[SearchResult] = None
+        self._current_path: Optional[str] = None
+        self._pending_context: Deque[tuple] = deque(maxlen=self.CONTEXT_LINES)
+
+    def feed(self, event: dict) -> List[SearchResult]:
+        """Consume one JSON event and return any results it completed."""
+        event_type = event.get('type')
+        data = event.get('data', {})
+        completed: List[SearchResult] = []
+
+        if event_type == 'match':
+            path = data.get('path', {}).get('text', '')
+            line_number = data.get('line_number', 0)
+            submatches = data.get('submatches', [{}])
+
+            if self._current:
+                completed.append(self._current)
+
+            before_context = []
+            if path == self._current_path:
+                before_context = [
+                    text for number, text in self._pending_context
+                    if line_number - self.CONTEXT_LINES <= number < line_number
+                ]
+
+            self._current = SearchResult(
+                file_path=path,
+                line=line_number,
+                column=submatches[0].get('start', 0) if submatches else 0,
+                match=data.get('lines', {}).get('text', ''),
+                before_context=before_context,
+                after_context=[]
+            )
+            self._current_path = path
+            self._pending_context.clear()
+
+        elif event_type == 'context':
+            path = data.get('path', {}).get('text', '')
+            line_number = data.get('line_number', 0)
+            text = data.get('lines', {}).get('text', '')
+
+            if path != self._current_path:
+                if self._current:
+                    completed.append(self._current)
+                    self._current = None
+                self._current_path = path
+                self._pending_context.clear()
+
+            current = self._current
+            if current and current.line < line_number <= current.line + self.CONTEXT_LINES:
+                current.after_context.append(text)
+            elif current and line_number > current.line + self.CONTEXT_LINES:
+                completed.append(current)
+                self._current = None
+            self._pending_context.append((line_number, text))
+
+        elif event_type in ('end', 'summary'):
+            if self._current:
+                completed.append(self._current)
+            self._current = None
+            self._current_path = None
+            self._pending_context.clear()
+
+        return completed
+
+    def finish(self) -> List[SearchResult]:
+        """Flush the result still waiting for trailing context."""
+        completed = [self._current] if self._current else []
+        self._current = None
+        self._current_path = None
+        self._pending_context.clear()
+        return completed
+
+
 class RipgrepSearcher:
     """High-performance file search using ripgrep binary."""
     
     MAX_RESULTS = 300
+    MAX_OMITTED_FILES_LISTED = 20
+
+    # On-disk cache of resolved binary paths, keyed by the lookup environment
+    BINARY_CACHE_FILE = Path.home() / ".siada-cli" / "cache" / "ripgrep_binary.json"
+
+    _instance: ClassVar[Optional["RipgrepSearcher"]] = None
+    _instance_lock: ClassVar[threading.Lock] = threading.Lock()
+    _resolved_binaries: ClassVar[Dict[str, str]] = {}
     
     def __init__(self):
         """Initialize the searcher and locate ripgrep binary."""
-        self.rg_path = self._find_ripgrep_binary()
+        self.rg_path = self._resolve_ripgrep_binary()
         if not self.rg_path:
             raise RuntimeError("Could not find ripgrep binary")
+
+    @classmethod
+    def get_instance(cls) -> "RipgrepSearcher":
+        """
+        Return the process-wide searcher, creating it on first use.
+
+        The searcher holds no per-search state, so a single instance can be
+        shared by every tool call.
+        """
+        instance = cls._instance
+        if instance is None:
+            with cls._instance_lock:
+                instance = cls._instance
+                if instance is None:
+                    instance = cls()
+                    cls._instance = instance
+        return instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the shared searcher and the in-process binary cache."""
+        with cls._instance_lock:
+            cls._instance = None
+            cls._resolved_binaries.clear()
+
+    @staticmethod
+    def _binary_cache_key() -> str:
+        """
+        Build the cache key for binary resolution.
+
+        Resolution only depends on the lookup environment, so a change in any of
+        these inputs (e.g. a different PATH) gets its own cache entry.
+        """
+        parts = [
+            os.environ.get('PATH', ''),
+            os.environ.get('RIPGREP_BINARY_PATH', ''),
+            platform.system().lower(),
+            platform.machine().lower(),
+            sys.executable,
+            str(Path(__file__).parent),
+        ]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _is_usable_binary(binary_path: Optional[str]) -> bool:
+        """Check that a previously resolved binary still exists and is executable."""
+        return bool(binary_path) and os.path.isfile(binary_path) and os.access(binary_path, os.X_OK)
+
+    def _load_binary_cache(self) -> Dict[str, str]:
+        try:
+            with open(self.BINARY_CACHE_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _store_binary_cache(self, cache_key: str, binary_path: str) -> None:
+        cache = self._load_binary_cache()
+        cache[cache_key] = binary_path
+        try:
+            self.BINARY_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.BINARY_CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(tmp_file, self.BINARY_CACHE_FILE)
+        except OSError:
+            # The disk cache is an optimization only
+            pass
+
+    def _resolve_ripgrep_binary(self) -> Optional[str]:
+        """
+        Resolve the ripgrep binary, consulting the in-process and on-disk caches
+        before falling back to the full filesystem probe.
+        """
+        cache_key = self._binary_cache_key()
+
+        binary_path = self._resolved_binaries.get(cache_key)
+        if binary_path and self._is_usable_binary(binary_path):
+            return binary_path
+
+        binary_path = self._load_binary_cache().get(cache_key)
+        if not self._is_usable_binary(binary_path):
+            binary_path = self._find_ripgrep_binary()
+            if binary_path:
+                self._store_binary_cache(cache_key, binary_path)
+
+        if binary_path:
+            self._resolved_binaries[cache_key] = binary_path
+        return binary_path
     
     def _find_ripgrep_binary(self) -> Optional[str]:
         """
@@ -175,10 +414,13 @@ class RipgrepSearcher:
             # Ignore errors if unable to modify permissions
             pass
     
-    def _execute_ripgrep(self, args: List[str]) -> str:
+    def _stream_ripgrep(self, args: List[str]) -> Iterator[dict]:
         """
-        Execute ripgrep with given arguments and return output.
-        Implements output limiting similar to the original TypeScript version.
+        Run ripgrep and yield its JSON events as they are written to stdout.
+
+        stderr is drained on a background thread so a chatty rg can never block
+        on a full pipe. Closing the generator early (e.g. once the result cap
+        is reached) kills the rg process instead of letting it finish the walk.
         """
         try:
             process = subprocess.Popen(
@@ -186,98 +428,166 @@ class RipgrepSearcher:
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
+                encoding="utf-8",
+                errors="replace",
                 bufsize=1,
-                universal_newlines=True
             )
-            
-            output_lines = []
-            max_lines = self.MAX_RESULTS * 5
-            
+        except OSError as e:
+            raise RuntimeError(f"ripgrep execution failed: {str(e)}")
+
+        stderr_chunks: List[str] = []
+        stderr_thread = threading.Thread(
+            target=lambda: stderr_chunks.append(process.stderr.read()),
+            daemon=True,
+        )
+        stderr_thread.start()
+
+        finished = False
+        try:
             for line in process.stdout:
-                if len(output_lines) < max_lines:
-                    output_lines.append(line.rstrip('\n\r'))
-                else:
-                    process.terminate()
-                    break
-            
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+            finished = True
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.stdout.close()
             process.wait()
-            
-            # Return code 1 means no matches found, which is normal
-            if process.returncode != 0 and process.returncode != 1:
-                stderr_output = process.stderr.read() if process.stderr else ""
-                if stderr_output.strip():
-                    raise subprocess.CalledProcessError(
-                        process.returncode, 
-                        [self.rg_path] + args, 
-                        stderr_output
-                    )
-            
-            return '\n'.join(output_lines)
-            
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"ripgrep process error: {e.stderr}")
-        except Exception as e:
-            raise RuntimeError(f"ripgrep execution failed: {str(e)}")
-    
+            stderr_thread.join()
+
+        # Return code 1 means no matches found, which is normal
+        if finished and process.returncode not in (0, 1):
+            stderr_output = "".join(stderr_chunks).strip()
+            if stderr_output:
+                raise RuntimeError(f"ripgrep process error: {stderr_output}")
+
+    def iter_search_results(
+        self,
+        args: List[str],
+        max_results: Optional[int] = None
+    ) -> Iterator[SearchResult]:
+        """
+        Yield SearchResult objects as ripgrep produces them.
+
+        Stops (and kills rg) once max_results results have been yielded.
+        """
+        limit = self.MAX_RESULTS if max_results is None else max_results
+        if limit <= 0:
+            return
+
+        parser = RipgrepStreamParser()
+        count = 0
+        events = self._stream_ripgrep(args)
+        try:
+            for event in events:
+                for result in parser.feed(event):
+                    yield result
+                    count += 1
+                    if count >= limit:
+                        return
+            for result in parser.finish():
+                yield result
+                count += 1
+                if count >= limit:
+                    return
+        finally:
+            events.close()
+
     def _parse_ripgrep_output(self, output: str) -> List[SearchResult]:
         """
-        Parse ripgrep JSON output into SearchResult objects.
+        Parse buffered ripgrep JSON output into SearchResult objects.
         Handles both match and context lines.
         """
+        parser = RipgrepStreamParser()
         results = []
-        current_result = None
-        
         for line in output.split('\n'):
             if not line.strip():
                 continue
-                
             try:
-                parsed = json.loads(line)
-                
-                if parsed.get('type') == 'match':
-                    if current_result:
-                        results.append(current_result)
-                    
-                    data = parsed.get('data', {})
-                    path_info = data.get('path', {})
-                    submatches = data.get('submatches', [{}])
-                    lines_info = data.get('lines', {})
-                    
-                    current_result = SearchResult(
-                        file_path=path_info.get('text', ''),
-                        line=data.get('line_number', 0),
-                        column=submatches[0].get('start', 0) if submatches else 0,
-                        match=lines_info.get('text', ''),
-                        before_context=[],
-                        after_context=[]
-                    )
-                
-                elif parsed.get('type') == 'context' and current_result:
-                    data = parsed.get('data', {})
-                    context_line_number = data.get('line_number', 0)
-                    context_text = data.get('lines', {}).get('text', '')
-                    
-                    if context_line_number < current_result.line:
-                        current_result.before_context.append(context_text)
-                    else:
-                        current_result.after_context.append(context_text)
-                        
+                results.extend(parser.feed(json.loads(line)))
             except json.JSONDecodeError:
                 continue
-            except Exception:
-                continue
-        
-        if current_result:
-            results.append(current_result)
-        
+        results.extend(parser.finish())
         return results
 
+    @staticmethod
+    def build_args(
+        directory_path: str,
+        regex: str,
+        file_pattern: str = "*",
+        paths: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Build the ripgrep arguments for a single regex search.
+
+        If paths is given, only those files are searched instead of walking
+        directory_path.
+        """
+        return [
+            "--json",
+            "-e", regex,
+            "--glob", file_pattern,
+            "--context", str(RipgrepStreamParser.CONTEXT_LINES),
+            "--",
+        ] + (paths if paths is not None else [directory_path])
+
+    def list_files(self, directory_path: str, file_pattern: str = "*") -> List[str]:
+        """
+        List the files rg would search for directory_path and file_pattern.
+
+        The listing honours rg's own hidden/ignore/glob rules and is cached for
+        the current workspace generation.
+        """
+        cache_key = search_result_cache.make_key(directory_path, "--files", file_pattern)
+        files = search_result_cache.get(cache_key)
+        if files is None:
+            generation = current_generation()
+            result = subprocess.run(
+                [self.rg_path, "--files", "--glob", file_pattern, "--", directory_path],
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+            )
+            if result.returncode not in (0, 1):
+                raise RuntimeError(f"ripgrep process error: {result.stderr.strip()}")
+            files = [line for line in result.stdout.splitlines() if line]
+            search_result_cache.put(cache_key, files, generation)
+        return files
+
+    def narrow_search_paths(
+        self,
+        directory_path: str,
+        regexes: List[str],
+        file_pattern: str = "*"
+    ) -> Optional[List[str]]:
+        """
+        Use the trigram index to find the only files that can match regexes.
+
+        Returns None when the index is disabled or cannot narrow the search, in
+        which case rg should walk directory_path as usual.
+        """
+        if not settings.SEARCH_TRIGRAM_INDEX:
+            return None
+        try:
+            index = TrigramIndex.for_path(directory_path)
+            if index is None or not index.is_ready():
+                return None
+            return index.candidate_files(self.list_files(directory_path, file_pattern), regexes)
+        except Exception:
+            return None
+
     def search_in_files(
         self, 
         directory_path: str, 
         regex: str, 
         file_pattern: str = "*",
-        cwd: Optional[str] = None
+        cwd: Optional[str] = None,
+        rank_by_importance: bool = False
     ) -> RipgrepSearchResult:
         """
         Perform regex search in files and return formatted results.
@@ -287,39 +597,109 @@ class RipgrepSearcher:
             regex: Regular expression pattern (Rust regex syntax)
             file_pattern: Glob pattern to filter files (default: "*")
             cwd: Current working directory for relative path calculation
+            rank_by_importance: Order results by repo-map file rank (with cwd
+                as the project root) instead of rg's output order
             
         Returns:
-            Formatted search results as string
+            RipgrepSearchResult holding at most MAX_RESULTS matches
         """
-        # Build ripgrep arguments
-        args = [
-            "--json",
-            "-e", regex,
-            "--glob", file_pattern,
-            "--context", "1",
-            directory_path
-        ]
-        
+        spool = self.open_spool(directory_path, regex, file_pattern, cwd, rank_by_importance)
+        return self.page_results(spool, 0)
+
+    def open_spool(
+        self,
+        directory_path: str,
+        regex: str,
+        file_pattern: str = "*",
+        cwd: Optional[str] = None,
+        rank_by_importance: bool = False
+    ) -> SearchSpool:
+        """
+        Return the result spool for a search, reusing a cached one while the
+        workspace is unchanged.
+
+        A ranked spool has to read every result (up to SearchSpool.MAX_RESULTS)
+        before the first page, so that the most important ones come first.
+        """
+        cwd = cwd or os.getcwd()
+        # The spool formats paths relative to its cwd, so cwd is always part of the key
+        cache_key = search_result_cache.make_key(directory_path, regex, file_pattern, cwd, rank_by_importance)
+        spool = search_result_cache.get(cache_key)
+        if (spool is not None and not spool.failed and not spool.interrupted
+                and (spool.done or search_spool_registry.contains(spool))):
+            search_spool_registry.register(spool)
+            return spool
+
+        generation = current_generation()
         try:
-            output = self._execute_ripgrep(args)
-            
-            if not output.strip():
-                return "No results found"
-            
-            results = self._parse_ripgrep_output(output)
-            
-            return RipgrepSearchResult(search_results=results, cwd=cwd or os.getcwd())
-        
+            paths = self.narrow_search_paths(directory_path, [regex], file_pattern)
+            if paths == []:
+                stream = iter([])
+            else:
+                args = self.build_args(directory_path, regex, file_pattern, paths)
+                # One extra result tells the spool whether it was cut off
+                stream = self.iter_search_results(args, max_results=SearchSpool.MAX_RESULTS + 1)
+        except Exception:
+            stream = iter([])
+
+        ranker = SearchResultRanker.for_root(cwd) if rank_by_importance else None
+        if ranker is not None:
+            stream = self._ranked(stream, ranker)
+
+        spool = SearchSpool(stream, cwd=cwd)
+        spool.ranker = ranker
+        search_spool_registry.register(spool)
+        search_result_cache.put(cache_key, spool, generation)
+        return spool
+
+    @staticmethod
+    def _ranked(stream: Iterator[SearchResult], ranker: SearchResultRanker) -> Iterator[SearchResult]:
+        results = list(stream)
+        try:
+            results = ranker.rank(results)
         except Exception:
-            return RipgrepSearchResult(search_results=[], cwd=cwd or os.getcwd())
+            # Fall back to rg's order if the repo map cannot be built
+            pass
+        yield from results
+
+    def page_results(self, spool: SearchSpool, offset: int) -> RipgrepSearchResult:
+        """Read one page of MAX_RESULTS results from a spool."""
+        results, has_more = spool.page(offset, self.MAX_RESULTS)
+        next_offset = offset + len(results)
+        file_ranks = None
+        if spool.ranker is not None:
+            try:
+                file_ranks = spool.ranker.ranks_relative_to(results, spool.cwd)
+            except Exception:
+                file_ranks = None
+        return RipgrepSearchResult(
+            search_results=results,
+            cwd=spool.cwd,
+            file_ranks=file_ranks,
+            offset=offset,
+            has_more=has_more,
+            next_cursor=search_spool_registry.make_cursor(spool, next_offset) if has_more else None,
+            truncated=spool.truncated and not has_more,
+            stale=offset > 0 and spool.is_stale,
+        )
+
+    async def search_in_files_async(
+        self,
+        directory_path: str,
+        regex: str,
+        file_pattern: str = "*",
+        cwd: Optional[str] = None,
+        rank_by_importance: bool = False
+    ) -> RipgrepSearchResult:
+        """Run search_in_files on a worker thread so the event loop stays responsive."""
+        return await asyncio.to_thread(
+            self.search_in_files, directory_path, regex, file_pattern, cwd, rank_by_importance
+        )
     
     @staticmethod
-    def format_results(results: List[SearchResult], cwd: str) -> str:
-        """
-        Format search results into readable string output.
-        Mimics the original TypeScript formatting.
-        """
-        grouped_results = {}
+    def _group_by_file(results: List[SearchResult], cwd: str) -> Dict[str, List[SearchResult]]:
+        """Group results by their path relative to cwd, keeping arrival order."""
+        grouped_results: Dict[str, List[SearchResult]] = {}
         
         for result in results[:RipgrepSearcher.MAX_RESULTS]:
             try:
@@ -333,17 +713,56 @@ class RipgrepSearcher:
             if relative_path not in grouped_results:
                 grouped_results[relative_path] = []
             grouped_results[relative_path].append(result)
+        return grouped_results
+
+    @staticmethod
+    def _summary_line(
+        total_results: int,
+        offset: int = 0,
+        has_more: Optional[bool] = None,
+        next_cursor: Optional[str] = None,
+        truncated: bool = False
+    ) -> str:
+        shown = min(total_results, RipgrepSearcher.MAX_RESULTS)
+        if has_more and next_cursor:
+            return (
+                f"Showing results {offset + 1}-{offset + shown} of more than {offset + shown}. "
+                f"Call next_page with cursor \"{next_cursor}\" for more, or use a more specific search."
+            )
+        if truncated:
+            return (
+                f"Showing results {offset + 1}-{offset + shown}; the search stopped after "
+                f"{offset + shown} results. Use a more specific search if necessary."
+            )
+        if offset:
+            return f"Showing results {offset + 1}-{offset + shown} (last page)."
+        if has_more is None and total_results >= RipgrepSearcher.MAX_RESULTS:
+            return f"Showing first {RipgrepSearcher.MAX_RESULTS} of {RipgrepSearcher.MAX_RESULTS}+ results. Use a more specific search if necessary."
+        result_word = "result" if total_results == 1 else "results"
+        return f"Found {total_results:,} {result_word}."
+
+    @staticmethod
+    def format_results(
+        results: List[SearchResult],
+        cwd: str,
+        offset: int = 0,
+        has_more: Optional[bool] = None,
+        next_cursor: Optional[str] = None,
+        truncated: bool = False
+    ) -> str:
+        """
+        Format search results into readable string output.
+        Mimics the original TypeScript formatting.
+
+        offset, has_more and next_cursor describe where this page sits in a
+        paginated search; without them the MAX_RESULTS cap is assumed.
+        """
+        grouped_results = RipgrepSearcher._group_by_file(results, cwd)
         
-        output_lines = []
-        
-        total_results = len(results)
-        if total_results >= RipgrepSearcher.MAX_RESULTS:
-            output_lines.append(f"Showing first {RipgrepSearcher.MAX_RESULTS} of {RipgrepSearcher.MAX_RESULTS}+ results. Use a more specific search if necessary.")
-        else:
-            result_word = "result" if total_results == 1 else "results"
-            output_lines.append(f"Found {total_results:,} {result_word}.")
-        
-        output_lines.append("")
+        output_lines = [
+            RipgrepSearcher._summary_line(len(results), offset, has_more, next_cursor, truncated),
+            "",
+        ]
         
         for file_path, file_results in grouped_results.items():
             output_lines.append(file_path)
@@ -368,15 +787,97 @@ class RipgrepSearcher:
         
         return '\n'.join(output_lines).rstrip()
 
+    @staticmethod
+    def format_results_compact(
+        results: List[SearchResult],
+        cwd: str,
+        offset: int = 0,
+        has_more: Optional[bool] = None,
+        next_cursor: Optional[str] = None,
+        truncated: bool = False,
+        token_budget: Optional[int] = None,
+        file_ranks: Optional[Dict[str, float]] = None
+    ) -> str:
+        """
+        Format search results with as few tokens as possible.
+
+        Matches are grouped by file and overlapping context windows are merged.
+        Match lines are prefixed with "N:", context lines with "N-", and
+        non-adjacent windows are separated by "--", like grep. When the output
+        would exceed token_budget, whole files are dropped starting with the
+        lowest ranked (by file_ranks, else by number of matches) and listed by
+        name at the end.
+        """
+        grouped_results = RipgrepSearcher._group_by_file(results, cwd)
+
+        blocks = []
+        for order, (file_path, file_results) in enumerate(grouped_results.items()):
+            lines: Dict[int, tuple] = {}
+            for result in file_results:
+                first_line = result.line - len(result.before_context)
+                for i, text in enumerate(result.before_context):
+                    lines.setdefault(first_line + i, (text, False))
+                lines[result.line] = (result.match, True)
+                for i, text in enumerate(result.after_context):
+                    lines.setdefault(result.line + 1 + i, (text, False))
+
+            block_lines = [file_path]
+            previous = None
+            for number in sorted(lines):
+                if previous is not None and number > previous + 1:
+                    block_lines.append("--")
+                text, is_match = lines[number]
+                separator = ":" if is_match else "-"
+                block_lines.append(f"{number}{separator}{text.rstrip() if text else ''}")
+                previous = number
+            block = "\n".join(block_lines)
+
+            if file_ranks is not None:
+                rank = file_ranks.get(file_path, 0.0)
+            else:
+                rank = len(file_results)
+            blocks.append((rank, order, file_path, len(file_results), block))
+
+        # Highest rank first; arrival order breaks ties
+        blocks.sort(key=lambda item: (-item[0], item[1]))
+
+        summary = RipgrepSearcher._summary_line(len(results), offset, has_more, next_cursor, truncated)
+        used_tokens = estimate_tokens(summary)
+        included, omitted = [], []
+        for rank, order, file_path, match_count, block in blocks:
+            block_tokens = estimate_tokens(block)
+            if token_budget is not None and included and used_tokens + block_tokens > token_budget:
+                omitted.append((file_path, match_count))
+                continue
+            included.append(block)
+            used_tokens += block_tokens
+
+        output = [summary, ""]
+        output.append("\n\n".join(included))
+        if omitted:
+            omitted_matches = sum(count for _, count in omitted)
+            names = ", ".join(
+                f"{path} ({count})" for path, count in omitted[:RipgrepSearcher.MAX_OMITTED_FILES_LISTED]
+            )
+            if len(omitted) > RipgrepSearcher.MAX_OMITTED_FILES_LISTED:
+                names += f", ... {len(omitted) - RipgrepSearcher.MAX_OMITTED_FILES_LISTED} more"
+            output.append("")
+            output.append(
+                f"Omitted {omitted_matches} matches in {len(omitted)} files to stay within the "
+                f"output budget: {names}"
+            )
+        return "\n".join(output).rstrip()
+
 
 @function_tool(
     name_override="regex_search_files"
 )
-def regex_search_files(
+async def regex_search_files(
     cwd: str,
     directory_path: str,
     regex: str,
-    file_pattern: str = "*"
+    file_pattern: str = "*",
+    rank_by_importance: bool = False
 ) -> FunctionCallResult:
     """
     Perform high-performance regex search across files using ripgrep.
@@ -400,15 +901,27 @@ def regex_search_files(
                                      - "*.py" for Python files only
                                      - "*.{js,ts}" for JavaScript and TypeScript files
                                      - "test_*.py" for Python test files
+        rank_by_importance (bool, optional): If True, order results by how central
+                                     each file is in the repository (repo-map
+                                     PageRank, with cwd as the project root), and
+                                     put definitions before references. Use it for
+                                     broad searches that would otherwise return
+                                     many hits in tests or vendored code.
+                                     Defaults to False (ripgrep's order).
         
     Returns:
         str: Formatted search results containing:
              - Summary line with total number of matches found
              - For each file with matches:
                - Relative file path
-               - Each match with surrounding context lines
-               - Line numbers and column positions
-             - Results are limited to MAX_RESULTS (300) for performance
+               - Each match with surrounding context lines; match lines are
+                 prefixed with "N:", context lines with "N-", and "--"
+                 separates non-adjacent parts of the file
+             - Output is kept within a token budget; files that do not fit
+               are listed by name at the end
+             - Results are returned in pages of MAX_RESULTS (300); when more
+               results exist, the summary line gives a cursor to pass to the
+               next_page tool
              - Returns "No results found" if no matches are discovered
         
     Raises:
@@ -417,7 +930,7 @@ def regex_search_files(
                      path is not properly configured.
         
     Example:
-        >>> results = regex_search_files(
+        >>> results = await regex_search_files(
         ...     cwd="/project/root",
         ...     directory_path="siada",
         ...     regex=r"def\\s+(\\w+)",
@@ -427,11 +940,41 @@ def regex_search_files(
         Found 15 results.
         
         siada/main.py
-        │----
-        │class MyClass:
-        │    def my_function(self):
-        │        pass
-        │----
+        11-class MyClass:
+        12:    def my_function(self):
+        13-        pass
+        --
+        40:    def other_function(self):
+        41-        return 1
+    """
+    searcher = RipgrepSearcher.get_instance()
+    return await searcher.search_in_files_async(
+        directory_path, regex, file_pattern, cwd, rank_by_importance
+    )
+
+
+@function_tool(
+    name_override="next_page"
+)
+async def next_page(cursor: str) -> FunctionCallResult:
+    """
+    Fetch the next page of results of a previous regex_search_files call.
+
+    Pages are served from the results of the original search, so this is much
+    cheaper than running a broader or narrower search again.
+
+    Args:
+        cursor (str): The cursor given in the summary line of the previous page,
+                      e.g. "3f9a1c2b7d4e:300".
+
+    Returns:
+        str: The next page of results, formatted like regex_search_files output,
+             with a new cursor if further pages exist.
     """
-    searcher = RipgrepSearcher()
-    return searcher.search_in_files(directory_path, regex, file_pattern, cwd)
+    spool, offset = search_spool_registry.resolve(cursor)
+    if spool is None:
+        return ErrorObservation(
+            content=f"Cursor '{cursor}' is invalid or has expired. Run regex_search_files again."
+        )
+    searcher = RipgrepSearcher.get_instance()
+    return await asyncio.to_thread(searcher.page_results, spool, offset)
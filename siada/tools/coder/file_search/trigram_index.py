@@ -0,0 +1,430 @@
+"""
+Persistent trigram index used to narrow the files ripgrep has to read.
+
+The index maps every (lower-cased) byte trigram to the git-tracked files that
+contain it. A regex is reduced to an AND/OR query over the trigrams of its
+literal parts; only files that can satisfy that query are handed to rg. Any
+regex the analysis does not understand simply disables narrowing, so the index
+makes a search faster without changing its results (except that the
+repository's own .git directory is never searched when narrowing applies).
+"""
+
+import os
+import sqlite3
+import subprocess
+import threading
+from pathlib import Path
+from typing import ClassVar, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+from siada.foundation.workspace_generation import add_generation_listener
+from siada.tools.coder.file_search.regex_syntax import is_portable_regex
+
+SQLITE_ERRORS = (sqlite3.OperationalError, sqlite3.DatabaseError, OSError)
+
+# Query tree nodes: None matches every file, otherwise ("tri", trigrams),
+# ("and", [children]) or ("or", [children])
+TrigramQuery = Optional[Tuple[str, object]]
+
+_REPEAT_OPS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+if hasattr(sre_constants, "POSSESSIVE_REPEAT"):
+    _REPEAT_OPS.add(sre_constants.POSSESSIVE_REPEAT)
+
+# Characters whose Unicode case folding reaches outside ASCII (KELVIN SIGN,
+# LATIN SMALL LETTER LONG S), which a lower-cased byte index cannot represent
+_UNICODE_FOLDING_CHARS = {"k", "s"}
+
+
+def _trigrams(text: str) -> Set[int]:
+    data = text.encode("utf-8").lower()
+    return {int.from_bytes(data[i:i + 3], "big") for i in range(len(data) - 2)}
+
+
+def _analyze(items, ignorecase: bool) -> TrigramQuery:
+    """Reduce a parsed regex sequence to a trigram query."""
+    parts: List[TrigramQuery] = []
+    run: List[str] = []
+
+    def flush():
+        if len(run) >= 3:
+            parts.append(("tri", _trigrams("".join(run))))
+        run.clear()
+
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            ch = chr(av)
+            if ignorecase and (not ch.isascii() or ch.lower() in _UNICODE_FOLDING_CHARS):
+                flush()
+            else:
+                run.append(ch)
+            continue
+
+        flush()
+        if op is sre_constants.SUBPATTERN:
+            _, add_flags, del_flags, sub = av
+            sub_ignorecase = ignorecase
+            if add_flags & sre_constants.SRE_FLAG_IGNORECASE:
+                sub_ignorecase = True
+            if del_flags & sre_constants.SRE_FLAG_IGNORECASE:
+                sub_ignorecase = False
+            parts.append(_analyze(sub, sub_ignorecase))
+        elif op is sre_constants.BRANCH:
+            branches = [_analyze(branch, ignorecase) for branch in av[1]]
+            if all(branch is not None for branch in branches):
+                parts.append(("or", branches))
+        elif op in _REPEAT_OPS:
+            min_count, _, sub = av
+            if min_count >= 1:
+                parts.append(_analyze(sub, ignorecase))
+        # Anything else (classes, anchors, backreferences...) constrains nothing
+
+    flush()
+    parts = [part for part in parts if part is not None]
+    if not parts:
+        return None
+    return parts[0] if len(parts) == 1 else ("and", parts)
+
+
+def build_trigram_query(regex: str) -> TrigramQuery:
+    """
+    Build the trigram query for a regex.
+
+    Returns None when the regex cannot be analyzed or has no literal of at least
+    three characters, meaning every file is a candidate. The regex is rg's
+    (Rust syntax) but is analyzed with Python's parser, so anything outside
+    the syntax both read alike is not analyzed at all.
+    """
+    if not is_portable_regex(regex):
+        return None
+    try:
+        parsed = sre_parse.parse(regex)
+    except Exception:
+        return None
+    ignorecase = bool(parsed.state.flags & sre_constants.SRE_FLAG_IGNORECASE)
+    return _analyze(list(parsed), ignorecase)
+
+
+class TrigramIndex:
+    """
+    Trigram index of the git-tracked files of one repository.
+
+    The first use builds the index on a background thread; until it is ready no
+    narrowing happens. Afterwards it is kept current incrementally: files
+    changed through edit_file are re-indexed individually, and unknown changes
+    (e.g. after run_cmd) trigger a refresh that only re-reads files whose mtime
+    or size moved.
+    """
+
+    CACHE_VERSION = 1
+    INDEX_DIR = f".siada.trigram.cache.v{CACHE_VERSION}"
+
+    MAX_FILE_SIZE = 1024 * 1024
+    MAX_CANDIDATE_FILES = 1000
+
+    STATUS_INDEXED = 0
+    STATUS_TOO_LARGE = 1
+    STATUS_BINARY = 2
+
+    _instances: ClassVar[Dict[str, "TrigramIndex"]] = {}
+    _roots: ClassVar[Dict[str, Optional[str]]] = {}
+    _registry_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._files: Dict[str, Tuple[int, int, int, int]] = {}
+        self._ready = False
+        self._build_thread: Optional[threading.Thread] = None
+        self._stale = False
+        self._dirty: Set[str] = set()
+        add_generation_listener(self._on_workspace_change)
+
+    @classmethod
+    def for_path(cls, path: str) -> Optional["TrigramIndex"]:
+        """Return the index of the git repository containing path, if any."""
+        directory = os.path.abspath(path)
+        if not os.path.isdir(directory):
+            directory = os.path.dirname(directory)
+
+        with cls._registry_lock:
+            if directory not in cls._roots:
+                cls._roots[directory] = cls._find_git_root(directory)
+            root = cls._roots[directory]
+            if root is None:
+                return None
+            if root not in cls._instances:
+                cls._instances[root] = cls(root)
+            return cls._instances[root]
+
+    @staticmethod
+    def _find_git_root(directory: str) -> Optional[str]:
+        try:
+            result = subprocess.run(
+                ["git", "rev-parse", "--show-toplevel"],
+                cwd=directory,
+                capture_output=True,
+                text=True,
+                timeout=10,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if result.returncode != 0 or not result.stdout.strip():
+            return None
+        return os.path.abspath(result.stdout.strip())
+
+    def _on_workspace_change(self, generation: int, paths: Optional[List[str]]) -> None:
+        if paths is None:
+            self._stale = True
+            return
+        for path in paths:
+            rel_path = self._rel_path(path)
+            if rel_path is not None:
+                self._dirty.add(rel_path)
+
+    def _rel_path(self, path: str) -> Optional[str]:
+        rel_path = os.path.relpath(os.path.abspath(path), self.root)
+        if rel_path.startswith(".."):
+            return None
+        return Path(rel_path).as_posix()
+
+    @classmethod
+    def _is_excluded(cls, rel_path: str) -> bool:
+        """The repository's .git directory and the index itself are never searched."""
+        return rel_path.split("/", 1)[0] in (".git", cls.INDEX_DIR)
+
+    # Storage
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            index_dir = Path(self.root) / self.INDEX_DIR
+            try:
+                index_dir.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(index_dir / "index.db"), check_same_thread=False)
+            except SQLITE_ERRORS:
+                conn = sqlite3.connect(":memory:", check_same_thread=False)
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT UNIQUE NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    status INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS postings (
+                    trigram INTEGER NOT NULL,
+                    file_id INTEGER NOT NULL,
+                    PRIMARY KEY (trigram, file_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS postings_file ON postings (file_id);
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def _list_git_files(self) -> List[str]:
+        result = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            cwd=self.root,
+            capture_output=True,
+            timeout=300,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.decode("utf-8", "replace"))
+        paths = result.stdout.decode("utf-8", "surrogateescape").split("\0")
+        return sorted({path for path in paths if path and not self._is_excluded(path)})
+
+    def _index_file(self, conn: sqlite3.Connection, rel_path: str) -> None:
+        """(Re-)index one file, or drop it if it no longer exists."""
+        old = self._files.pop(rel_path, None)
+        if old is not None:
+            conn.execute("DELETE FROM postings WHERE file_id = ?", (old[0],))
+            conn.execute("DELETE FROM files WHERE id = ?", (old[0],))
+
+        full_path = os.path.join(self.root, rel_path)
+        try:
+            stat_result = os.stat(full_path)
+        except OSError:
+            return
+        if not os.path.isfile(full_path):
+            return
+
+        trigrams: Set[int] = set()
+        if stat_result.st_size > self.MAX_FILE_SIZE:
+            status = self.STATUS_TOO_LARGE
+        else:
+            try:
+                with open(full_path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                return
+            if b"\0" in data:
+                status = self.STATUS_BINARY
+            else:
+                status = self.STATUS_INDEXED
+                data = data.lower()
+                trigrams = {data[i:i + 3] for i in range(len(data) - 2)}
+
+        cursor = conn.execute(
+            "INSERT INTO files (path, mtime_ns, size, status) VALUES (?, ?, ?, ?)",
+            (rel_path, stat_result.st_mtime_ns, stat_result.st_size, status),
+        )
+        file_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT OR IGNORE INTO postings (trigram, file_id) VALUES (?, ?)",
+            ((int.from_bytes(trigram, "big"), file_id) for trigram in trigrams),
+        )
+        self._files[rel_path] = (file_id, stat_result.st_mtime_ns, stat_result.st_size, status)
+
+    def refresh(self) -> None:
+        """Bring the index in line with the working tree, re-reading only changed files."""
+        with self._lock:
+            conn = self._connect()
+            if not self._files:
+                self._files = {
+                    path: (file_id, mtime_ns, size, status)
+                    for file_id, path, mtime_ns, size, status in conn.execute(
+                        "SELECT id, path, mtime_ns, size, status FROM files"
+                    )
+                }
+
+            current = self._list_git_files()
+            current_set = set(current)
+            self._stale = False
+            self._dirty.clear()
+
+            with conn:
+                for rel_path in [path for path in self._files if path not in current_set]:
+                    self._index_file(conn, rel_path)
+                for rel_path in current:
+                    known = self._files.get(rel_path)
+                    if known is not None:
+                        try:
+                            stat_result = os.stat(os.path.join(self.root, rel_path))
+                        except OSError:
+                            stat_result = None
+                        if stat_result and (stat_result.st_mtime_ns, stat_result.st_size) == known[1:3]:
+                            continue
+                    self._index_file(conn, rel_path)
+            self._ready = True
+
+    def _apply_pending_changes(self) -> None:
+        with self._lock:
+            if self._stale:
+                self.refresh()
+                return
+            if self._dirty:
+                conn = self._connect()
+                dirty, self._dirty = self._dirty, set()
+                with conn:
+                    for rel_path in dirty:
+                        if not self._is_excluded(rel_path):
+                            self._index_file(conn, rel_path)
+
+    def _build_in_background(self) -> None:
+        try:
+            self.refresh()
+        except Exception:
+            # Leave the index disabled; searches fall back to a full walk
+            self._build_thread = None
+
+    def is_ready(self) -> bool:
+        """Return True once the index is usable, starting the initial build if needed."""
+        if self._ready:
+            return True
+        with self._lock:
+            if self._build_thread is None:
+                self._build_thread = threading.Thread(target=self._build_in_background, daemon=True)
+                self._build_thread.start()
+        return False
+
+    # Querying
+
+    def _evaluate(self, conn: sqlite3.Connection, query: TrigramQuery) -> Optional[Set[int]]:
+        """Return the ids of the indexed files that may satisfy query (None: all)."""
+        if query is None:
+            return None
+        kind, value = query
+        if kind == "tri":
+            matched: Optional[Set[int]] = None
+            for trigram in value:
+                ids = {row[0] for row in conn.execute(
+                    "SELECT file_id FROM postings WHERE trigram = ?", (trigram,)
+                )}
+                matched = ids if matched is None else matched & ids
+                if not matched:
+                    return set()
+            return matched
+        if kind == "and":
+            matched = None
+            for child in value:
+                ids = self._evaluate(conn, child)
+                if ids is not None:
+                    matched = ids if matched is None else matched & ids
+                if matched is not None and not matched:
+                    return set()
+            return matched
+        union: Set[int] = set()
+        for child in value:
+            ids = self._evaluate(conn, child)
+            if ids is None:
+                return None
+            union |= ids
+        return union
+
+    def candidate_files(self, paths: Iterable[str], regexes: List[str]) -> Optional[List[str]]:
+        """
+        Filter paths down to the files that may match any of the regexes.
+
+        Files the index does not know about (untracked, ignored or too large)
+        are always candidates; binary files and anything under .git never are.
+
+        Args:
+            paths: Files rg would search (as listed by ``rg --files``)
+            regexes: The regexes being searched for
+
+        Returns:
+            The candidate subset of paths, or None if the index cannot narrow
+            this search (not ready yet, unanalyzable regex, too many candidates)
+        """
+        if not self.is_ready():
+            return None
+
+        queries = [build_trigram_query(regex) for regex in regexes]
+        if any(query is None for query in queries):
+            return None
+        query: TrigramQuery = queries[0] if len(queries) == 1 else ("or", queries)
+
+        try:
+            self._apply_pending_changes()
+            with self._lock:
+                matched = self._evaluate(self._connect(), query)
+                files = dict(self._files)
+        except (SQLITE_ERRORS + (RuntimeError, subprocess.SubprocessError)):
+            return None
+        if matched is None:
+            return None
+
+        candidates = []
+        total = 0
+        for path in paths:
+            total += 1
+            rel_path = self._rel_path(path)
+            if rel_path is not None and self._is_excluded(rel_path):
+                continue
+            entry = files.get(rel_path) if rel_path is not None else None
+            if entry is None or entry[3] == self.STATUS_TOO_LARGE or entry[0] in matched:
+                candidates.append(path)
+                if len(candidates) > self.MAX_CANDIDATE_FILES:
+                    return None
+
+        if len(candidates) >= total:
+            return None
+        return candidates
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from difflib import SequenceMatcher
 
 import re
+from siada.foundation.tools.binary_part import BinaryPart
 from siada.tools.coder.observation.observation import FunctionCallResult, FileReadSource, ObservationType, FileEditSource
 
 
@@ -12,6 +13,8 @@ class FileReadObservation(FunctionCallResult):
     path: str
     observation: str = ObservationType.READ
     impl_source: FileReadSource = FileReadSource.DEFAULT
+    # Image, PDF or video read by the tool; content then only holds its placeholder
+    binary_part: BinaryPart | None = None
 
     @property
     def message(self) -> str:
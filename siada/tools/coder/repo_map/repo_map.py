@@ -25,6 +25,8 @@ from .waiting import Spinner
 warnings.simplefilter("ignore", category=FutureWarning)
 from grep_ast.tsl import USING_TSL_PACK, get_language, get_parser  # noqa: E402
 
+from siada.tools.ast.parse_cache import get_parse_tree_cache  # noqa: E402
+
 Tag = namedtuple("Tag", "rel_fname fname line name kind".split())
 
 
@@ -94,6 +96,10 @@ class RepoMap:
         self.map_processing_time = 0
         self.last_map = None
 
+        # PageRank scores and definition lines from the last get_ranked_tags run
+        self.file_ranks = {}
+        self.definition_lines = {}
+
         if self.verbose:
             self.io.tool_output(
                 f"RepoMap initialized with map_mul_no_files: {self.map_mul_no_files}"
@@ -306,50 +312,34 @@ class RepoMap:
             return
 
         try:
-            language = get_language(lang)
-            parser = get_parser(lang)
+            # Only checks that the grammar loads; the parse tree cache builds its own parser
+            get_language(lang)
+            get_parser(lang)
         except Exception as err:
             print(f"Skipping file {fname}: {err}")
             return
 
         query_scm = get_scm_fname(lang)
-        if not query_scm.exists():
+        if not query_scm or not query_scm.exists():
             return
         query_scm = query_scm.read_text()
 
         code = self.io.read_text(fname)
         if not code:
             return
-        tree = parser.parse(bytes(code, "utf-8"))
-
-        # Run the tags queries
-        query = language.query(query_scm)
-        captures = query.captures(tree.root_node)
+        # Reuses the previous tree of the file and reparses only what changed
+        captures = get_parse_tree_cache().captures(fname, lang, query_scm, code)
 
         saw = set()
-        if USING_TSL_PACK:
-            all_nodes = []
-            for tag, nodes in captures.items():
-                all_nodes += [(node, tag) for node in nodes]
-        else:
-            all_nodes = list(captures)
-
-        for node, tag in all_nodes:
-            if tag.startswith("name.definition."):
-                kind = "def"
-            elif tag.startswith("name.reference."):
-                kind = "ref"
-            else:
-                continue
-
-            saw.add(kind)
+        for capture in captures:
+            saw.add(capture.kind)
 
             result = Tag(
                 rel_fname=rel_fname,
                 fname=fname,
-                name=node.text.decode("utf-8"),
-                kind=kind,
-                line=node.start_point[0],
+                name=capture.name,
+                kind=capture.kind,
+                line=capture.line,
             )
 
             yield result
@@ -395,6 +385,10 @@ class RepoMap:
         fnames = set(chat_fnames).union(set(other_fnames))
         chat_rel_fnames = set()
 
+        self.file_ranks = {}
+        self.definition_lines = {}
+        definition_lines = defaultdict(set)
+
         fnames = sorted(fnames)
 
         # Default personalization for unspecified files is 1/num_nodes
@@ -472,6 +466,7 @@ class RepoMap:
                     defines[tag.name].add(rel_fname)
                     key = (rel_fname, tag.name)
                     definitions[key].add(tag)
+                    definition_lines[rel_fname].add(tag.line)
 
                 elif tag.kind == "ref":
                     references[tag.name].append(rel_fname)
@@ -548,6 +543,9 @@ class RepoMap:
             except ZeroDivisionError:
                 return []
 
+        self.file_ranks = dict(ranked)
+        self.definition_lines = dict(definition_lines)
+
         # distribute the rank from each source node, across all of its out edges
         ranked_definitions = defaultdict(float)
         for src in G.nodes:
@@ -591,6 +589,25 @@ class RepoMap:
 
         return ranked_tags
 
+    def get_file_ranks(self, fnames):
+        """
+        Compute the PageRank score of every file in fnames
+
+        Args:
+            fnames: Absolute paths of the files to rank
+
+        Returns:
+            dict: rel_fname -> rank. Files without any definition or
+            reference edges are absent. Definition lines found along the way
+            are available in self.definition_lines (rel_fname -> 0-based lines).
+        """
+        if not fnames:
+            self.file_ranks = {}
+            self.definition_lines = {}
+            return {}
+        self.get_ranked_tags([], fnames, set(), set())
+        return dict(self.file_ranks)
+
     def get_ranked_tags_map(
         self,
         chat_fnames,
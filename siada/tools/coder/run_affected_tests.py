@@ -0,0 +1,86 @@
+import shlex
+
+from agents import function_tool, RunContextWrapper
+
+from siada.foundation.code_agent_context import CodeAgentContext
+from siada.foundation.workspace_generation import bump_generation
+from siada.services.affected_tests import TestImpactAnalyzer, TestSelection
+from siada.tools.coder.cmd_runner import run_cmd_impl
+from siada.tools.coder.observation.observation import FunctionCallResult
+from siada.tools.coder.run_cmd import RunCmdResult
+
+# Test files named in the summary; the command itself always lists all of them
+MAX_TESTS_LISTED = 20
+
+
+class RunAffectedTestsResult(RunCmdResult):
+    """This data class represents the output of a test run limited to the affected tests."""
+
+    def __init__(self, selection: TestSelection, command: str, output: str, code: int):
+        super().__init__(command=command, output=output, code=code)
+        self.selection = selection
+
+    @property
+    def summary(self) -> str:
+        if self.selection.full_run:
+            return f"Ran the full test suite: {self.selection.reason}."
+        if not self.selection.tests:
+            return f"No tests are affected: {self.selection.reason}."
+        listed = self.selection.tests[:MAX_TESTS_LISTED]
+        lines = [f"Ran {len(self.selection.tests)} affected test file(s): {self.selection.reason}."]
+        lines.extend(f"- {path}" for path in listed)
+        if len(self.selection.tests) > len(listed):
+            lines.append(f"- ...and {len(self.selection.tests) - len(listed)} more.")
+        return "\n".join(lines)
+
+    @property
+    def content(self) -> str:
+        if not self.command:
+            return self.summary
+        return f"{self.summary}\nCommand: {self.command}\n{super().content}"
+
+    def format_for_display(self) -> str:
+        if not self.command:
+            return "No affected tests to run."
+        return super().format_for_display()
+
+
+@function_tool
+def run_affected_tests(
+    context: RunContextWrapper[CodeAgentContext],
+    test_command: str = "python -m pytest -q",
+    full_run: bool = False,
+) -> FunctionCallResult:
+    """Run only the tests affected by the current changes to the working tree.
+
+    Prefer this over running the whole test suite with run_cmd after an edit. The
+    changed files (git diff against HEAD, plus untracked files) are mapped to the
+    test files that import them, directly or indirectly, or are named after them
+    (test_<module>.py). When the mapping is uncertain, for example because test
+    configuration or a non-Python file changed, the whole suite runs instead.
+
+    Args:
+        test_command (str): Command that runs tests; the selected test file paths
+            are appended to it. Defaults to "python -m pytest -q".
+        full_run (bool): Run the whole suite regardless of the changes.
+    """
+    root_dir = context.context.root_dir
+    if full_run:
+        selection = TestSelection(full_run=True, reason="requested")
+    else:
+        try:
+            selection = TestImpactAnalyzer(root_dir).select()
+        except Exception as e:
+            selection = TestSelection(full_run=True, reason=f"changed files could not be mapped ({e})")
+
+    if selection.full_run:
+        command = test_command
+    elif selection.tests:
+        command = " ".join([test_command] + [shlex.quote(path) for path in selection.tests])
+    else:
+        return RunAffectedTestsResult(selection, command="", output="", code=0)
+
+    code, output = run_cmd_impl(command=command, cwd=root_dir)
+    # Tests may write files anywhere in the workspace
+    bump_generation()
+    return RunAffectedTestsResult(selection, command=command, output=output, code=code)
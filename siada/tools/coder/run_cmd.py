@@ -1,6 +1,7 @@
 from agents import function_tool, RunContextWrapper
 
 from siada.foundation.code_agent_context import CodeAgentContext
+from siada.foundation.workspace_generation import bump_generation
 from siada.tools.coder.cmd_runner import run_cmd_impl
 from siada.tools.coder.observation.observation import FunctionCallResult
 
@@ -57,4 +58,6 @@ def run_cmd(context: RunContextWrapper[CodeAgentContext], command) -> FunctionCa
     """
     cwd = context.context.root_dir
     code, output = run_cmd_impl(command=command, cwd=cwd)
+    # The command may have changed any file in the workspace
+    bump_generation()
     return RunCmdResult(command=command, output=output, code=code)
@@ -3,14 +3,21 @@ File processing utilities for ReadManyFiles tool.
 """
 
 import os
-import glob
 import asyncio
 import mimetypes
-import base64
 from pathlib import Path
-from typing import List, Set, Dict, Tuple, Optional, Any, Union
+from collections import deque
+from typing import List, Dict, Tuple, Optional, Any, Union, Iterable, Iterator
 import time
 
+from siada.foundation.config import settings
+from siada.foundation.tools.binary_part import BinaryPart
+from siada.foundation.tools.file_content_cache import (
+    estimate_size,
+    file_signature,
+    get_file_content_cache,
+)
+
 from .models import (
     FileProcessResult, 
     ProcessingStats,
@@ -19,6 +26,9 @@ from .models import (
     PDF_FILE_EXTENSIONS
 )
 from .filters import FileFilter
+from .glob_walker import GlobWalker
+from .io_executor import get_io_executor, take
+from .text_reader import read_text_prefix
 
 
 class FileProcessor:
@@ -29,78 +39,77 @@ class FileProcessor:
     MAX_TEXT_LINES = 2000
     MAX_CONTENT_CHARS = 100000
     MAX_CONCURRENT_FILES = 10
+    # Paths pulled from discovery per round trip to the I/O thread pool
+    DISCOVERY_BATCH_SIZE = 64
     DEFAULT_OUTPUT_SEPARATOR_FORMAT = "--- {filePath} ---"
     
-    def __init__(self, target_dir: str):
+    def __init__(self, target_dir: str, max_output_bytes: Optional[int] = None):
         self.target_dir = Path(target_dir).resolve()
         self.file_filter = FileFilter(str(self.target_dir))
         self.stats = ProcessingStats()
+        # Memory ceiling for the content one call reads
+        self.max_output_bytes = (
+            settings.READ_MANY_FILES_MAX_BYTES if max_output_bytes is None else max_output_bytes
+        )
     
-    async def search_files_with_glob(self, search_patterns: List[str], 
-                                   exclusion_patterns: List[str],
-                                   signal=None) -> Set[str]:
+    def iter_matching_files(self, search_patterns: List[str],
+                            exclusion_patterns: List[str],
+                            signal=None) -> Iterator[str]:
         """
-        Search files using glob patterns
+        Lazily yield the files matching the search patterns (blocking)
+        
+        All patterns are expanded by a single directory walk that skips
+        directories the exclusion patterns rule out entirely. Each file is
+        yielded once, in discovery order.
         
         Args:
             search_patterns: List of glob search patterns
             exclusion_patterns: List of exclusion patterns
             signal: Cancellation signal (optional)
             
-        Returns:
-            Set of absolute file paths
+        Yields:
+            Absolute file paths
         """
-        all_entries = set()
-        
         # Use target_dir as the single workspace directory
         workspace_dir = str(self.target_dir)
         
-        for pattern in search_patterns:
-            # Check cancellation signal
-            if signal and signal.is_cancelled():
-                break
-                
-            try:
-                # Normalize path separators (Windows compatibility)
-                normalized_pattern = pattern.replace('\\', '/')
-                
-                # Build full path pattern
-                if os.path.isabs(normalized_pattern):
-                    full_pattern = normalized_pattern
-                else:
-                    full_pattern = os.path.join(workspace_dir, normalized_pattern)
-                
-                # Execute glob search in thread pool to avoid blocking
-                loop = asyncio.get_event_loop()
-                matches = await loop.run_in_executor(
-                    None, 
-                    lambda: glob.glob(full_pattern, recursive=True)
-                )
-                
-                # Filter directories, keep only files
-                file_matches = [f for f in matches if os.path.isfile(f)]
+        walker = GlobWalker(
+            workspace_dir,
+            prune_dir=lambda rel_dir: self.file_filter.should_prune_directory(
+                rel_dir, exclusion_patterns
+            ),
+            signal=signal
+        )
+        
+        seen = set()
+        try:
+            for file_path in walker.walk(search_patterns):
+                if file_path in seen:
+                    continue
+                seen.add(file_path)
                 
                 # Apply exclusion patterns
-                for file_path in file_matches:
-                    if not self.file_filter.should_exclude_file(
-                        file_path, workspace_dir, exclusion_patterns
-                    ):
-                        all_entries.add(file_path)
-                        
-            except Exception as error:
-                # Log error but continue processing other patterns
-                print(f"Glob pattern '{pattern}' failed: {error}")
-        
-        self.stats.total_files_found = len(all_entries)
-        return all_entries
+                if not self.file_filter.should_exclude_file(
+                    file_path, workspace_dir, exclusion_patterns
+                ):
+                    yield file_path
+        except Exception as error:
+            # Log error and keep what was found
+            print(f"Glob search for patterns {search_patterns} failed: {error}")
     
-    async def process_files(self, file_paths: List[str], 
-                          input_patterns: List[str]) -> Tuple[List[Any], List[str], List[Dict]]:
+    async def process_file_stream(self, file_paths: Iterable[str],
+                                input_patterns: List[str]) -> Tuple[List[Any], List[str], List[Dict]]:
         """
-        Process multiple files concurrently
+        Process files as they are produced, with bounded concurrency and memory
+        
+        Paths are pulled from file_paths (which may block, e.g. a directory
+        walk) on the I/O thread pool only when a read slot is free, so at most
+        MAX_CONCURRENT_FILES reads are in flight. Results are assembled in the
+        order the paths were produced. Once the content read so far exceeds
+        max_output_bytes, no further files are read.
         
         Args:
-            file_paths: List of absolute file paths to process
+            file_paths: Absolute file paths to process, consumed lazily
             input_patterns: Original input patterns for explicit request checking
             
         Returns:
@@ -110,59 +119,124 @@ class FileProcessor:
         processed_files = []
         skipped_files = []
         
-        # Sort file paths for consistent output order
-        sorted_files = sorted(file_paths)
-        
-        # Process files concurrently with semaphore to control concurrency
-        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_FILES)
-        
-        async def process_single_file_wrapper(file_path: str):
-            async with semaphore:
-                return await self.process_single_file(file_path, input_patterns)
-        
-        # Create tasks for all files
-        tasks = [process_single_file_wrapper(fp) for fp in sorted_files]
+        loop = asyncio.get_event_loop()
+        executor = get_io_executor()
+        paths = iter(file_paths)
+        queued: deque = deque()
+        paths_exhausted = False
         
-        # Execute all tasks concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # index -> (file_path, task) for reads in flight
+        in_flight: Dict[int, Tuple[str, asyncio.Task]] = {}
+        # index -> (file_path, result or exception) waiting for earlier indices
+        finished: Dict[int, Tuple[str, Any]] = {}
+        next_index = 0
+        next_to_collect = 0
+        output_bytes = 0
+        over_budget = False
         
-        # Process results
-        for i, result in enumerate(results):
-            file_path = sorted_files[i]
-            relative_path = os.path.relpath(file_path, self.target_dir).replace('\\', '/')
-            
-            if isinstance(result, Exception):
-                skipped_files.append({
-                    'path': relative_path,
-                    'reason': f'Processing error: {str(result)}'
-                })
-                self.stats.error_files += 1
-            elif result.success:
-                content_parts.append(result.content)
-                processed_files.append(relative_path)
-                self.stats.processed_files += 1
+        try:
+            while True:
+                # Start reads while slots are free
+                while (not paths_exhausted and not over_budget and
+                       len(in_flight) < self.MAX_CONCURRENT_FILES):
+                    if not queued:
+                        batch = await loop.run_in_executor(
+                            executor, take, paths, self.DISCOVERY_BATCH_SIZE
+                        )
+                        if not batch:
+                            paths_exhausted = True
+                            break
+                        queued.extend(batch)
+                    file_path = queued.popleft()
+                    task = asyncio.ensure_future(self.process_single_file(file_path, input_patterns))
+                    in_flight[next_index] = (file_path, task)
+                    next_index += 1
                 
-                # Update file type statistics
-                if result.file_type == 'text':
-                    self.stats.text_files += 1
-                elif result.file_type == 'image':
-                    self.stats.image_files += 1
-                elif result.file_type == 'pdf':
-                    self.stats.pdf_files += 1
-                else:
-                    self.stats.binary_files += 1
-                    
-                if result.size:
-                    self.stats.total_size += result.size
-            else:
+                if not in_flight:
+                    break
+                
+                done, _ = await asyncio.wait(
+                    [task for _, task in in_flight.values()],
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for index in [i for i, (_, task) in in_flight.items() if task in done]:
+                    file_path, task = in_flight.pop(index)
+                    finished[index] = (file_path, task.exception() or task.result())
+                
+                # Collect results in production order
+                while next_to_collect in finished and not over_budget:
+                    file_path, result = finished.pop(next_to_collect)
+                    next_to_collect += 1
+                    output_bytes += self._collect_result(
+                        file_path, result, content_parts, processed_files, skipped_files
+                    )
+                    over_budget = output_bytes > self.max_output_bytes
+                
+                if over_budget:
+                    break
+        finally:
+            for _, task in in_flight.values():
+                task.cancel()
+        
+        if over_budget:
+            # Count what was left unread without reading it
+            remaining = await loop.run_in_executor(executor, lambda: sum(1 for _ in paths))
+            not_read = len(in_flight) + len(finished) + len(queued) + remaining
+            if not_read:
                 skipped_files.append({
-                    'path': relative_path,
-                    'reason': result.reason
+                    'path': f'{not_read} files',
+                    'reason': f'Not read: output memory limit of '
+                              f'{self.max_output_bytes / 1024 / 1024:.0f}MB reached'
                 })
-                self.stats.skipped_files += 1
+                self.stats.skipped_files += not_read
         
         return content_parts, processed_files, skipped_files
     
+    def _collect_result(self, file_path: str, result: Any, content_parts: List[Any],
+                        processed_files: List[str], skipped_files: List[Dict]) -> int:
+        """
+        Add one processing result to the output and statistics
+        
+        Returns:
+            Approximate number of bytes of content added
+        """
+        relative_path = os.path.relpath(file_path, self.target_dir).replace('\\', '/')
+        
+        if isinstance(result, Exception):
+            skipped_files.append({
+                'path': relative_path,
+                'reason': f'Processing error: {str(result)}'
+            })
+            self.stats.error_files += 1
+            return 0
+        
+        if not result.success:
+            skipped_files.append({
+                'path': relative_path,
+                'reason': result.reason
+            })
+            self.stats.skipped_files += 1
+            return 0
+        
+        content_parts.append(result.content)
+        processed_files.append(relative_path)
+        self.stats.processed_files += 1
+        
+        # Update file type statistics
+        if result.file_type == 'text':
+            self.stats.text_files += 1
+        elif result.file_type == 'image':
+            self.stats.image_files += 1
+        elif result.file_type == 'pdf':
+            self.stats.pdf_files += 1
+        else:
+            self.stats.binary_files += 1
+            
+        if result.size:
+            self.stats.total_size += result.size
+        
+        return estimate_size(result.content)
+    
     async def process_single_file(self, file_path: str, 
                                 input_patterns: List[str]) -> FileProcessResult:
         """
@@ -200,20 +274,29 @@ class FileProcessor:
                     size=file_size
                 )
             
-            # Read file content
-            file_content = await self.read_file_content_by_type(file_path, file_type)
+            # Reuse the formatted content of an unchanged file read earlier in the session
+            cache = get_file_content_cache()
+            cache_kind = ('read_many_files', file_type, self.MAX_TEXT_LINES, self.MAX_CONTENT_CHARS)
+            formatted_content = cache.get(file_path, cache_kind)
             
-            if file_content.get('error'):
-                return FileProcessResult(
-                    success=False,
-                    path=file_path,
-                    reason=f"Read error: {file_content['error']}",
-                    file_type=file_type,
-                    size=file_size
-                )
-            
-            # Format content
-            formatted_content = self.format_file_content(file_path, file_content['content'])
+            if formatted_content is None:
+                signature = file_signature(file_path)
+                
+                # Read file content
+                file_content = await self.read_file_content_by_type(file_path, file_type)
+                
+                if file_content.get('error'):
+                    return FileProcessResult(
+                        success=False,
+                        path=file_path,
+                        reason=f"Read error: {file_content['error']}",
+                        file_type=file_type,
+                        size=file_size
+                    )
+                
+                # Format content
+                formatted_content = self.format_file_content(file_path, file_content['content'])
+                cache.put(file_path, cache_kind, formatted_content, signature)
             
             return FileProcessResult(
                 success=True,
@@ -317,6 +400,8 @@ class FileProcessor:
         """
         Read text file with encoding detection and content truncation
         
+        Only the part of the file that survives truncation is decoded.
+        
         Args:
             file_path: Path to the text file
             
@@ -326,100 +411,63 @@ class FileProcessor:
         loop = asyncio.get_event_loop()
         
         def read_sync():
-            encodings_to_try = ['utf-8', 'utf-16', 'latin-1', 'cp1252']
+            try:
+                prefix = read_text_prefix(file_path, self.MAX_TEXT_LINES, self.MAX_CONTENT_CHARS)
+            except Exception as error:
+                return {'content': None, 'error': str(error)}
             
-            for encoding in encodings_to_try:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    
-                    # Limit line count
-                    lines = content.split('\n')
-                    if len(lines) > self.MAX_TEXT_LINES:
-                        content = '\n'.join(lines[:self.MAX_TEXT_LINES])
-                        content += f"\n\n[Content truncated: showing first {self.MAX_TEXT_LINES} of {len(lines)} lines]"
-                    
-                    # Limit total character count
-                    if len(content) > self.MAX_CONTENT_CHARS:
-                        content = content[:self.MAX_CONTENT_CHARS]
-                        content += "\n\n[Content truncated due to size limit]"
-                    
-                    return {'content': content, 'error': None, 'encoding': encoding}
-                    
-                except UnicodeDecodeError:
-                    continue
-                except Exception as error:
-                    return {'content': None, 'error': str(error)}
+            content = prefix.text
             
-            return {'content': None, 'error': 'Unable to decode file with any supported encoding'}
+            # Limit line count
+            if prefix.lines_truncated:
+                content += f"\n\n[Content truncated: showing first {self.MAX_TEXT_LINES} of {prefix.total_lines} lines]"
+            
+            # Limit total character count
+            if len(content) > self.MAX_CONTENT_CHARS:
+                content = content[:self.MAX_CONTENT_CHARS]
+                content += "\n\n[Content truncated due to size limit]"
+            
+            return {'content': content, 'error': None, 'encoding': prefix.encoding}
         
-        return await loop.run_in_executor(None, read_sync)
+        return await loop.run_in_executor(get_io_executor(), read_sync)
     
     async def read_image_file(self, file_path: str) -> Dict[str, Any]:
         """
-        Read image file and return Part object for LLM processing
+        Create a lazy image part for LLM processing
+        
+        The file is not read here; its content is encoded only when a request
+        is built for a model that accepts images.
         
         Args:
             file_path: Path to the image file
             
         Returns:
-            Dictionary with Part object content or error
+            Dictionary with BinaryPart content or error
         """
         try:
-            loop = asyncio.get_event_loop()
-            
-            def read_sync():
-                with open(file_path, 'rb') as f:
-                    return f.read()
-            
-            binary_data = await loop.run_in_executor(None, read_sync)
-            
-            # Detect MIME type
-            mime_type = self.get_mime_type(file_path)
-            
-            # Create Part object (format compatible with LLM APIs)
-            part_object = {
-                'type': 'image',
-                'mime_type': mime_type,
-                'data': base64.b64encode(binary_data).decode('utf-8'),
-                'source': 'file',
-                'file_path': file_path
-            }
-            
-            return {'content': part_object, 'error': None}
+            part = BinaryPart.from_file(
+                file_path, 'image', self.get_mime_type(file_path), self.MAX_FILE_SIZE_BYTES
+            )
+            return {'content': part, 'error': None}
             
         except Exception as error:
             return {'content': None, 'error': str(error)}
     
     async def read_pdf_file(self, file_path: str) -> Dict[str, Any]:
         """
-        Read PDF file and return Part object for LLM processing
+        Create a lazy PDF part for LLM processing
         
         Args:
             file_path: Path to the PDF file
             
         Returns:
-            Dictionary with Part object content or error
+            Dictionary with BinaryPart content or error
         """
         try:
-            loop = asyncio.get_event_loop()
-            
-            def read_sync():
-                with open(file_path, 'rb') as f:
-                    return f.read()
-            
-            binary_data = await loop.run_in_executor(None, read_sync)
-            
-            # Create Part object for PDF
-            part_object = {
-                'type': 'pdf',
-                'mime_type': 'application/pdf',
-                'data': base64.b64encode(binary_data).decode('utf-8'),
-                'source': 'file',
-                'file_path': file_path
-            }
-            
-            return {'content': part_object, 'error': None}
+            part = BinaryPart.from_file(
+                file_path, 'pdf', 'application/pdf', self.MAX_FILE_SIZE_BYTES
+            )
+            return {'content': part, 'error': None}
             
         except Exception as error:
             return {'content': None, 'error': str(error)}
@@ -469,7 +517,7 @@ class FileProcessor:
             separator = self.DEFAULT_OUTPUT_SEPARATOR_FORMAT.format(filePath=file_path)
             return f"{separator}\n\n{content}\n\n"
         else:
-            # Non-text file (image, PDF): return Part object directly
+            # Non-text file (image, PDF): return the lazy BinaryPart directly
             return content
     
     def get_stats(self) -> ProcessingStats:
@@ -0,0 +1,221 @@
+"""
+Single-pass glob expansion for ReadManyFiles tool.
+"""
+
+import os
+import re
+import glob
+import fnmatch
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+
+# Marker for a '**' path segment
+DOUBLE_STAR = object()
+
+# (pattern index, segment index) - a position inside one compiled pattern
+State = Tuple[int, int]
+
+
+class _Segment:
+    """One '/'-separated part of a glob pattern"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.is_magic = glob.has_magic(text)
+        self.regex = re.compile(fnmatch.translate(text)) if self.is_magic else None
+        # Like glob, wildcards do not match hidden names unless the segment
+        # itself starts with a dot
+        self.matches_hidden = text.startswith('.')
+
+    def matches(self, name: str) -> bool:
+        if not self.is_magic:
+            return name == self.text
+        if name.startswith('.') and not self.matches_hidden:
+            return False
+        return self.regex.match(name) is not None
+
+
+class GlobWalker:
+    """
+    Expand many glob patterns with one directory walk.
+
+    All patterns are matched at once while walking the workspace with
+    os.scandir, and a directory is only entered when some pattern can still
+    match below it and prune_dir does not reject it. Matching follows
+    glob.glob(recursive=True): '**' spans any number of directories, and
+    wildcards skip hidden entries.
+    """
+
+    def __init__(self, root: str, prune_dir: Optional[Callable[[str], bool]] = None,
+                 signal=None):
+        """
+        Args:
+            root: Directory that relative patterns are resolved against
+            prune_dir: Called with a directory path relative to root; True skips the directory
+            signal: Cancellation signal (optional)
+        """
+        self.root = os.path.abspath(root)
+        self.prune_dir = prune_dir
+        self.signal = signal
+        self._patterns: List[List[object]] = []
+
+    def walk(self, patterns: List[str]) -> Iterator[str]:
+        """
+        Yield absolute paths of files matching any of the patterns
+
+        A file may be yielded more than once when several patterns reach it
+        through different spellings (literal paths, absolute patterns outside
+        the root); callers collect the results into a set.
+        """
+        self._patterns = []
+        fallback_patterns = []
+
+        for pattern in patterns:
+            relative = self._relative_pattern(pattern)
+            if relative is None:
+                fallback_patterns.append(pattern)
+                continue
+            if not relative:
+                continue
+            if not glob.has_magic(relative):
+                # Plain paths need a stat, not a walk
+                full_path = os.path.join(self.root, relative)
+                if os.path.isfile(full_path):
+                    yield full_path
+                continue
+            self._patterns.append(self._compile(relative))
+
+        if self._patterns:
+            start_states = {(index, 0) for index in range(len(self._patterns))}
+            yield from self._walk_dir(self.root, '', start_states, set())
+
+        for pattern in fallback_patterns:
+            # Patterns outside the root cannot share the walk
+            for match in glob.glob(pattern, recursive=True):
+                if os.path.isfile(match):
+                    yield match
+
+    def _relative_pattern(self, pattern: str) -> Optional[str]:
+        """Return the pattern relative to root, or None if it points outside of it"""
+        normalized = pattern.replace('\\', '/')
+        if os.path.isabs(normalized):
+            try:
+                normalized = os.path.relpath(normalized, self.root).replace('\\', '/')
+            except ValueError:
+                return None
+            if normalized == '.':
+                return ''
+
+        parts = [part for part in normalized.split('/') if part not in ('', '.')]
+        if '..' in parts:
+            return None
+        if normalized.endswith('/') and parts:
+            # glob only returns the directory itself for a trailing slash,
+            # and directories are never read
+            return ''
+        return '/'.join(parts)
+
+    @staticmethod
+    def _compile(pattern: str) -> List[object]:
+        return [DOUBLE_STAR if part == '**' else _Segment(part) for part in pattern.split('/')]
+
+    def _closure(self, states: Set[State]) -> Set[State]:
+        """Add the states reached by letting '**' match zero directories"""
+        pending = list(states)
+        closed = set(states)
+        while pending:
+            pattern_index, segment_index = pending.pop()
+            segments = self._patterns[pattern_index]
+            if segments[segment_index] is DOUBLE_STAR and segment_index + 1 < len(segments):
+                following = (pattern_index, segment_index + 1)
+                if following not in closed:
+                    closed.add(following)
+                    pending.append(following)
+        return closed
+
+    def _match_entry(self, name: str, is_dir: bool, is_file: bool,
+                     states: Set[State]) -> Tuple[bool, Set[State]]:
+        """Return whether the entry is a matching file and the states for its children"""
+        matched = False
+        child_states: Set[State] = set()
+
+        for pattern_index, segment_index in states:
+            segments = self._patterns[pattern_index]
+            segment = segments[segment_index]
+            is_last = segment_index + 1 == len(segments)
+
+            if segment is DOUBLE_STAR:
+                if name.startswith('.'):
+                    continue
+                if is_dir:
+                    child_states.add((pattern_index, segment_index))
+                elif is_last and is_file:
+                    matched = True
+                continue
+
+            if not segment.matches(name):
+                continue
+            if is_last:
+                matched = matched or is_file
+            elif is_dir:
+                child_states.add((pattern_index, segment_index + 1))
+
+        return matched, child_states
+
+    def _entries(self, dir_path: str, states: Set[State]) -> Iterator[Tuple[str, bool, bool]]:
+        """Yield (name, is_dir, is_file) for the entries the states can match"""
+        segments = [self._patterns[p][i] for p, i in states]
+        if all(segment is not DOUBLE_STAR and not segment.is_magic for segment in segments):
+            # Only literal names can match here; stat them instead of listing
+            for name in sorted({segment.text for segment in segments}):
+                full_path = os.path.join(dir_path, name)
+                yield name, os.path.isdir(full_path), os.path.isfile(full_path)
+            return
+
+        try:
+            with os.scandir(dir_path) as entries:
+                listing = []
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                        is_file = not is_dir and entry.is_file()
+                    except OSError:
+                        continue
+                    listing.append((entry.name, is_dir, is_file))
+        except OSError:
+            # Unreadable directories are skipped, as glob does
+            return
+        # Sorted, so files are discovered in a stable order
+        yield from sorted(listing)
+
+    def _walk_dir(self, dir_path: str, rel_dir: str, states: Set[State],
+                  ancestors: Set[Tuple[int, int]]) -> Iterator[str]:
+        if self.signal and self.signal.is_cancelled():
+            return
+
+        try:
+            stat = os.stat(dir_path)
+            dir_key = (stat.st_dev, stat.st_ino)
+        except OSError:
+            return
+        if dir_key in ancestors:
+            # Symlink cycle
+            return
+        ancestors.add(dir_key)
+
+        try:
+            states = self._closure(states)
+            subdirs = []
+            for name, is_dir, is_file in self._entries(dir_path, states):
+                matched, child_states = self._match_entry(name, is_dir, is_file, states)
+                full_path = os.path.join(dir_path, name)
+                if matched:
+                    yield full_path
+                if child_states:
+                    subdirs.append((full_path, f"{rel_dir}/{name}" if rel_dir else name, child_states))
+
+            for full_path, rel_path, child_states in subdirs:
+                if self.prune_dir and self.prune_dir(rel_path):
+                    continue
+                yield from self._walk_dir(full_path, rel_path, child_states, ancestors)
+        finally:
+            ancestors.discard(dir_key)
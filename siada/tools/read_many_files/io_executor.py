@@ -0,0 +1,46 @@
+"""
+Dedicated I/O thread pool for ReadManyFiles tool.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterator, List, Optional, TypeVar
+
+from siada.foundation.config import settings
+
+T = TypeVar('T')
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool ReadManyFiles runs blocking file I/O on
+
+    Kept apart from the event loop's default executor, so a large batch read
+    neither starves nor is starved by other run_in_executor users. Its size
+    comes from settings.READ_MANY_FILES_IO_THREADS.
+
+    Returns:
+        The shared ThreadPoolExecutor
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.READ_MANY_FILES_IO_THREADS),
+                    thread_name_prefix='read-many-files-io'
+                )
+    return _executor
+
+
+def take(items: Iterator[T], count: int) -> List[T]:
+    """
+    Pull up to count items from an iterator
+
+    Used to advance a (blocking) discovery generator on the I/O pool in batches.
+    """
+    return list(islice(items, count))
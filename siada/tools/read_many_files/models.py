@@ -32,6 +32,10 @@ class ReadManyFilesParams:
     # {
     #     'respect_git_ignore': bool,     # Default: True
     # }
+    
+    token_budget: Optional[int] = None        # Token budget for all returned content
+                                              # Derived from the tool's model when not set;
+                                              # no budget if neither is known
 
 
 @dataclass
@@ -0,0 +1,174 @@
+"""
+Token-budget packing for ReadManyFiles tool.
+"""
+
+import glob
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from siada.models.model_base_config import ModelBaseConfig
+from siada.tools.coder.file_search.search import estimate_tokens
+
+
+@dataclass
+class PackResult:
+    """Content that fits the token budget"""
+    content_parts: List[Any]
+    full_files: List[str] = field(default_factory=list)
+    outlined_files: List[str] = field(default_factory=list)
+    omitted_files: List[str] = field(default_factory=list)
+
+    def build_skip_info(self) -> List[Dict]:
+        """Skip entries for the files that were only outlined or left out"""
+        skip_info = [
+            {'path': path, 'reason': 'Outline only: full content exceeds the token budget'}
+            for path in self.outlined_files
+        ]
+        skip_info.extend(
+            {'path': path, 'reason': 'Omitted: token budget exceeded'}
+            for path in self.omitted_files
+        )
+        return skip_info
+
+
+class ContentPacker:
+    """
+    Fits read file contents into a token budget
+
+    Files are ranked - files named explicitly in the request first, then by
+    repo-map rank - and taken in that order: with full content while it fits,
+    otherwise as an outline of their definitions, otherwise only listed as
+    omitted. Output keeps the original file order.
+    """
+
+    # Share of the model's context window one multi-file read may take
+    CONTEXT_WINDOW_FRACTION = 0.5
+    # Flat cost charged for an image or PDF part
+    BINARY_PART_TOKENS = 1000
+    # Tokens kept back for the list of omitted files
+    OMITTED_LIST_RESERVE_TOKENS = 500
+    MAX_OMITTED_FILES_LISTED = 50
+
+    def __init__(self, target_dir: str, token_budget: int):
+        self.target_dir = os.path.abspath(target_dir)
+        self.token_budget = token_budget
+
+    @classmethod
+    def budget_for_model(cls, model_config: Optional[ModelBaseConfig]) -> Optional[int]:
+        """
+        Derive the token budget of a read from the target model
+
+        Args:
+            model_config: Configuration of the model the content is sent to
+
+        Returns:
+            Token budget, or None when the model is unknown
+        """
+        if model_config is None or not getattr(model_config, 'context_window', None):
+            return None
+        budget = model_config.context_window * cls.CONTEXT_WINDOW_FRACTION
+        if model_config.max_tokens:
+            budget = min(budget, model_config.context_window - model_config.max_tokens)
+        return max(int(budget), 0)
+
+    def part_tokens(self, part: Any) -> int:
+        if isinstance(part, str):
+            return estimate_tokens(part)
+        return self.BINARY_PART_TOKENS
+
+    def pack(self, content_parts: List[Any], processed_files: List[str],
+             input_patterns: List[str]) -> PackResult:
+        """
+        Select what to send of each file
+
+        Args:
+            content_parts: Formatted contents, parallel to processed_files
+            processed_files: Paths relative to the target directory
+            input_patterns: Paths and patterns of the request, for finding mentioned files
+
+        Returns:
+            PackResult with the packed content parts
+        """
+        costs = [self.part_tokens(part) for part in content_parts]
+        if sum(costs) <= self.token_budget:
+            return PackResult(content_parts=list(content_parts), full_files=list(processed_files))
+
+        remaining = self.token_budget - self.OMITTED_LIST_RESERVE_TOKENS
+        packed: Dict[int, Any] = {}
+        result = PackResult(content_parts=[])
+
+        for index in self._priority_order(processed_files, input_patterns):
+            if costs[index] <= remaining:
+                packed[index] = content_parts[index]
+                remaining -= costs[index]
+                result.full_files.append(processed_files[index])
+                continue
+
+            outline = None
+            if isinstance(content_parts[index], str):
+                outline = self._outline(processed_files[index])
+            if outline is not None and estimate_tokens(outline) <= remaining:
+                packed[index] = outline
+                remaining -= estimate_tokens(outline)
+                result.outlined_files.append(processed_files[index])
+            else:
+                result.omitted_files.append(processed_files[index])
+
+        result.content_parts = [packed[index] for index in sorted(packed)]
+        if result.omitted_files:
+            result.content_parts.append(self._omitted_notice(result.omitted_files))
+        return result
+
+    def _priority_order(self, processed_files: List[str], input_patterns: List[str]) -> List[int]:
+        mentioned = {
+            os.path.normpath(pattern.replace('\\', '/')).replace('\\', '/')
+            for pattern in input_patterns
+            if not glob.has_magic(pattern)
+        }
+        ranks = self._file_ranks()
+
+        def sort_key(index):
+            path = processed_files[index]
+            is_mentioned = path in mentioned or os.path.join(self.target_dir, path) in mentioned
+            return not is_mentioned, -ranks.get(path, 0.0), index
+
+        return sorted(range(len(processed_files)), key=sort_key)
+
+    def _file_ranks(self) -> Dict[str, float]:
+        """Repo-map ranks keyed by path relative to the target directory"""
+        try:
+            from siada.tools.coder.file_search.ranking import SearchResultRanker
+
+            ranks, _ = SearchResultRanker.for_root(self.target_dir).get_ranks()
+            return {path.replace('\\', '/'): rank for path, rank in ranks.items()}
+        except Exception:
+            # Ranking is a refinement; without it files keep their order
+            return {}
+
+    def _outline(self, relative_path: str) -> Optional[str]:
+        try:
+            from siada.tools.ast.ast_tool import _list_code_definition_names
+
+            outline = _list_code_definition_names(
+                os.path.join(self.target_dir, relative_path), relative_path
+            )
+        except Exception:
+            return None
+        if not outline or outline.startswith("No code definitions found"):
+            return None
+
+        separator = f"--- {os.path.join(self.target_dir, relative_path)} ---"
+        return (
+            f"{separator}\n\n"
+            f"[Outline only: full content omitted to stay within the token budget]\n"
+            f"{outline}\n\n"
+        )
+
+    def _omitted_notice(self, omitted_files: List[str]) -> str:
+        listed = omitted_files[:self.MAX_OMITTED_FILES_LISTED]
+        lines = [f"[Omitted {len(omitted_files)} file(s) to stay within the token budget:]"]
+        lines.extend(f"- {path}" for path in listed)
+        if len(omitted_files) > len(listed):
+            lines.append(f"- ...and {len(omitted_files) - len(listed)} more.")
+        return "\n".join(lines) + "\n"
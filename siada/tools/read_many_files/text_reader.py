@@ -0,0 +1,159 @@
+"""
+Memory-mapped text reading for ReadManyFiles tool.
+"""
+
+import codecs
+import mmap
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# Bytes inspected to pick an encoding
+ENCODING_SAMPLE_BYTES = 64 * 1024
+# Chunk size used to count the lines past the cutoff
+LINE_COUNT_CHUNK_BYTES = 1024 * 1024
+# Upper bound of bytes per character in every supported encoding
+MAX_BYTES_PER_CHAR = 4
+
+
+@dataclass
+class TextPrefix:
+    """Decoded beginning of a text file"""
+    text: str
+    encoding: str
+    total_lines: int
+    lines_truncated: bool
+
+
+def detect_encoding(sample: bytes) -> Tuple[str, int]:
+    """
+    Detect the encoding of a file from its first bytes
+
+    Args:
+        sample: Leading bytes of the file
+
+    Returns:
+        Tuple of (codec name, length of the byte order mark)
+    """
+    if sample.startswith(codecs.BOM_UTF16_LE):
+        return 'utf-16-le', 2
+    if sample.startswith(codecs.BOM_UTF16_BE):
+        return 'utf-16-be', 2
+
+    # UTF-16 without a BOM: ASCII text leaves every other byte zero (and
+    # would otherwise pass as UTF-8)
+    if len(sample) >= 4:
+        odd_zeros = sample[1::2].count(0)
+        even_zeros = sample[0::2].count(0)
+        half = len(sample) // 2
+        if odd_zeros > half * 0.4 and even_zeros < half * 0.1:
+            return 'utf-16-le', 0
+        if even_zeros > half * 0.4 and odd_zeros < half * 0.1:
+            return 'utf-16-be', 0
+
+    try:
+        # The sample may end inside a multi-byte sequence
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8', 0
+    except UnicodeDecodeError:
+        pass
+
+    return 'latin-1', 0
+
+
+def _newline_bytes(encoding: str) -> Tuple[bytes, int]:
+    """Return the encoded newline and the code unit size of an encoding"""
+    newline = '\n'.encode(encoding)
+    return newline, len(newline)
+
+
+def _find_line_cutoff(data, start: int, max_lines: int, newline: bytes, unit: int) -> Optional[int]:
+    """Return the offset of the max_lines-th newline, or None if there are fewer"""
+    position = start
+    found = 0
+    while True:
+        index = data.find(newline, position)
+        if index < 0:
+            return None
+        if (index - start) % unit:
+            # Misaligned match inside a multi-byte code unit
+            position = index + 1
+            continue
+        found += 1
+        if found == max_lines:
+            return index
+        position = index + unit
+
+
+def _count_newlines(data, start: int, encoding: str, newline: bytes, unit: int) -> int:
+    """Count the newlines in data[start:] without holding it all in memory"""
+    count = 0
+    if unit == 1:
+        for offset in range(start, len(data), LINE_COUNT_CHUNK_BYTES):
+            count += data[offset:offset + LINE_COUNT_CHUNK_BYTES].count(newline)
+        return count
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    for offset in range(start, len(data), LINE_COUNT_CHUNK_BYTES):
+        count += decoder.decode(data[offset:offset + LINE_COUNT_CHUNK_BYTES]).count('\n')
+    return count
+
+
+def read_text_prefix(file_path: str, max_lines: int, max_chars: int) -> TextPrefix:
+    """
+    Decode at most the first max_lines lines and about max_chars characters of a file
+
+    The file is memory-mapped, the cutoff is located in the raw bytes, and
+    only the bytes before it are decoded. Line endings are normalized to '\\n'.
+
+    Args:
+        file_path: Path to the text file
+        max_lines: Maximum number of lines to decode
+        max_chars: Number of characters that must be available for the caller's size limit
+
+    Returns:
+        TextPrefix with the decoded text and the file's total line count
+    """
+    with open(file_path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return TextPrefix(text='', encoding='utf-8', total_lines=1, lines_truncated=False)
+
+        with data:
+            encoding, bom_length = detect_encoding(data[:ENCODING_SAMPLE_BYTES])
+            newline, unit = _newline_bytes(encoding)
+
+            cutoff = _find_line_cutoff(data, bom_length, max_lines, newline, unit)
+            lines_truncated = cutoff is not None
+            end = cutoff if lines_truncated else len(data)
+
+            # Past this many bytes the text exceeds max_chars in any encoding,
+            # and the caller only keeps the first max_chars characters
+            byte_limit = bom_length + (max_chars + 1) * MAX_BYTES_PER_CHAR
+            decode_end = min(end, byte_limit)
+            raw = data[bom_length:decode_end]
+
+            if lines_truncated:
+                total_lines = max_lines + 1 + _count_newlines(data, cutoff + unit, encoding, newline, unit)
+            else:
+                total_lines = 1 + _count_newlines(data, bom_length, encoding, newline, unit)
+
+        try:
+            text = codecs.getincrementaldecoder(encoding)().decode(raw, final=decode_end == end)
+        except UnicodeDecodeError:
+            # The sample looked fine but a later byte does not decode
+            encoding = 'latin-1'
+            text = raw.decode(encoding)
+
+        if lines_truncated and decode_end == end and text.endswith('\r'):
+            # The cutoff newline ended a CRLF pair
+            text = text[:-1]
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+
+        return TextPrefix(
+            text=text,
+            encoding=encoding,
+            total_lines=total_lines,
+            lines_truncated=lines_truncated
+        )
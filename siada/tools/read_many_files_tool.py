@@ -15,19 +15,24 @@ from .read_many_files.models import ReadManyFilesParams, ToolResult
 from .read_many_files.file_processor import FileProcessor
 from .read_many_files.filters import FileFilter
 from .read_many_files.formatters import ResultFormatter
+from .read_many_files.packer import ContentPacker
+from siada.models.model_base_config import ModelBaseConfig
 
 
 class ReadManyFilesTool:
     """ReadManyFiles tool implementation"""
     
-    def __init__(self, target_dir: Optional[str] = None):
+    def __init__(self, target_dir: Optional[str] = None,
+                 model_config: Optional[ModelBaseConfig] = None):
         """
         Initialize ReadManyFiles tool
         
         Args:
             target_dir: Target directory for file operations (defaults to current working directory)
+            model_config: Model the content is sent to; its context window bounds the output
         """
         self.target_dir = target_dir or os.getcwd()
+        self.model_config = model_config
         self.file_processor = FileProcessor(self.target_dir)
         self.file_filter = FileFilter(self.target_dir)
         self.formatter = ResultFormatter(self.target_dir)
@@ -107,43 +112,55 @@ class ReadManyFilesTool:
             
             exclusion_patterns = self.file_filter.build_exclusion_patterns(params)
             
-            # 4. Execute file search
-            all_files = await self.file_processor.search_files_with_glob(
+            # 4. Stream file search results through the ignore filters and
+            # security validation, reading files as they are discovered
+            filter_counts: Dict[str, int] = {}
+            matching_files = self.file_processor.iter_matching_files(
                 search_patterns, exclusion_patterns, signal
             )
+            validated_files = self.file_filter.iter_filtered_files(
+                matching_files, file_filtering_options, filter_counts
+            )
             
-            if not all_files:
+            # 5. Read file contents
+            content_parts, processed_files, skipped_files = await self.file_processor.process_file_stream(
+                validated_files, params.paths
+            )
+            # Files are read in discovery order; report them sorted by path
+            if processed_files:
+                ordered = sorted(zip(processed_files, content_parts), key=lambda pair: pair[0])
+                processed_files = [path for path, _ in ordered]
+                content_parts = [part for _, part in ordered]
+            
+            self.file_processor.stats.total_files_found = filter_counts['found']
+            if not filter_counts['found']:
                 return ToolResult(**self.formatter.create_info_result(
                     "No files found matching the specified patterns"
                 ))
             
-            # 5. Apply ignore filters
-            filtered_files, filter_counts = self.file_filter.apply_gitignore_filters(
-                all_files, file_filtering_options
-            )
-            
-            # 6. Security validation
-            validated_files = self.file_filter.validate_workspace_security(filtered_files)
-            
-            if not validated_files:
+            if not processed_files and not skipped_files:
                 return ToolResult(**self.formatter.create_info_result(
                     "No files remain after filtering and security validation"
                 ))
             
-            # 7. Read file contents
-            content_parts, processed_files, skipped_files = await self.file_processor.process_files(
-                validated_files, params.paths
-            )
+            # 6. Fit the contents into the token budget
+            token_budget = params.token_budget or ContentPacker.budget_for_model(self.model_config)
+            if token_budget:
+                packed = ContentPacker(self.target_dir, token_budget).pack(
+                    content_parts, processed_files, params.paths
+                )
+                content_parts = packed.content_parts
+                skipped_files.extend(packed.build_skip_info())
             
-            # 8. Add filter statistics to skipped files
+            # 7. Add filter statistics to skipped files
             filter_skip_info = self.formatter.build_filter_skip_info(filter_counts)
             skipped_files.extend(filter_skip_info)
             
-            # 9. Update processing time
+            # 8. Update processing time
             end_time = time.time()
             self.file_processor.stats.processing_time = end_time - start_time
             
-            # 10. Build and return result
+            # 9. Build and return result
             result_dict = self.formatter.build_result(
                 content_parts, processed_files, skipped_files, self.file_processor.stats
             )
@@ -159,7 +176,8 @@ class ReadManyFilesTool:
 # Main function for tool execution
 async def read_many_files(params: ReadManyFilesParams, 
                          target_dir: Optional[str] = None,
-                         signal=None) -> ToolResult:
+                         signal=None,
+                         model_config: Optional[ModelBaseConfig] = None) -> ToolResult:
     """
     Read multiple files based on glob patterns
     
@@ -167,11 +185,12 @@ async def read_many_files(params: ReadManyFilesParams,
         params: ReadManyFilesParams object with tool parameters
         target_dir: Target directory for file operations (optional)
         signal: Cancellation signal (optional)
+        model_config: Model the content is sent to (optional)
         
     Returns:
         ToolResult object with processing results
     """
-    tool = ReadManyFilesTool(target_dir)
+    tool = ReadManyFilesTool(target_dir, model_config)
     return await tool.execute(params, signal)
 
 
@@ -225,7 +244,7 @@ if __name__ == "__main__":
             if isinstance(content, str):
                 print(content[:200] + "..." if len(content) > 200 else content)
             else:
-                print(f"[Binary content: {content.get('type', 'unknown')}]")
+                print(f"[Binary content: {content}]")
         
         print("\nDisplay Message:")
         print(result.returnDisplay)
@@ -0,0 +1,93 @@
+"""
+Tests for concurrent @ path resolution with a shared workspace listing
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from siada.services.handle_at_command import AtCommandProcessor, HandleAtCommandParams
+from siada.services.handle_at_command.models import ResolverContext
+from siada.services.handle_at_command.resolver import PathResolver
+
+
+class MockConfig:
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+
+
+class TestPathResolver(unittest.IsolatedAsyncioTestCase):
+    """Test suite for PathResolver glob fallback and concurrent resolution"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        for file_path in ["README.md", "src/app.py", "src/utils/helpers.py", "docs/app_guide.md"]:
+            full_path = Path(self.test_dir) / file_path
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            full_path.write_text(f"# {file_path}\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_glob_search_matches_pathlib(self):
+        workspace = Path(self.test_dir).resolve()
+        listing = PathResolver._list_workspace(workspace)
+        for name in ["app", "utils/help", "src/", "READ"]:
+            expected = sorted(str(p.relative_to(workspace)) for p in workspace.glob(f"**/*{name}*"))
+            actual = sorted(p for p in listing if PathResolver._matches_glob_search(p, name))
+            self.assertEqual(expected, actual, name)
+
+    async def test_workspace_is_listed_once(self):
+        resolver = PathResolver(ResolverContext(
+            workspace_directories=[self.test_dir],
+            target_directory=self.test_dir
+        ))
+        calls = []
+        original = PathResolver._list_workspace
+
+        def counting(workspace_path):
+            calls.append(workspace_path)
+            return original(workspace_path)
+
+        resolver._list_workspace = counting
+        results = await asyncio.gather(
+            resolver.resolve_path("@helpers"),
+            resolver.resolve_path("@app_guide"),
+            resolver.resolve_path("@missing"),
+        )
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results[0].resolved_path, os.path.join("src", "utils", "helpers.py"))
+        self.assertEqual(results[1].resolved_path, os.path.join("docs", "app_guide.md"))
+        self.assertIsNone(results[2].resolved_path)
+
+    async def test_processor_keeps_query_order(self):
+        processor = AtCommandProcessor()
+        params = HandleAtCommandParams(
+            query="compare @helpers with @README.md and @nothing_here",
+            config=MockConfig(self.test_dir),
+            add_item=Mock(),
+            on_debug_message=Mock(),
+            message_id=1
+        )
+
+        result = await processor.handle_at_command(params)
+
+        self.assertTrue(result.should_proceed)
+        self.assertEqual(
+            result.processed_query[0]['text'],
+            "compare @src/utils/helpers.py with @README.md and @nothing_here"
+        )
+        self.assertEqual(processor.stats.resolved_paths, 2)
+        self.assertEqual(processor.stats.failed_paths, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
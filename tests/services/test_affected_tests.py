@@ -0,0 +1,97 @@
+"""
+Tests for mapping working-tree changes to affected tests.
+"""
+
+import subprocess
+
+import pytest
+
+from siada.foundation.tools.get_git_diff import GitDiffUtil
+from siada.services.affected_tests import TestImpactAnalyzer
+from siada.tools.coder.file_search.trigram_index import TrigramIndex
+
+
+class TestAffectedTestSelection:
+    """Selections over a package "app" with a tests directory"""
+
+    @pytest.fixture(autouse=True)
+    def setup_project(self, tmp_path):
+        (tmp_path / "app").mkdir()
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "app" / "__init__.py").write_text("")
+        (tmp_path / "app" / "models.py").write_text("class Model:\n    pass\n")
+        (tmp_path / "app" / "service.py").write_text("from app.models import Model\n")
+        (tmp_path / "app" / "cli.py").write_text("import sys\n")
+        (tmp_path / "app" / "orphan.py").write_text("")
+        (tmp_path / "app" / "helpers.py").write_text("")
+        (tmp_path / "app" / "tool.py").write_text("from app.helpers import *\n")
+        (tmp_path / "tests" / "test_service.py").write_text("from app.service import *\n")
+        (tmp_path / "tests" / "test_cli.py").write_text("import subprocess\n")
+        (tmp_path / "tests" / "test_other.py").write_text("")
+        (tmp_path / "tests" / "test_more.py").write_text("")
+        (tmp_path / "README.md").write_text("docs\n")
+        self.root = tmp_path
+        self.analyzer = TestImpactAnalyzer(str(tmp_path))
+
+    def test_changed_module_selects_importing_and_named_tests(self):
+        """Tests importing a module, or named after it, are selected; docs and artifacts are ignored"""
+        selection = self.analyzer.select(["app/models.py"])
+        assert not selection.full_run
+        assert selection.tests == ["tests/test_service.py"]
+
+        selection = self.analyzer.select(["app/cli.py", "README.md", "app/__pycache__/cli.cpython-312.pyc"])
+        assert selection.tests == ["tests/test_cli.py"]
+
+    def test_untracked_script_selects_no_tests(self):
+        """An untracked script outside any package, like a reproduction script, does not widen the selection"""
+        (self.root / "reproduce_issue.py").write_text("from app.models import Model\n")
+
+        selection = self.analyzer.select(["reproduce_issue.py"], untracked_files=["reproduce_issue.py"])
+        assert not selection.full_run
+        assert selection.tests == []
+
+        selection = self.analyzer.select(["app/models.py", "reproduce_issue.py", f"{TrigramIndex.INDEX_DIR}/index.db"],
+                                         untracked_files=["reproduce_issue.py"])
+        assert selection.tests == ["tests/test_service.py"]
+
+    def test_unimported_modules_fall_back_to_full_run(self):
+        """Tracked modules, and untracked ones in a package, may be loaded dynamically"""
+        selection = self.analyzer.select(["app/orphan.py"])
+        assert selection.full_run
+        assert "no test imports" in selection.reason
+
+        selection = self.analyzer.select(["app/orphan.py"], untracked_files=["app/orphan.py"])
+        assert selection.full_run
+
+    def test_changed_test_selects_itself(self):
+        """A changed test file is selected, given as an absolute path"""
+        selection = self.analyzer.select([str(self.root / "tests" / "test_other.py")])
+        assert selection.tests == ["tests/test_other.py"]
+
+    @pytest.mark.parametrize("changed, reason", [
+        (["app/helpers.py"], "no test imports"),
+        (["tests/conftest.py"], "test configuration"),
+        (["app/data.json"], "non-Python file"),
+        (["app/removed.py"], "module deleted"),
+        ([], "no changed files"),
+    ])
+    def test_uncertain_mappings_fall_back_to_full_run(self, changed, reason):
+        """Changes the mapping cannot trust select the whole suite"""
+        selection = self.analyzer.select(changed)
+        assert selection.full_run
+        assert reason in selection.reason
+
+    def test_changed_files_from_git(self):
+        """Modified and untracked files are reported as absolute paths"""
+        def git(*args):
+            subprocess.run(["git", *args], cwd=self.root, check=True, capture_output=True)
+
+        git("init", "-q")
+        git("-c", "user.name=t", "-c", "user.email=t@t", "add", ".")
+        git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", "init")
+        (self.root / "app" / "models.py").write_text("class Model:\n    x = 1\n")
+        (self.root / "app" / "new.py").write_text("")
+
+        changed = GitDiffUtil.get_changed_files(str(self.root))
+        assert changed == [str(self.root / "app" / "models.py"), str(self.root / "app" / "new.py")]
+        assert GitDiffUtil.get_untracked_files(str(self.root)) == [str(self.root / "app" / "new.py")]
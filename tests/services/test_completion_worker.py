@@ -0,0 +1,87 @@
+"""
+Tests for the debounced background completion worker.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from siada.services.file_recommendation import CompletionWorker
+
+
+class RecordingEngine:
+    """Completion engine double that records the queries it runs"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.queries = []
+        self.threads = set()
+
+    async def get_suggestions(self, text):
+        self.queries.append(text)
+        self.threads.add(threading.current_thread().name)
+        await asyncio.sleep(self.delay)
+        return [{'label': text[1:], 'value': text[1:]}]
+
+
+@pytest.fixture
+def worker_factory():
+    workers = []
+
+    def create(engine, debounce_delay_ms=50):
+        worker = CompletionWorker(engine, debounce_delay_ms)
+        workers.append(worker)
+        return worker
+
+    yield create
+    for worker in workers:
+        worker.stop()
+
+
+def test_keystrokes_are_coalesced(worker_factory):
+    engine = RecordingEngine()
+    worker = worker_factory(engine)
+
+    futures = [worker.submit(text) for text in ["@m", "@ma", "@mai", "@main"]]
+
+    assert futures[-1].result(2) == [{'label': 'main', 'value': 'main'}]
+    assert all(future.cancelled() for future in futures[:-1])
+    assert engine.queries == ["@main"]
+    assert engine.threads == {"completion-worker"}
+
+
+def test_running_query_is_cancelled_by_newer_one(worker_factory):
+    engine = RecordingEngine(delay=0.5)
+    worker = worker_factory(engine, debounce_delay_ms=0)
+
+    first = worker.submit("@slow")
+    time.sleep(0.1)
+    second = worker.submit("@fast")
+
+    assert second.result(2) == [{'label': 'fast', 'value': 'fast'}]
+    assert first.cancelled()
+    assert worker.latest_suggestions() == [{'label': 'fast', 'value': 'fast'}]
+
+
+def test_superseded_waiter_returns_without_blocking(worker_factory):
+    engine = RecordingEngine()
+    worker = worker_factory(engine, debounce_delay_ms=200)
+    results = {}
+
+    waiter = threading.Thread(target=lambda: results.setdefault("old", worker.get_suggestions("@old")))
+    waiter.start()
+    time.sleep(0.05)
+    started = time.monotonic()
+    worker.submit("@new")
+    waiter.join(2)
+
+    assert results["old"] == []
+    assert time.monotonic() - started < 0.15
+
+
+def test_sync_queries_skip_debounce(worker_factory):
+    worker = worker_factory(RecordingEngine(), debounce_delay_ms=10_000)
+
+    assert worker.get_suggestions("@x", debounce=False, timeout=2) == [{'label': 'x', 'value': 'x'}]
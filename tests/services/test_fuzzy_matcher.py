@@ -0,0 +1,52 @@
+"""
+Tests for fzf-style fuzzy ranking of file suggestions.
+"""
+
+from siada.services.file_recommendation.core.fuzzy_matcher import (
+    compile_subsequence_pattern,
+    fuzzy_score,
+    rank_paths,
+)
+from siada.services.file_recommendation.core.path_index import PathIndex, _Snapshot
+
+
+def test_subsequence_required():
+    assert fuzzy_score("fcm", "src/file_completion_manager.py") is not None
+    assert fuzzy_score("mcf", "src/file_completion_manager.py") is None
+
+
+def test_segment_starts_beat_scattered_matches():
+    assert fuzzy_score("fcm", "src/file_completion_manager.py") > fuzzy_score("fcm", "src/afcxm.py")
+    assert fuzzy_score("ce", "core/completion_engine.py") > fuzzy_score("ce", "core/place.py")
+
+
+def test_camel_case_humps():
+    assert fuzzy_score("fb", "src/fooBar.ts") > fuzzy_score("fb", "src/foobar.ts")
+
+
+def test_basename_hits_beat_directory_hits():
+    assert fuzzy_score("engine", "src/engine_core/utils.py") < fuzzy_score("engine", "src/utils/engine.py")
+
+
+def test_rank_paths_keeps_best_first():
+    paths = ["docs/main_notes.md", "main.py", "src/domain.py", "tests/test_main.py"]
+    ranked = rank_paths("main", paths, limit=3)
+
+    assert [path for _, path in ranked] == ["main.py", "docs/main_notes.md", "tests/test_main.py"]
+
+
+def test_subsequence_pattern_finds_whole_lines():
+    blob = "src/app.py\ndocs/guide.md\nsrc/utils/helpers.py"
+    assert compile_subsequence_pattern("sup").findall(blob) == ["src/utils/helpers.py"]
+
+
+def test_index_fuzzy_search_ranks_whole_index():
+    entries = {f"pkg/module_{i}.py": False for i in range(5000)}
+    entries.update({"pkg": True, "deep/a/b/c/completion_engine.py": False})
+    index = PathIndex.__new__(PathIndex)
+    index._snapshot = _Snapshot(entries)
+
+    results = index.fuzzy_search("cmpeng", max_results=5)
+
+    # The best match is found even though it sorts after thousands of other paths
+    assert results[0][0] == "deep/a/b/c/completion_engine.py"
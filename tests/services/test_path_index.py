@@ -0,0 +1,110 @@
+"""
+Tests for the in-memory path index used by @ completion.
+"""
+
+import time
+
+import pytest
+
+from siada.foundation.workspace_generation import bump_generation
+from siada.services.file_recommendation import FileDiscoveryService, FilterOptions
+from siada.services.file_recommendation.core.path_index import PathIndex
+
+
+def _paths(results):
+    return [path for path, _ in results]
+
+
+class TestPathIndex:
+    """Searches over a small project with hidden and skipped directories"""
+
+    @pytest.fixture(autouse=True)
+    def setup_project(self, tmp_path):
+        for path in [
+            "README.md",
+            "main.py",
+            "src/app.py",
+            "src/utils/helpers.py",
+            "src/utils/Main_helpers.py",
+            "node_modules/pkg/index.js",
+            ".hidden/secret.txt",
+            ".env",
+        ]:
+            full_path = tmp_path / path
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            full_path.write_text(path)
+        self.root = tmp_path
+        self.index = PathIndex(str(tmp_path), respect_git_ignore=False)
+        self.index.start()
+        assert self.index.wait_until_ready(5)
+
+    def test_name_prefix_matches_come_first(self):
+        """Names starting with the query rank above other matches"""
+        results = self.index.search("main")
+
+        assert _paths(results)[:2] == ["main.py", "src/utils/Main_helpers.py"]
+        assert "src/utils/helpers.py" not in _paths(results)
+
+    def test_substring_matches_and_directories(self):
+        """Directories are reported and flagged as such"""
+        results = dict(self.index.search("util"))
+
+        assert results["src/utils"] is True
+        assert results["src/utils/helpers.py"] is False
+
+    def test_scope_and_limits(self):
+        """A scope directory and max_results narrow the results"""
+        assert _paths(self.index.search("", "src/utils")) == ["src/utils/Main_helpers.py", "src/utils/helpers.py"]
+        assert _paths(self.index.search("app", "src/utils")) == []
+        assert len(self.index.search("", max_results=2)) == 2
+
+    def test_hidden_entries_and_skipped_directories(self):
+        """Hidden entries need a dotted query; hidden directories and node_modules are not entered"""
+        assert ".env" not in _paths(self.index.search("env"))
+        assert ".env" in _paths(self.index.search(".e"))
+        assert "node_modules" in _paths(self.index.search("node"))
+        assert self.index.search("index.js") == []
+        assert self.index.search("secret") == []
+
+    def test_updates_from_workspace_changes(self):
+        """Generation bumps add and remove paths"""
+        (self.root / "src" / "new_module.py").write_text("x = 1\n")
+        (self.root / "main.py").unlink()
+        bump_generation([str(self.root / "src" / "new_module.py"), str(self.root / "main.py")])
+        assert self.index.wait_until_idle(5)
+
+        assert _paths(self.index.search("new_mod")) == ["src/new_module.py"]
+        assert "main.py" not in _paths(self.index.search("main"))
+
+    def test_discovery_service_ranks_through_index(self):
+        """FileDiscoveryService answers ranked lookups from the index"""
+        service = FileDiscoveryService(str(self.root))
+        options = FilterOptions(respect_git_ignore=False)
+        service.get_path_index(options).wait_until_ready(5)
+
+        matches = service.find_files_ranked(str(self.root / "src"), "help", options)
+
+        assert [label for label, _ in matches] == ["src/utils/helpers.py", "src/utils/Main_helpers.py"]
+
+
+class TestPathIndexPerformance:
+    """Query latency on a tree of 10,000 files"""
+
+    def test_query_is_fast_on_large_trees(self, tmp_path):
+        """A query takes under 5 ms on average"""
+        for d in range(100):
+            directory = tmp_path / f"pkg_{d}"
+            directory.mkdir()
+            for f in range(100):
+                (directory / f"module_{f}.py").touch()
+        index = PathIndex(str(tmp_path), respect_git_ignore=False)
+        index.start()
+        assert index.wait_until_ready(5)
+
+        start = time.perf_counter()
+        for _ in range(100):
+            index.search("module_5", max_results=50)
+        elapsed = (time.perf_counter() - start) / 100
+
+        assert len(index.search("module_5", max_results=50)) == 50
+        assert elapsed < 0.005
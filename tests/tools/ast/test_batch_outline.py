@@ -0,0 +1,84 @@
+"""
+Tests for the batch outline of many source files.
+"""
+
+import builtins
+
+import pytest
+
+from siada.tools.ast.batch_outline import BatchOutliner
+
+
+@pytest.fixture
+def package(tmp_path):
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / "alpha.py").write_text("class Alpha:\n    def run(self):\n        return 1\n")
+    (tmp_path / "pkg" / "beta.py").write_text("def beta():\n    return Alpha()\n")
+    (tmp_path / "pkg" / "empty.py").write_text("")
+    (tmp_path / "pkg" / "notes.txt").write_text("not code\n")
+    (tmp_path / "pkg" / "sub" / "gamma.py").write_text("def gamma():\n    pass\n")
+    return tmp_path
+
+
+def outline(root, path, **kwargs):
+    outliner = BatchOutliner(str(root), **kwargs)
+    try:
+        return outliner.outline(path)
+    finally:
+        outliner.close()
+
+
+def test_directory_outlines_top_level_files(package):
+    result = outline(package, "pkg")
+
+    content = str(result)
+    assert "File: pkg/alpha.py" in content
+    assert "File: pkg/beta.py" in content
+    assert content.index("pkg/alpha.py") < content.index("pkg/beta.py")
+    assert "gamma" not in content
+    assert "notes.txt" not in content
+    assert "1 file(s) without code definitions" in content
+    assert result.outlined_files == 2
+
+
+def test_recursive_glob(package):
+    content = str(outline(package, "pkg/**/*.py"))
+
+    assert "File: pkg/sub/gamma.py" in content
+    assert "File: pkg/alpha.py" in content
+
+
+def test_each_file_is_read_once_and_cached_tags_are_reused(package, monkeypatch):
+    opened = []
+    real_open = builtins.open
+
+    def counting_open(file, *args, **kwargs):
+        if str(file).endswith(".py"):
+            opened.append(str(file))
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", counting_open)
+    first = str(outline(package, "pkg/alpha.py"))
+    assert opened == [str(package / "pkg" / "alpha.py")]
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("fresh cache entry was reparsed")
+
+    monkeypatch.setattr("siada.tools.ast.batch_outline.get_tags_raw", fail_parse)
+    assert str(outline(package, "pkg/alpha.py")) == first
+
+
+def test_token_budget_lists_omitted_files(package):
+    result = outline(package, "pkg/**/*.py", token_budget=40)
+
+    content = str(result)
+    assert "File: pkg/alpha.py" in content
+    assert "to stay within the token budget" in content
+    assert "- pkg/sub/gamma.py" in content
+    assert result.omitted_files >= 1
+
+
+def test_no_matching_files(package):
+    result = outline(package, "missing/*.py")
+    assert "No source files" in str(result)
+    assert result.outlined_files == 0
@@ -0,0 +1,94 @@
+"""
+Tests for the Python import graph.
+"""
+
+import pytest
+
+from siada.foundation.workspace_generation import bump_generation
+from siada.tools.ast.import_graph import ImportGraph, ImportRef, extract_imports, import_graph
+
+
+class TestExtractImports:
+    """Import extraction from Python source"""
+
+    def test_all_import_forms(self):
+        """Aliases, relative and wildcard imports and nested imports are extracted"""
+        source = (
+            b"import os, a.b as c\n"
+            b"from .. pkg import (x as y, z)\n"
+            b"from m import *\n"
+            b"def f():\n    import inner\n"
+        )
+        assert extract_imports(source) == (
+            ImportRef("os", None, 0),
+            ImportRef("a.b", None, 0),
+            ImportRef("pkg", ("x", "z"), 2),
+            ImportRef("m", ("*",), 0),
+            ImportRef("inner", None, 0),
+        )
+
+
+class TestImportGraph:
+    """Graph of a src-layout package "app" and a scripts directory"""
+
+    @pytest.fixture(autouse=True)
+    def setup_project(self, tmp_path):
+        app = tmp_path / "src" / "app"
+        (app / "api").mkdir(parents=True)
+        (tmp_path / "scripts").mkdir()
+        (app / "__init__.py").write_text("")
+        (app / "core.py").write_text("import os\nfrom app.util import helper\n")
+        (app / "util.py").write_text("from . import models\n")
+        (app / "models.py").write_text("import json\n")
+        (app / "api" / "__init__.py").write_text("from ..core import run\nfrom app import util\n")
+        (tmp_path / "scripts" / "run.py").write_text("import tool\nimport app.core\n")
+        (tmp_path / "scripts" / "tool.py").write_text("")
+        self.root = tmp_path
+        self.graph = ImportGraph(str(tmp_path))
+
+    def test_resolves_absolute_relative_and_src_layout_imports(self):
+        """Modules are found by path, by dotted name and inside the src layout"""
+        assert self.graph.dependencies("src/app/core.py") == ["src/app/util.py"]
+        assert self.graph.external_imports("src/app/core.py") == ["os"]
+        assert self.graph.dependencies("app.util") == ["src/app/models.py"]
+        assert self.graph.dependencies("src/app/api") == ["src/app/core.py", "src/app/util.py"]
+        assert self.graph.dependencies("scripts/run.py") == ["scripts/tool.py", "src/app/core.py"]
+
+    def test_dependents_and_transitive_walks(self):
+        """Dependents are listed directly or transitively"""
+        assert self.graph.dependents("app.models") == ["src/app/util.py"]
+        assert self.graph.dependents("app.models", transitive=True) == [
+            "scripts/run.py", "src/app/api/__init__.py", "src/app/core.py", "src/app/util.py",
+        ]
+        assert self.graph.dependencies("scripts/run.py", transitive=True)[-1] == "src/app/util.py"
+
+    def test_updates_incrementally(self, monkeypatch):
+        """Only the file reported by a generation bump is parsed again"""
+        assert self.graph.dependents("app.models") == ["src/app/util.py"]
+
+        parsed = []
+
+        def counting_extract(source):
+            parsed.append(source)
+            return extract_imports(source)
+
+        monkeypatch.setattr("siada.tools.ast.import_graph.extract_imports", counting_extract)
+        (self.root / "src" / "app" / "core.py").write_text("from app.models import Model\n")
+        bump_generation([str(self.root / "src" / "app" / "core.py")])
+
+        assert self.graph.dependents("app.models") == ["src/app/core.py", "src/app/util.py"]
+        assert len(parsed) == 1
+
+    def test_unknown_module(self):
+        """An unknown module resolves to nothing"""
+        assert self.graph.resolve("not.a.module") is None
+        assert self.graph.dependencies("not.a.module") == []
+
+
+class TestImportGraphTool:
+    """Schema of the import_graph tool"""
+
+    def test_schema_limits_direction(self):
+        """direction only accepts the supported values"""
+        direction = import_graph.params_json_schema["properties"]["direction"]
+        assert direction["enum"] == ["dependencies", "dependents", "both"]
@@ -0,0 +1,115 @@
+"""
+Tests for the BM25 index behind lexical_search.
+"""
+
+import pytest
+
+from siada.foundation.workspace_generation import bump_generation
+from siada.tools.ast.lexical_search import (
+    Chunk,
+    LexicalIndex,
+    LexicalSearchResult,
+    split_chunks,
+    tokenize,
+)
+
+
+class TestTokenize:
+    """Splitting text into search terms"""
+
+    def test_splits_identifiers(self):
+        """camelCase and snake_case parts are terms, next to the whole identifier"""
+        terms = tokenize("parseConfigFile HTTPServer retry_requests")
+
+        assert "parseconfigfile" in terms
+        assert {"pars", "config", "fil", "http", "server", "retry", "request"} <= set(terms)
+
+    def test_drops_noise_and_stems(self):
+        """Stopwords, keywords, short and numeric parts are dropped; verb forms share a stem"""
+        assert tokenize("def the a 42 x") == []
+        assert set(tokenize("parsing parsed parses")) == {"pars"}
+
+
+class TestSplitChunks:
+    """Cutting files into chunks"""
+
+    def test_chunks_start_at_definitions(self):
+        """Lines before the first definition form a chunk of their own"""
+        chunks = split_chunks(10, [(2, "first"), (6, "second")])
+        assert chunks == [Chunk(0, 2, ""), Chunk(2, 6, "first"), Chunk(6, 10, "second")]
+
+    def test_windows_and_long_chunks(self):
+        """Files without definitions use windows; long chunks are split"""
+        assert split_chunks(120, [], window=50) == [Chunk(0, 50, ""), Chunk(50, 100, ""), Chunk(100, 120, "")]
+        assert split_chunks(5, [(0, "long")], max_lines=2) == [
+            Chunk(0, 2, "long"), Chunk(2, 4, "long"), Chunk(4, 5, "long"),
+        ]
+
+
+class TestLexicalIndex:
+    """Searches over a config loader with an HTTP client and a shapes module"""
+
+    @pytest.fixture(autouse=True)
+    def setup_project(self, tmp_path):
+        (tmp_path / "config_loader.py").write_text(
+            "import json\n"
+            "\n"
+            "\n"
+            "def parse_config_file(path):\n"
+            "    with open(path) as f:\n"
+            "        return json.load(f)\n"
+            "\n"
+            "\n"
+            "class HttpClient:\n"
+            "    def retryRequest(self, url):\n"
+            "        # Retry the request until the server answers\n"
+            "        return url\n"
+        )
+        (tmp_path / "shapes.py").write_text(
+            "def circle_area(radius):\n"
+            "    return 3.14 * radius * radius\n"
+        )
+        self.root = tmp_path
+        self.index = LexicalIndex(str(tmp_path))
+
+    def test_ranks_definition_chunks(self):
+        """The chunk of the matching definition ranks first"""
+        hits = self.index.search("parse config file")
+        assert hits[0].rel_fname == "config_loader.py"
+        assert hits[0].chunk.name == "parse_config_file"
+
+        hits = self.index.search("retry request")
+        assert hits[0].chunk.name == "retryRequest"
+
+        assert self.index.search("nonexistentword") == []
+        assert self.index.search("area", file_pattern="config*") == []
+
+    def test_follows_edits(self):
+        """Files reported by a generation bump are reindexed"""
+        assert self.index.search("triangle") == []
+
+        (self.root / "shapes.py").write_text("def triangle_area(base, height):\n    return base * height / 2\n")
+        bump_generation([str(self.root / "shapes.py")])
+
+        hits = self.index.search("triangle")
+        assert [(hit.rel_fname, hit.chunk.name) for hit in hits] == [("shapes.py", "triangle_area")]
+        assert self.index.search("circle radius") == []
+
+    def test_reuses_cached_chunks(self, monkeypatch):
+        """A new index reads unchanged files' chunks from the on-disk cache"""
+        self.index.search("config")
+        index = LexicalIndex(str(self.root))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("file analyzed again")
+
+        monkeypatch.setattr(index, "_analyze", fail)
+        assert index.search("parse config")[0].chunk.name == "parse_config_file"
+
+    def test_result_lists_chunks_with_source(self):
+        """Each hit is shown with its range, name and first lines"""
+        content = LexicalSearchResult(self.index.root, "circle", self.index.search("circle")).content
+
+        assert "shapes.py:1-2 (circle_area)" in content
+        assert "    1| def circle_area(radius):" in content
+        assert "No code matches" in LexicalSearchResult(self.index.root, "x", []).content
@@ -0,0 +1,81 @@
+"""
+Tests for the parse tree cache and incremental reparsing.
+"""
+
+import random
+
+import pytest
+
+from siada.tools.ast.ast_tool import get_scm_fname
+from siada.tools.ast.parse_cache import ParseTreeCache, diff_range
+
+QUERY = get_scm_fname("python").read_text()
+
+
+def generated_module(functions):
+    return "".join(
+        f"def function_{i}(value):\n    return helper_{i}(value)\n\n\n" for i in range(functions)
+    )
+
+
+def full_captures(code):
+    return ParseTreeCache().captures("module.py", "python", QUERY, code)
+
+
+def test_diff_range():
+    assert diff_range(b"abcdef", b"abXYef") == (2, 4, 4)
+    assert diff_range(b"aaa", b"aaaa") == (3, 3, 4)
+    assert diff_range(b"same", b"same") == (4, 4, 4)
+
+
+def test_unchanged_content_is_a_hit():
+    cache = ParseTreeCache()
+    code = generated_module(3)
+
+    first = cache.captures("module.py", "python", QUERY, code)
+    assert cache.captures("module.py", "python", QUERY, code) == first
+    assert cache.full_parses == 1
+    assert cache.incremental_parses == 0
+
+
+def test_recorded_edit_reparses_incrementally():
+    cache = ParseTreeCache()
+    old = generated_module(50)
+    cache.captures("module.py", "python", QUERY, old)
+
+    new = old.replace("def function_10(value):\n", "def renamed(value):\n    pass\n\n\ndef extra():\n")
+    cache.record_edit("module.py", old, new)
+    captures = cache.captures("module.py", "python", QUERY, new)
+
+    assert cache.full_parses == 1
+    assert cache.incremental_parses == 1
+    assert captures == full_captures(new)
+    names = {capture.name for capture in captures if capture.kind == "def"}
+    assert "renamed" in names and "extra" in names and "function_10" not in names
+
+
+def test_edit_mismatching_the_cached_version_is_dropped():
+    cache = ParseTreeCache()
+    code = generated_module(2)
+    cache.captures("module.py", "python", QUERY, code)
+
+    cache.record_edit("module.py", "something else", code + "x = 1\n")
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_edits_match_full_parse(seed):
+    rng = random.Random(seed)
+    cache = ParseTreeCache()
+    code = generated_module(30)
+    cache.captures("module.py", "python", QUERY, code)
+    snippets = ["def inserted():\n    pass\n", "class Box:\n", "    x = call(y)\n", '"""', "", "\n"]
+
+    for _ in range(20):
+        start = rng.randrange(len(code) + 1)
+        end = min(len(code), start + rng.randrange(40))
+        new = code[:start] + rng.choice(snippets) + code[end:]
+        if rng.random() < 0.5:
+            cache.record_edit("module.py", code, new)
+        code = new
+        assert cache.captures("module.py", "python", QUERY, code) == full_captures(code)
@@ -0,0 +1,70 @@
+"""
+Tests for the symbol index behind find_definition and find_references.
+"""
+
+import pytest
+
+from siada.foundation.workspace_generation import bump_generation
+from siada.tools.ast.symbol_index import BloomFilter, SymbolIndex, SymbolLookupResult
+
+
+class TestBloomFilter:
+    """Membership checks of the Bloom filter"""
+
+    def test_has_no_false_negatives(self):
+        """Every added item is found, and few others are"""
+        bloom = BloomFilter(capacity=1000)
+        words = [f"name_{i}" for i in range(1000)]
+        for word in words:
+            bloom.add(word)
+
+        assert all(word in bloom for word in words)
+        false_positives = sum(f"other_{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+
+class TestSymbolIndex:
+    """Lookups over a project where main.py uses the Circle class of shapes.py"""
+
+    @pytest.fixture(autouse=True)
+    def setup_project(self, tmp_path):
+        (tmp_path / "shapes.py").write_text(
+            "class Circle:\n"
+            "    def area(self):\n"
+            "        return 3.14\n"
+        )
+        (tmp_path / "main.py").write_text(
+            "from shapes import Circle\n"
+            "\n"
+            "# Circle in a comment\n"
+            "print(Circle().area())\n"
+        )
+        self.root = tmp_path
+        self.index = SymbolIndex(str(tmp_path))
+
+    def test_definitions_and_references(self):
+        """Definitions and references are told apart; comments are not references"""
+        assert [(loc.rel_fname, loc.line) for loc in self.index.find_definitions("Circle")] == [("shapes.py", 0)]
+        references = self.index.find_references("Circle")
+        assert {loc.rel_fname for loc in references} == {"main.py"}
+        assert 2 not in {loc.line for loc in references}
+        assert self.index.find_definitions("Missing") == []
+
+    def test_follows_edits(self):
+        """Files reported by a generation bump are reindexed"""
+        assert self.index.find_definitions("Square") == []
+
+        (self.root / "square.py").write_text("class Square:\n    pass\n")
+        (self.root / "shapes.py").write_text("def unrelated():\n    pass\n")
+        bump_generation([str(self.root / "square.py"), str(self.root / "shapes.py")])
+
+        assert [loc.rel_fname for loc in self.index.find_definitions("Square")] == ["square.py"]
+        assert self.index.find_definitions("Circle") == []
+
+    def test_result_shows_source_lines(self):
+        """Each location is shown with its source line"""
+        result = SymbolLookupResult(self.index.root, "Circle", "def", self.index.find_definitions("Circle"))
+
+        assert "shapes.py:1: class Circle:" in str(result)
+        empty = SymbolLookupResult(self.index.root, "Nope", "def", [])
+        assert "No definitions of `Nope`" in str(empty)
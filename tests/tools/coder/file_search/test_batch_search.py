@@ -0,0 +1,114 @@
+"""
+Tests for the single-pass batch regex search.
+"""
+
+import asyncio
+import shutil
+import warnings
+
+import pytest
+
+from siada.tools.coder.file_search.batch_search import RipgrepBatchSearcher, SearchQuery
+from siada.tools.coder.file_search.search import RipgrepSearcher
+
+pytestmark = pytest.mark.skipif(shutil.which("rg") is None, reason="ripgrep binary not available")
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "a.py").write_text("def alpha():\n    return beta()\n\ndef beta():\n    pass\n")
+    (tmp_path / "b.js").write_text("function alpha() {}\n")
+    return tmp_path
+
+
+def _run(searcher, directory, queries, **kwargs):
+    return asyncio.run(searcher.search(str(directory), queries, cwd=str(directory), **kwargs))
+
+
+def test_results_are_split_per_query(workspace):
+    queries = [
+        SearchQuery(regex=r"def alpha", file_pattern="*.py"),
+        SearchQuery(regex=r"beta", file_pattern="*.py"),
+        SearchQuery(regex=r"alpha", file_pattern="*.js"),
+    ]
+    result = _run(RipgrepBatchSearcher(), workspace, queries)
+
+    lines = [[r.line for r in query_result.search_results] for query_result in result.results]
+    assert lines == [[1], [2, 4], [1]]
+    assert result.results[2].search_results[0].file_path.endswith("b.js")
+    assert "=== Query 3" in str(result)
+
+
+def test_queries_sharing_a_glob_use_one_rg_process(workspace, monkeypatch):
+    searcher = RipgrepBatchSearcher()
+    calls = []
+    original = RipgrepSearcher._stream_ripgrep
+
+    def counting_stream(self, args):
+        calls.append(args)
+        return original(self, args)
+
+    monkeypatch.setattr(RipgrepSearcher, "_stream_ripgrep", counting_stream)
+    _run(searcher, workspace, [SearchQuery(regex="alpha", file_pattern="*.py"),
+                               SearchQuery(regex="beta", file_pattern="*.py")])
+    assert len(calls) == 1
+    assert calls[0].count("-e") == 2
+
+
+def test_per_query_cap(workspace):
+    (workspace / "many.py").write_text("beta\n" * 20)
+    queries = [SearchQuery(regex="beta", file_pattern="*.py"), SearchQuery(regex="def", file_pattern="*.py")]
+    result = _run(RipgrepBatchSearcher(), workspace, queries, max_results_per_query=3)
+
+    assert len(result.results[0].search_results) == 3
+    assert len(result.results[1].search_results) == 2
+
+
+def test_rust_only_syntax_runs_on_its_own(workspace):
+    queries = [SearchQuery(regex=r"\p{Greek}|alpha", file_pattern="*.py"),
+               SearchQuery(regex="beta", file_pattern="*.py")]
+    searcher = RipgrepBatchSearcher()
+    assert searcher._plan_groups(queries) == [[1], [0]]
+
+    result = _run(searcher, workspace, queries)
+    assert [r.line for r in result.results[0].search_results] == [1]
+
+
+def test_pattern_rg_rejects_does_not_fail_its_group(workspace):
+    queries = [SearchQuery(regex="def alpha", file_pattern="*.py"),
+               SearchQuery(regex="return(?= beta)", file_pattern="*.py")]
+    searcher = RipgrepBatchSearcher()
+    assert searcher._plan_groups(queries) == [[0], [1]]
+
+    result = _run(searcher, workspace, queries)
+    assert [r.line for r in result.results[0].search_results] == [1]
+    assert list(result.errors) == [1]
+    assert "Error: ripgrep process error" in str(result)
+    assert "1 failed" in result.format_for_display()
+
+
+def test_failed_group_is_rerun_query_by_query(workspace, monkeypatch):
+    searcher = RipgrepBatchSearcher()
+    # Taken for portable syntax, so it shares the group
+    monkeypatch.setattr("siada.tools.coder.file_search.batch_search.is_portable_regex", lambda regex: True)
+    queries = [SearchQuery(regex="def alpha", file_pattern="*.py"),
+               SearchQuery(regex="return(?= beta)", file_pattern="*.py")]
+    assert searcher._plan_groups(queries) == [[0, 1]]
+
+    result = _run(searcher, workspace, queries)
+    assert [r.line for r in result.results[0].search_results] == [1]
+    assert list(result.errors) == [1]
+
+
+def test_posix_class_is_not_attributed_with_python_re(workspace):
+    (workspace / "c.py").write_text("x1abc\nfoo\n")
+    queries = [SearchQuery(regex="x[[:digit:]]abc", file_pattern="*.py"),
+               SearchQuery(regex="foo", file_pattern="*.py")]
+    searcher = RipgrepBatchSearcher()
+    assert searcher._plan_groups(queries) == [[1], [0]]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        result = _run(searcher, workspace, queries)
+    assert [r.line for r in result.results[0].search_results] == [1]
+    assert [r.line for r in result.results[1].search_results] == [2]
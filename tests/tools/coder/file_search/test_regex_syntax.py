@@ -0,0 +1,46 @@
+"""
+Tests for the regex syntax shared by ripgrep and Python's re.
+"""
+
+import pytest
+
+from siada.tools.coder.file_search.regex_syntax import is_portable_regex
+
+
+class TestIsPortableRegex:
+    """Patterns inside and outside the shared subset"""
+
+    @pytest.mark.parametrize("regex", [
+        "def foo",
+        r"foo\(\)",
+        r"a.*?b",
+        r"(?i)Foo|bar",
+        r"[a-z_]+\d{2,3}",
+        r"\bword\b",
+        r"x[^\]\-]y",
+        r"(?:a|b)+",
+        r"^import \w+$",
+    ])
+    def test_shared_syntax(self, regex):
+        """Literals, classes, quantifiers, groups and a leading i flag are shared"""
+        assert is_portable_regex(regex)
+
+    @pytest.mark.parametrize("regex", [
+        "x[[:digit:]]abc",
+        r"\p{Greek}",
+        "[a[b]]",
+        "[a&&b]",
+        "return(?= bar)",
+        r"(a)\1",
+        "a(?i)b",
+        "(?s).",
+        "(?P<name>a)",
+        "a++",
+        r"\<word",
+        r"\A",
+        "x{",
+        "(a",
+    ])
+    def test_other_syntax(self, regex):
+        """POSIX and Unicode classes, nested classes, lookaround and other flags are not"""
+        assert not is_portable_regex(regex)
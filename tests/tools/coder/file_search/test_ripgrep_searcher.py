@@ -0,0 +1,274 @@
+"""
+Tests for RipgrepSearcher: binary resolution, the shared searcher instance and
+the streaming result pipeline.
+"""
+
+import asyncio
+import json
+import shutil
+
+import pytest
+
+from siada.tools.coder.file_search.search import RipgrepSearcher, RipgrepStreamParser
+
+requires_rg = pytest.mark.skipif(shutil.which("rg") is None, reason="ripgrep binary not available")
+
+
+@pytest.fixture(autouse=True)
+def isolated_binary_cache(tmp_path, monkeypatch):
+    """Point the on-disk binary cache at a temp file and reset shared state."""
+    monkeypatch.setattr(RipgrepSearcher, "BINARY_CACHE_FILE", tmp_path / "ripgrep_binary.json")
+    RipgrepSearcher.reset_instance()
+    yield
+    RipgrepSearcher.reset_instance()
+
+
+@requires_rg
+def test_get_instance_returns_shared_searcher():
+    first = RipgrepSearcher.get_instance()
+    second = RipgrepSearcher.get_instance()
+    assert first is second
+    assert first.rg_path
+
+
+@requires_rg
+def test_resolved_binary_is_cached_in_process(monkeypatch):
+    searcher = RipgrepSearcher()
+
+    def fail_probe(self):
+        raise AssertionError("binary lookup should not be repeated")
+
+    monkeypatch.setattr(RipgrepSearcher, "_find_ripgrep_binary", fail_probe)
+    assert RipgrepSearcher().rg_path == searcher.rg_path
+
+
+@requires_rg
+def test_resolved_binary_is_cached_on_disk(monkeypatch):
+    searcher = RipgrepSearcher()
+    cache = json.loads(RipgrepSearcher.BINARY_CACHE_FILE.read_text())
+    assert cache[RipgrepSearcher._binary_cache_key()] == searcher.rg_path
+
+    # A fresh process only has the disk cache to go on
+    RipgrepSearcher._resolved_binaries.clear()
+    monkeypatch.setattr(RipgrepSearcher, "_find_ripgrep_binary", lambda self: None)
+    assert RipgrepSearcher().rg_path == searcher.rg_path
+
+
+@requires_rg
+def test_cache_is_keyed_by_path(monkeypatch, tmp_path):
+    RipgrepSearcher()
+    key = RipgrepSearcher._binary_cache_key()
+    monkeypatch.setenv("PATH", str(tmp_path))
+    assert RipgrepSearcher._binary_cache_key() != key
+
+
+@requires_rg
+def test_stale_cache_entry_is_revalidated(tmp_path):
+    key = RipgrepSearcher._binary_cache_key()
+    RipgrepSearcher.BINARY_CACHE_FILE.write_text(json.dumps({key: str(tmp_path / "missing-rg")}))
+    searcher = RipgrepSearcher()
+    assert searcher.rg_path != str(tmp_path / "missing-rg")
+    assert json.loads(RipgrepSearcher.BINARY_CACHE_FILE.read_text())[key] == searcher.rg_path
+
+
+def _event(event_type, path, line_number, text):
+    return {
+        "type": event_type,
+        "data": {
+            "path": {"text": path},
+            "line_number": line_number,
+            "lines": {"text": text},
+            "submatches": [{"start": 0}],
+        },
+    }
+
+
+def test_stream_parser_assigns_context_to_the_right_match():
+    parser = RipgrepStreamParser()
+    events = [
+        _event("context", "a.py", 1, "before a\n"),
+        _event("match", "a.py", 2, "match a\n"),
+        _event("context", "a.py", 3, "after a\n"),
+        {"type": "end", "data": {"path": {"text": "a.py"}}},
+        _event("context", "b.py", 9, "before b\n"),
+        _event("match", "b.py", 10, "match b\n"),
+    ]
+    results = []
+    for event in events:
+        results.extend(parser.feed(event))
+    results.extend(parser.finish())
+
+    assert [(r.file_path, r.line) for r in results] == [("a.py", 2), ("b.py", 10)]
+    assert results[0].before_context == ["before a\n"]
+    assert results[0].after_context == ["after a\n"]
+    assert results[1].before_context == ["before b\n"]
+    assert results[1].after_context == []
+
+
+def test_stream_parser_shared_context_line():
+    parser = RipgrepStreamParser()
+    results = []
+    for event in [
+        _event("match", "a.py", 1, "first\n"),
+        _event("context", "a.py", 2, "between\n"),
+        _event("match", "a.py", 3, "second\n"),
+    ]:
+        results.extend(parser.feed(event))
+    results.extend(parser.finish())
+
+    assert results[0].after_context == ["between\n"]
+    assert results[1].before_context == ["between\n"]
+
+
+@requires_rg
+def test_search_stops_at_result_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(RipgrepSearcher, "MAX_RESULTS", 5)
+    (tmp_path / "many.txt").write_text("needle\n" * 50)
+
+    searcher = RipgrepSearcher.get_instance()
+    result = searcher.search_in_files(str(tmp_path), "needle", cwd=str(tmp_path))
+    assert len(result.search_results) == 5
+    assert "Showing results 1-5" in str(result)
+
+
+@requires_rg
+def test_next_page_reads_from_the_spool(tmp_path, monkeypatch):
+    from siada.tools.coder.file_search.pagination import SearchSpool, search_spool_registry
+
+    monkeypatch.setattr(RipgrepSearcher, "MAX_RESULTS", 4)
+    monkeypatch.setattr(SearchSpool, "MAX_RESULTS", 9)
+    (tmp_path / "many.txt").write_text("needle\n" * 20)
+
+    searcher = RipgrepSearcher.get_instance()
+    first = searcher.search_in_files(str(tmp_path), "needle", cwd=str(tmp_path))
+    assert [r.line for r in first.search_results] == [1, 2, 3, 4]
+    assert first.next_cursor and first.next_cursor in str(first)
+
+    spool, offset = search_spool_registry.resolve(first.next_cursor)
+    second = searcher.page_results(spool, offset)
+    assert [r.line for r in second.search_results] == [5, 6, 7, 8]
+
+    third = searcher.page_results(*search_spool_registry.resolve(second.next_cursor))
+    assert [r.line for r in third.search_results] == [9]
+    assert third.next_cursor is None
+    assert "stopped after 9 results" in str(third)
+
+
+@requires_rg
+def test_workspace_change_closes_unfinished_spools(tmp_path, monkeypatch):
+    from siada.foundation.workspace_generation import bump_generation
+    from siada.tools.coder.file_search.pagination import search_spool_registry
+
+    monkeypatch.setattr(RipgrepSearcher, "MAX_RESULTS", 4)
+    (tmp_path / "many.txt").write_text("needle\n" * 20)
+    (tmp_path / "one.txt").write_text("haystack\n")
+
+    searcher = RipgrepSearcher.get_instance()
+    partial = searcher.search_in_files(str(tmp_path), "needle", cwd=str(tmp_path))
+    searcher.search_in_files(str(tmp_path), "haystack", cwd=str(tmp_path))
+    finished = searcher.open_spool(str(tmp_path), "haystack", cwd=str(tmp_path))
+    spool, _ = search_spool_registry.resolve(partial.next_cursor)
+    assert not spool.done and finished.done
+
+    bump_generation([str(tmp_path / "many.txt")])
+
+    # rg is stopped and the cursor expires instead of silently ending early
+    assert spool.done and spool.interrupted
+    assert search_spool_registry.resolve(partial.next_cursor)[0] is None
+    # Spools read to the end keep serving their cursors
+    assert search_spool_registry.contains(finished) and not finished.interrupted
+
+
+def test_expired_cursor_is_reported():
+    from siada.tools.coder.file_search.pagination import search_spool_registry
+
+    assert search_spool_registry.resolve("unknown:300") == (None, 300)
+    assert search_spool_registry.resolve("garbage")[0] is None
+
+
+@requires_rg
+def test_search_without_matches_returns_result_object(tmp_path):
+    (tmp_path / "a.txt").write_text("hello\n")
+    searcher = RipgrepSearcher.get_instance()
+    result = asyncio.run(searcher.search_in_files_async(str(tmp_path), "absent", cwd=str(tmp_path)))
+    assert result.search_results == []
+    assert str(result) == "No results found"
+
+
+@requires_rg
+def test_repeat_search_is_served_from_cache_until_workspace_changes(tmp_path, monkeypatch):
+    from siada.foundation.workspace_generation import bump_generation
+
+    (tmp_path / "a.txt").write_text("needle\n")
+    searcher = RipgrepSearcher.get_instance()
+    first = searcher.search_in_files(str(tmp_path), "needle", cwd=str(tmp_path))
+    assert len(first.search_results) == 1
+
+    def fail_stream(self, args):
+        raise AssertionError("cached search should not run rg")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(RipgrepSearcher, "_stream_ripgrep", fail_stream)
+        repeat = searcher.search_in_files(str(tmp_path), "needle", cwd=str(tmp_path))
+    assert [r.line for r in repeat.search_results] == [1]
+
+    (tmp_path / "b.txt").write_text("needle\n")
+    bump_generation([str(tmp_path / "b.txt")])
+    after_edit = searcher.search_in_files(str(tmp_path), "needle", cwd=str(tmp_path))
+    assert len(after_edit.search_results) == 2
+
+
+@requires_rg
+def test_cached_search_formats_paths_for_each_cwd(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "f.txt").write_text("needle\n")
+    searcher = RipgrepSearcher.get_instance()
+
+    from_root = searcher.search_in_files(str(tmp_path), "needle", cwd=str(tmp_path))
+    from_sub = searcher.search_in_files(str(tmp_path), "needle", cwd=str(tmp_path / "sub"))
+
+    assert "sub/f.txt" in str(from_root)
+    assert "sub/f.txt" not in str(from_sub)
+    assert "f.txt" in str(from_sub)
+
+
+def _result(path, line, match, before=(), after=()):
+    from siada.tools.coder.file_search.search import SearchResult
+    return SearchResult(file_path=path, line=line, column=0, match=match,
+                        before_context=list(before), after_context=list(after))
+
+
+def test_compact_format_merges_overlapping_context():
+    results = [
+        _result("/repo/a.py", 2, "match two\n", ["one\n"], ["three\n"]),
+        _result("/repo/a.py", 3, "three\n", ["match two\n"], ["four\n"]),
+        _result("/repo/a.py", 9, "match nine\n", ["eight\n"], []),
+    ]
+    output = RipgrepSearcher.format_results_compact(results, "/repo")
+    assert output == (
+        "Found 3 results.\n"
+        "\n"
+        "a.py\n"
+        "1-one\n"
+        "2:match two\n"
+        "3:three\n"
+        "4-four\n"
+        "--\n"
+        "8-eight\n"
+        "9:match nine"
+    )
+
+
+def test_compact_format_budget_drops_lowest_ranked_files():
+    results = [_result("/repo/small.py", 1, "x" * 40 + "\n")]
+    results += [_result("/repo/big.py", line, "y" * 40 + "\n") for line in range(1, 4)]
+
+    output = RipgrepSearcher.format_results_compact(results, "/repo", token_budget=40)
+    assert output.index("big.py") < output.index("Omitted")
+    assert "Omitted 1 matches in 1 files to stay within the output budget: small.py (1)" in output
+
+    ranked = RipgrepSearcher.format_results_compact(
+        results, "/repo", token_budget=40, file_ranks={"small.py": 1.0, "big.py": 0.1}
+    )
+    assert ranked.startswith("Found 4 results.\n\nsmall.py\n1:")
+    assert "big.py (3)" in ranked
@@ -0,0 +1,62 @@
+"""
+Tests for ordering search results by repo-map importance.
+"""
+
+import shutil
+
+import pytest
+
+from siada.tools.coder.file_search.ranking import SearchResultRanker
+from siada.tools.coder.file_search.search import RipgrepSearcher, SearchResult
+
+pytestmark = pytest.mark.skipif(shutil.which("rg") is None, reason="ripgrep binary not available")
+
+# networkx needs scipy for PageRank
+pytest.importorskip("scipy")
+
+
+class TestSearchResultRanker:
+    """Ranked searches over a project where core.py is imported by every other module"""
+
+    @pytest.fixture(autouse=True)
+    def setup_project(self, tmp_path):
+        (tmp_path / "aaa_fixture.py").write_text(
+            "# compute_total fixture data\n"
+            "COMPUTE_TOTAL_CASES = ['compute_total']\n"
+        )
+        (tmp_path / "core.py").write_text(
+            "def helper_value():\n"
+            "    return 1\n"
+            "\n"
+            "def compute_total(items):\n"
+            "    return sum(items) + helper_value()\n"
+        )
+        for i in range(3):
+            (tmp_path / f"user_{i}.py").write_text(
+                "from core import compute_total\n"
+                "\n"
+                f"def use_{i}():\n"
+                "    return compute_total([1, 2])\n"
+            )
+        self.root = tmp_path
+
+    def test_central_files_and_definitions_come_first(self):
+        """The definition in the most imported file is the first result"""
+        searcher = RipgrepSearcher.get_instance()
+        result = searcher.search_in_files(
+            str(self.root), "compute_total", cwd=str(self.root), rank_by_importance=True
+        )
+
+        first = result.search_results[0]
+        assert first.file_path.endswith("core.py")
+        assert first.line == 4
+        assert result.file_ranks["core.py"] > result.file_ranks["aaa_fixture.py"]
+
+    def test_ties_keep_rg_order(self):
+        """Files the repo map does not rank keep ripgrep's order"""
+        ranker = SearchResultRanker(str(self.root))
+        results = [
+            SearchResult(str(self.root / "unknown_b.txt"), 1, 0, "x", [], []),
+            SearchResult(str(self.root / "unknown_a.txt"), 1, 0, "x", [], []),
+        ]
+        assert ranker.rank(results) == results
@@ -0,0 +1,94 @@
+"""
+Tests for the trigram index that narrows ripgrep searches.
+"""
+
+import shutil
+import subprocess
+
+import pytest
+
+from siada.foundation.config import settings
+from siada.foundation.workspace_generation import bump_generation
+from siada.tools.coder.file_search.search import RipgrepSearcher
+from siada.tools.coder.file_search.trigram_index import TrigramIndex, build_trigram_query, _trigrams
+
+
+def test_query_for_plain_literal():
+    assert build_trigram_query("hello") == ("tri", _trigrams("hello"))
+
+
+def test_query_for_alternation_and_repeats():
+    query = build_trigram_query(r"(foo_bar|baz_qux)\s+def")
+    assert query == ("and", [
+        ("or", [("tri", _trigrams("foo_bar")), ("tri", _trigrams("baz_qux"))]),
+        ("tri", _trigrams("def")),
+    ])
+    # Optional parts constrain nothing
+    assert build_trigram_query(r"(?:prefix)?xy") is None
+
+
+def test_query_gives_up_on_unanalyzable_regex():
+    assert build_trigram_query(r"\w+") is None
+    assert build_trigram_query(r"\p{Greek}") is None
+    # Non-ASCII literals cannot be case folded by a byte index
+    assert build_trigram_query(r"(?i)été") is None
+    assert build_trigram_query(r"(?i)élan") == ("tri", _trigrams("lan"))
+    # Rust-only syntax that Python misreads
+    assert build_trigram_query("x[[:digit:]]abc") is None
+    assert build_trigram_query("(?s)foo.bar") is None
+
+
+@pytest.mark.skipif(shutil.which("rg") is None or shutil.which("git") is None,
+                    reason="ripgrep and git are required")
+class TestTrigramNarrowing:
+
+    @pytest.fixture
+    def repo(self, tmp_path, monkeypatch):
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        for i in range(20):
+            (tmp_path / f"module_{i}.py").write_text(f"def function_{i}():\n    return {i}\n")
+        (tmp_path / "needle.py").write_text("class NeedleFinder:\n    pass\n")
+        monkeypatch.setattr(settings, "SEARCH_TRIGRAM_INDEX", True)
+        RipgrepSearcher.reset_instance()
+        index = TrigramIndex.for_path(str(tmp_path))
+        index.refresh()
+        return tmp_path
+
+    def test_only_candidate_files_are_searched(self, repo):
+        searcher = RipgrepSearcher.get_instance()
+        paths = searcher.narrow_search_paths(str(repo), ["NeedleFinder"])
+        assert [p.rsplit("/", 1)[-1] for p in paths] == ["needle.py"]
+
+        result = searcher.search_in_files(str(repo), "Needle\\w+", cwd=str(repo))
+        assert [r.line for r in result.search_results] == [1]
+
+    def test_rust_only_syntax_is_not_narrowed(self, repo):
+        (repo / "digits.py").write_text("x1abc = 1\n")
+        bump_generation([str(repo / "digits.py")])
+        searcher = RipgrepSearcher.get_instance()
+
+        assert searcher.narrow_search_paths(str(repo), ["x[[:digit:]]abc"]) is None
+        result = searcher.search_in_files(str(repo), "x[[:digit:]]abc", cwd=str(repo))
+        assert [r.file_path.rsplit("/", 1)[-1] for r in result.search_results] == ["digits.py"]
+
+    def test_no_candidates_skips_rg(self, repo):
+        searcher = RipgrepSearcher.get_instance()
+        assert searcher.narrow_search_paths(str(repo), ["absent_identifier"]) == []
+
+    def test_edits_are_picked_up(self, repo):
+        searcher = RipgrepSearcher.get_instance()
+        (repo / "module_3.py").write_text("NeedleFinder()\n")
+        bump_generation([str(repo / "module_3.py")])
+
+        result = searcher.search_in_files(str(repo), "NeedleFinder", cwd=str(repo))
+        assert sorted(r.file_path.rsplit("/", 1)[-1] for r in result.search_results) == [
+            "module_3.py", "needle.py"
+        ]
+
+    def test_new_untracked_files_after_unknown_change(self, repo):
+        searcher = RipgrepSearcher.get_instance()
+        (repo / "fresh.py").write_text("NeedleFinder\n")
+        bump_generation()
+
+        result = searcher.search_in_files(str(repo), "NeedleFinder", cwd=str(repo))
+        assert len(result.search_results) == 2
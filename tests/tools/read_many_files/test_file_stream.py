@@ -0,0 +1,109 @@
+"""
+Tests for streaming, bounded file processing of ReadManyFiles tool.
+"""
+
+import asyncio
+
+import pytest
+
+from siada.tools.read_many_files.file_processor import FileProcessor
+from siada.tools.read_many_files.models import ReadManyFilesParams
+from siada.tools.read_many_files_tool import ReadManyFilesTool
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    for i in range(30):
+        (tmp_path / f"file_{i:02d}.txt").write_text(f"content {i}\n" * 10)
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_results_keep_production_order(workspace, monkeypatch):
+    processor = FileProcessor(str(workspace))
+    original = processor.process_single_file
+
+    async def reversed_latency(file_path, input_patterns):
+        # Later files finish first
+        index = int(file_path[-6:-4])
+        await asyncio.sleep((30 - index) * 0.001)
+        return await original(file_path, input_patterns)
+
+    monkeypatch.setattr(processor, "process_single_file", reversed_latency)
+    paths = [str(workspace / f"file_{i:02d}.txt") for i in range(30)]
+    _, processed, skipped = await processor.process_file_stream(iter(paths), ["*.txt"])
+
+    assert processed == [f"file_{i:02d}.txt" for i in range(30)]
+    assert skipped == []
+
+
+@pytest.mark.asyncio
+async def test_reads_in_flight_are_bounded(workspace, monkeypatch):
+    processor = FileProcessor(str(workspace))
+    processor.MAX_CONCURRENT_FILES = 3
+    original = processor.process_single_file
+    active = 0
+    peak = 0
+
+    async def tracking(file_path, input_patterns):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.001)
+        try:
+            return await original(file_path, input_patterns)
+        finally:
+            active -= 1
+
+    monkeypatch.setattr(processor, "process_single_file", tracking)
+
+    def discovery():
+        for i in range(30):
+            yield str(workspace / f"file_{i:02d}.txt")
+
+    _, processed, _ = await processor.process_file_stream(discovery(), ["*.txt"])
+
+    assert len(processed) == 30
+    assert peak <= 3
+
+
+@pytest.mark.asyncio
+async def test_memory_ceiling_stops_reading(workspace):
+    processor = FileProcessor(str(workspace), max_output_bytes=500)
+    paths = [str(workspace / f"file_{i:02d}.txt") for i in range(30)]
+
+    content, processed, skipped = await processor.process_file_stream(iter(paths), ["*.txt"])
+
+    assert 0 < len(processed) < 30
+    assert processed == [f"file_{i:02d}.txt" for i in range(len(processed))]
+    assert skipped[-1]['path'] == f"{30 - len(processed)} files"
+    assert "memory limit" in skipped[-1]['reason']
+
+
+@pytest.mark.asyncio
+async def test_tool_streams_discovered_files(workspace):
+    tool = ReadManyFilesTool(str(workspace))
+    result = await tool.execute(ReadManyFilesParams(
+        paths=["*.txt"],
+        file_filtering_options={'respect_git_ignore': False}
+    ))
+
+    assert len(result.llmContent) == 30
+    assert "file_00.txt" in result.llmContent[0]
+    assert "Found 30 files" in result.returnDisplay
+
+
+@pytest.mark.asyncio
+async def test_tool_output_is_sorted_by_path(workspace):
+    (workspace / "sub").mkdir()
+    (workspace / "sub" / "a.txt").write_text("nested\n")
+    tool = ReadManyFilesTool(str(workspace))
+    result = await tool.execute(ReadManyFilesParams(
+        # Literal paths are found before the walk reaches file_*.txt
+        paths=["sub/a.txt", "file_0*.txt"],
+        file_filtering_options={'respect_git_ignore': False}
+    ))
+
+    headers = [part.splitlines()[0] for part in result.llmContent if isinstance(part, str)]
+    assert headers == sorted(headers)
+    assert "sub/a.txt" in headers[-1]
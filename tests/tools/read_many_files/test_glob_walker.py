@@ -0,0 +1,97 @@
+"""
+Tests for the single-pass glob walker of ReadManyFiles tool.
+"""
+
+import glob
+import os
+
+import pytest
+
+from siada.tools.read_many_files.filters import FileFilter
+from siada.tools.read_many_files.glob_walker import GlobWalker
+from siada.tools.read_many_files.models import DEFAULT_EXCLUDES
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    files = [
+        "README.md",
+        "setup.py",
+        ".env.example",
+        "src/app.py",
+        "src/util/helpers.py",
+        "src/util/.hidden.py",
+        "src/.cache/data.py",
+        "src/web/index.js",
+        "node_modules/lib/index.js",
+        "packages/a/node_modules/dep/index.js",
+        "packages/a/src/main.js",
+        "build/out.py",
+    ]
+    for relative_path in files:
+        path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(relative_path)
+    return tmp_path
+
+
+def glob_files(root, pattern):
+    return {
+        os.path.normpath(path)
+        for path in glob.glob(os.path.join(str(root), pattern), recursive=True)
+        if os.path.isfile(path)
+    }
+
+
+@pytest.mark.parametrize("pattern", [
+    "*", "**", "**/*.py", "src/**", "src/**/*.py", "src/*/*.py", "**/index.js",
+    "*.md", ".*", "src/util/.*", "**/src/*.js", "src/**/util/*.py", "src/app.py",
+    "src/[aw]*", "missing/**",
+])
+def test_matches_glob(workspace, pattern):
+    walker = GlobWalker(str(workspace))
+    assert set(walker.walk([pattern])) == glob_files(workspace, pattern)
+
+
+def test_many_patterns_share_one_walk(workspace):
+    patterns = ["**/*.py", "**/*.js", "README.md"]
+    expected = set().union(*(glob_files(workspace, p) for p in patterns))
+    assert set(GlobWalker(str(workspace)).walk(patterns)) == expected
+
+
+def test_absolute_patterns(workspace, tmp_path_factory):
+    outside = tmp_path_factory.mktemp("outside")
+    (outside / "other.py").write_text("")
+    walker = GlobWalker(str(workspace))
+    found = set(walker.walk([str(workspace / "src" / "*.py"), str(outside / "*.py")]))
+    assert found == {str(workspace / "src" / "app.py"), str(outside / "other.py")}
+
+
+def test_excluded_directories_are_not_entered(workspace, monkeypatch):
+    file_filter = FileFilter(str(workspace))
+    scanned = []
+    real_scandir = os.scandir
+
+    def recording_scandir(path):
+        scanned.append(os.path.relpath(path, str(workspace)))
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", recording_scandir)
+    walker = GlobWalker(
+        str(workspace),
+        prune_dir=lambda rel_dir: file_filter.should_prune_directory(rel_dir, DEFAULT_EXCLUDES),
+    )
+    found = {os.path.relpath(path, str(workspace)) for path in walker.walk(["**/*.js"])}
+
+    assert found == {"src/web/index.js", "packages/a/src/main.js"}
+    assert not any("node_modules" in path or path.startswith("build") for path in scanned)
+
+
+def test_leading_double_star_exclude_matches_top_level(workspace):
+    file_filter = FileFilter(str(workspace))
+    assert file_filter.should_exclude_file(
+        str(workspace / "node_modules/lib/index.js"), str(workspace), ["**/node_modules/**"]
+    )
+    assert file_filter.should_prune_directory("node_modules", ["**/node_modules/**"])
+    assert file_filter.should_prune_directory("packages/a/node_modules", ["**/node_modules/**"])
+    assert not file_filter.should_prune_directory("packages/a/src", ["**/node_modules/**", "**/*.py"])
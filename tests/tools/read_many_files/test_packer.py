@@ -0,0 +1,63 @@
+"""
+Tests for token-budget packing of ReadManyFiles tool.
+"""
+
+import pytest
+
+from siada.models.model_base_config import ModelBaseConfig
+from siada.tools.read_many_files.models import ReadManyFilesParams
+from siada.tools.read_many_files.packer import ContentPacker
+from siada.tools.read_many_files_tool import ReadManyFilesTool
+
+
+def python_module(name, functions):
+    return "".join(
+        f"def {name}_{i}(value):\n" + "    value += 1\n" * 20 + "    return value\n\n"
+        for i in range(functions)
+    )
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "main.py").write_text(python_module("main", 5))
+    for name in ("alpha", "beta", "gamma"):
+        (tmp_path / f"{name}.py").write_text(python_module(name, 25))
+    (tmp_path / "notes.txt").write_text("plain text notes\n" * 2000)
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def no_repo_map(monkeypatch):
+    monkeypatch.setattr(ContentPacker, "_file_ranks", lambda self: {})
+
+
+def test_budget_for_model():
+    model = ModelBaseConfig(model_name="m", context_window=200_000, max_tokens=8192)
+    assert ContentPacker.budget_for_model(model) == 100_000
+    assert ContentPacker.budget_for_model(None) is None
+
+
+def test_everything_fits():
+    packer = ContentPacker("/tmp", token_budget=10_000)
+    result = packer.pack(["a" * 100, "b" * 100], ["a.py", "b.py"], ["*.py"])
+    assert result.content_parts == ["a" * 100, "b" * 100]
+    assert result.outlined_files == result.omitted_files == []
+
+
+@pytest.mark.asyncio
+async def test_mentioned_files_first_then_outlines(workspace):
+    tool = ReadManyFilesTool(str(workspace))
+    result = await tool.execute(ReadManyFilesParams(
+        paths=["gamma.py", "*.py", "*.txt"],
+        token_budget=3000,
+        file_filtering_options={'respect_git_ignore': False}
+    ))
+
+    full = [part for part in result.llmContent if "Outline only" not in part]
+    outlined = [part for part in result.llmContent if "Outline only" in part]
+
+    assert any("gamma.py ---" in part and "def gamma_24" in part for part in full)
+    assert any("File: alpha.py" in part for part in outlined)
+    # Text without definitions cannot be outlined and is only listed
+    assert "- notes.txt" in result.llmContent[-1]
+    assert "Omitted: token budget exceeded" in result.returnDisplay
@@ -0,0 +1,73 @@
+"""
+Tests for memory-mapped text reading of ReadManyFiles tool.
+"""
+
+import pytest
+
+from siada.tools.read_many_files.file_processor import FileProcessor
+from siada.tools.read_many_files.text_reader import detect_encoding, read_text_prefix
+
+
+def full_read(path, max_lines, max_chars):
+    """Reference behaviour: decode everything, then truncate"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    lines = content.split('\n')
+    if len(lines) > max_lines:
+        content = '\n'.join(lines[:max_lines])
+        content += f"\n\n[Content truncated: showing first {max_lines} of {len(lines)} lines]"
+    if len(content) > max_chars:
+        content = content[:max_chars] + "\n\n[Content truncated due to size limit]"
+    return content
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "single line",
+    "a\nb\nc\n",
+    "".join(f"line {i}\n" for i in range(50)),
+    "".join(f"line {i}\r\n" for i in range(50)),
+    "".join(f"ünïcødé {i} ✓\n" for i in range(30)),
+    "x" * 5000,
+    "\n".join("y" * 300 for _ in range(40)),
+])
+@pytest.mark.asyncio
+async def test_matches_full_read(tmp_path, text):
+    path = tmp_path / "file.txt"
+    path.write_bytes(text.encode('utf-8'))
+    processor = FileProcessor(str(tmp_path))
+    processor.MAX_TEXT_LINES = 20
+    processor.MAX_CONTENT_CHARS = 1000
+
+    result = await processor.read_text_file(str(path))
+
+    assert result['error'] is None
+    assert result['content'] == full_read(str(path), 20, 1000)
+
+
+def test_only_prefix_is_decoded(tmp_path):
+    path = tmp_path / "big.log"
+    path.write_bytes(b"".join(b"entry %d\n" % i for i in range(100000)))
+
+    prefix = read_text_prefix(str(path), max_lines=10, max_chars=100000)
+
+    assert prefix.lines_truncated
+    assert prefix.total_lines == 100001
+    assert prefix.text == "\n".join(f"entry {i}" for i in range(10))
+
+
+def test_utf16_with_bom(tmp_path):
+    path = tmp_path / "wide.txt"
+    path.write_bytes("first\nsecond\nthird\n".encode('utf-16'))
+
+    prefix = read_text_prefix(str(path), max_lines=2, max_chars=1000)
+
+    assert prefix.encoding.startswith('utf-16')
+    assert prefix.text == "first\nsecond"
+    assert prefix.total_lines == 4
+
+
+def test_encoding_detection():
+    assert detect_encoding("héllo".encode('utf-8')) == ('utf-8', 0)
+    assert detect_encoding("hello world".encode('utf-16-le')) == ('utf-16-le', 0)
+    assert detect_encoding("caf\xe9 cr\xe8me".encode('latin-1')) == ('latin-1', 0)
@@ -0,0 +1,124 @@
+"""
+Tests for lazy binary file parts.
+"""
+
+import base64
+import json
+from types import SimpleNamespace
+
+import pytest
+from agents.tool_context import ToolContext
+
+from siada.foundation.tools.binary_part import (
+    BinaryPart,
+    BinaryPartTooLarge,
+    serialize_binary_parts,
+)
+from siada.foundation.code_agent_context import CodeAgentContext
+from siada.models.model_base_config import ModelBaseConfig
+from siada.provider.binary_part_model import BinaryPartModelProvider
+from siada.tools.coder.file_operator import read
+from siada.tools.read_many_files.file_processor import FileProcessor
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+@pytest.fixture
+def images(tmp_path):
+    (tmp_path / "a.png").write_bytes(PNG_BYTES)
+    (tmp_path / "copy_of_a.png").write_bytes(PNG_BYTES)
+    (tmp_path / "doc.pdf").write_bytes(b"%PDF-1.4\n")
+    return tmp_path
+
+
+def vision_model(supports_images=True):
+    return ModelBaseConfig(model_name="m", context_window=100_000, max_tokens=1000,
+                           supports_images=supports_images)
+
+
+def test_size_cap_applies_before_reading(images, monkeypatch):
+    def fail_open(*args, **kwargs):
+        raise AssertionError("file was read")
+
+    monkeypatch.setattr("builtins.open", fail_open)
+    part = BinaryPart.from_file(str(images / "a.png"), "image", "image/png", max_bytes=1024)
+    assert part.size == len(PNG_BYTES)
+    assert "image" in str(part) and "a.png" in str(part)
+
+    with pytest.raises(BinaryPartTooLarge):
+        BinaryPart.from_file(str(images / "a.png"), "image", "image/png", max_bytes=8)
+
+
+def test_serialize_encodes_and_dedupes_by_hash(images):
+    parts = [
+        BinaryPart.from_file(str(images / name), kind, mime)
+        for name, kind, mime in [
+            ("a.png", "image", "image/png"),
+            ("copy_of_a.png", "image", "image/png"),
+            ("doc.pdf", "pdf", "application/pdf"),
+        ]
+    ]
+
+    items = serialize_binary_parts(parts, vision_model())
+
+    assert items[0]["type"] == "input_image"
+    assert items[0]["image_url"] == "data:image/png;base64," + base64.b64encode(PNG_BYTES).decode()
+    assert items[1]["type"] == "input_text"
+    assert "Same content as" in items[1]["text"]
+    assert items[2]["type"] == "input_file"
+    assert items[2]["filename"] == "doc.pdf"
+
+
+def test_text_only_models_get_placeholders(images):
+    part = BinaryPart.from_file(str(images / "a.png"), "image", "image/png")
+    items = serialize_binary_parts([part], vision_model(supports_images=False))
+    assert items == [{"type": "input_text", "text": part.placeholder()}]
+
+
+@pytest.mark.asyncio
+async def test_file_processor_returns_lazy_parts(images):
+    processor = FileProcessor(str(images))
+    result = await processor.process_single_file(str(images / "a.png"), ["*.png"])
+
+    assert result.success
+    assert isinstance(result.content, BinaryPart)
+    assert result.content.mime_type == "image/png"
+
+
+class _RecordingModel:
+    """Stands in for the provider model and keeps the input of each request"""
+
+    def __init__(self):
+        self.inputs = []
+
+    async def get_response(self, system_instructions, input, *args, **kwargs):
+        self.inputs.append(input)
+
+
+@pytest.mark.asyncio
+async def test_read_tool_image_reaches_model_request(images):
+    context = CodeAgentContext(root_dir=str(images))
+    context.session = SimpleNamespace(siada_config=SimpleNamespace(llm_config=vision_model()))
+    tool_context = ToolContext(context=context, tool_name="read_file", tool_call_id="call_1")
+
+    output = await read.on_invoke_tool(tool_context, json.dumps({"path": "a.png"}))
+
+    assert "image" in str(output)
+    [part] = context.tool_binary_parts["call_1"]
+    assert part.path == str(images / "a.png")
+
+    recording = _RecordingModel()
+    model = BinaryPartModelProvider(SimpleNamespace(get_model=lambda name: recording), context).get_model("m")
+    await model.get_response(None, [
+        {"role": "user", "content": "look at a.png"},
+        {"type": "function_call", "call_id": "call_1", "name": "read_file", "arguments": "{}"},
+        {"type": "function_call_output", "call_id": "call_1", "output": str(output)},
+    ], None, [], None, [], None, previous_response_id=None, prompt=None)
+
+    [sent] = recording.inputs
+    assert sent[2]["type"] == "function_call_output"
+    assert sent[3] == {"role": "user", "content": [{
+        "type": "input_image",
+        "image_url": "data:image/png;base64," + base64.b64encode(PNG_BYTES).decode(),
+        "detail": "auto",
+    }]}
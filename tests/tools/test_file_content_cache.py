@@ -0,0 +1,92 @@
+"""
+Tests for the session-scoped file content cache.
+"""
+
+import os
+
+import pytest
+
+from siada.foundation.context import set_session_id, remove_context_var
+from siada.foundation.tools.file_content_cache import FileContentCache, get_file_content_cache
+from siada.foundation.workspace_generation import bump_generation
+from siada.tools.read_many_files.file_processor import FileProcessor
+
+
+def test_entries_are_validated_against_file_signature(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("one")
+    cache = FileContentCache()
+    cache.put(str(path), 'text', "one")
+    assert cache.get(str(path), 'text') == "one"
+
+    path.write_text("three")
+    assert cache.get(str(path), 'text') is None
+    assert len(cache) == 0
+
+
+def test_byte_budget_evicts_least_recently_used(tmp_path):
+    cache = FileContentCache(max_bytes=250)
+    paths = []
+    for name in "abc":
+        path = tmp_path / name
+        path.write_text(name)
+        paths.append(str(path))
+
+    cache.put(paths[0], 'text', "x" * 100)
+    cache.put(paths[1], 'text', "y" * 100)
+    cache.get(paths[0], 'text')
+    cache.put(paths[2], 'text', "z" * 100)
+
+    assert cache.get(paths[0], 'text') is not None
+    assert cache.get(paths[1], 'text') is None
+    assert cache.total_bytes <= 250
+
+
+def test_get_or_load_does_not_cache_failures(tmp_path):
+    cache = FileContentCache()
+    missing = str(tmp_path / "missing.txt")
+    with pytest.raises(FileNotFoundError):
+        cache.get_or_load(missing, 'lines', lambda: open(missing).readlines())
+    assert len(cache) == 0
+
+
+def test_edited_paths_are_dropped(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("same")
+    cache = get_file_content_cache()
+    cache.put(str(path), 'text', "same")
+    bump_generation([str(path)])
+    assert cache.get(str(path), 'text') is None
+
+
+def test_sessions_do_not_share_caches():
+    set_session_id("session-a")
+    try:
+        cache_a = get_file_content_cache()
+        set_session_id("session-b")
+        assert get_file_content_cache() is not cache_a
+        set_session_id("session-a")
+        assert get_file_content_cache() is cache_a
+    finally:
+        remove_context_var('session_id')
+
+
+@pytest.mark.asyncio
+async def test_read_many_files_reuses_formatted_content(tmp_path, monkeypatch):
+    path = tmp_path / "module.py"
+    path.write_text("print('hi')\n")
+    processor = FileProcessor(str(tmp_path))
+
+    first = await processor.process_single_file(str(path), ["*.py"])
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("file was read again")
+
+    monkeypatch.setattr(processor, "read_file_content_by_type", fail)
+    second = await processor.process_single_file(str(path), ["*.py"])
+    assert second.success and second.content == first.content
+
+    os.utime(path, ns=(1, 1))
+    monkeypatch.undo()
+    third = await processor.process_single_file(str(path), ["*.py"])
+    assert third.content == first.content
@@ -0,0 +1,84 @@
+"""
+Tests for the compiled .gitignore matcher shared by file tools.
+"""
+
+import pytest
+
+from siada.foundation.tools.gitignore_matcher import GitIgnoreMatcher, compile_gitignore_line
+from siada.foundation.workspace_generation import bump_generation
+
+
+@pytest.mark.parametrize("pattern,path,is_dir,expected", [
+    ("*.log", "a/b/debug.log", False, True),
+    ("*.log", "debug.log.txt", False, False),
+    ("/build", "build", True, True),
+    ("/build", "src/build", True, False),
+    ("doc/*.md", "doc/a.md", False, True),
+    ("doc/*.md", "doc/x/a.md", False, False),
+    ("**/foo", "foo", False, True),
+    ("**/foo", "a/b/foo", False, True),
+    ("a/**/b", "a/b", False, True),
+    ("a/**/b", "a/x/y/b", False, True),
+    ("logs/", "logs", False, False),
+    ("logs/", "logs", True, True),
+    ("file[0-9].txt", "file3.txt", False, True),
+    ("file[!0-9].txt", "file3.txt", False, False),
+    ("\\#notes", "#notes", False, True),
+])
+def test_rule_matching(pattern, path, is_dir, expected):
+    rule = compile_gitignore_line(pattern)
+    assert rule.matches(path, is_dir) is expected
+
+
+def test_comments_and_blank_lines():
+    assert compile_gitignore_line("# comment") is None
+    assert compile_gitignore_line("   ") is None
+    assert compile_gitignore_line("!keep.log").negated
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / ".git" / "info").mkdir(parents=True)
+    (tmp_path / ".git" / "info" / "exclude").write_text("*.secret\n")
+    (tmp_path / ".gitignore").write_text("*.log\n!keep.log\nbuild/\n/top.txt\n")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / ".gitignore").write_text("generated.py\n!debug.log\n/local.txt\n")
+    (tmp_path / "build").mkdir()
+    return tmp_path
+
+
+def test_hierarchical_rules(repo):
+    matcher = GitIgnoreMatcher(str(repo))
+
+    assert matcher.is_ignored("app.log")
+    assert not matcher.is_ignored("keep.log")
+    assert matcher.is_ignored("x.secret")
+    assert matcher.is_ignored("top.txt")
+    assert not matcher.is_ignored("sub/top.txt")
+
+    # Nested rules only apply below their directory and override parents
+    assert matcher.is_ignored("sub/generated.py")
+    assert not matcher.is_ignored("generated.py")
+    assert not matcher.is_ignored("sub/debug.log")
+    assert matcher.is_ignored("sub/local.txt")
+    assert not matcher.is_ignored("sub/deeper/local.txt")
+
+    # Nothing inside an ignored directory can be re-included
+    assert matcher.is_ignored("build/keep.log")
+    assert matcher.is_ignored(".git/config")
+
+
+def test_subdirectory_root_uses_enclosing_rules(repo):
+    matcher = GitIgnoreMatcher(str(repo / "sub"))
+    assert matcher.is_ignored("generated.py")
+    assert matcher.is_ignored("other.log")
+    assert not matcher.is_ignored("debug.log")
+    assert matcher.filter(["a.py", "b.log", str(repo / "sub" / "c.log")]) == ["a.py"]
+
+
+def test_rules_reload_after_workspace_change(repo):
+    matcher = GitIgnoreMatcher(str(repo))
+    assert not matcher.is_ignored("notes.md")
+    (repo / ".gitignore").write_text("*.md\n")
+    bump_generation([str(repo / ".gitignore")])
+    assert matcher.is_ignored("notes.md")